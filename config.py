@@ -1,4 +1,26 @@
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent
-ENV_FILE = PROJECT_ROOT / ".env"
\ No newline at end of file
+ENV_FILE = PROJECT_ROOT / ".env"
+
+# Общий кэш токена для всех процессов (воркеров) одного прогона
+TOKEN_CACHE_DIR = PROJECT_ROOT / ".pytest_cache" / "auth"
+
+# Кассеты записи/воспроизведения трафика API (--cassette-mode)
+CASSETTE_FILE = PROJECT_ROOT / "cassettes" / "api.jsonl"
+CASSETTE_MODES = ("record", "replay")
+
+# Области запоминания GET (--memo-scope, helpers/memo.py)
+MEMO_SCOPES = ("off", "test", "module", "session")
+
+# Отчёт о времени вызовов API за прогон (--timing-json)
+TIMING_FILE = PROJECT_ROOT / "api_timing.json"
+
+# Дисковый кэш справочников API (--refdata-cache=disk)
+REFDATA_CACHE_DIR = PROJECT_ROOT / ".pytest_cache" / "refdata"
+
+# Кэш пачек пула тестовых данных и позиции выдачи (helpers/datapool.py)
+DATA_POOL_DIR = PROJECT_ROOT / ".pytest_cache" / "datapool"
+
+# Базовая линия микробенчмарков обвязки (python -m helpers.bench --save)
+BENCH_BASELINE_FILE = PROJECT_ROOT / "benchmarks" / "baseline.json"
@@ -1,163 +1,518 @@
 # conftest.py
 
+import os
+
+import allure
+import dotenv
 import pytest
+import requests
+
+from config import (
+    CASSETTE_FILE, CASSETTE_MODES, DATA_POOL_DIR, MEMO_SCOPES, REFDATA_CACHE_DIR, TIMING_FILE, TOKEN_CACHE_DIR,
+)
+from helpers import attachments, datapool, pages, refdata, registry, resilience, startup, timing, traffic
+from helpers.api_client import ApiClient
+from helpers.auth import get_token_broker
+from helpers.ordering import describe, order_items
+from helpers import state
+from helpers.scheduler import assign_groups
+
+
+_durations = {}
+_run_state = None
+_run_state_address = None
+_data_pool_seed = None
+_standin = None
+_timings = timing.Timings()
+_transport_stats = resilience.TransportStats()
+_traffic = traffic.Traffic()
+_reference_cache = None
+_collection_profile = None
+_cleanup_summary = {}
+_memo = None
+
+
+def _is_parallel(config):
+    # Воркеры заново разбирают командную строку и не видят переключения
+    # на loadgroup из pytest_configure, поэтому режим передаётся в workerinput
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        return workerinput.get("loadgroup", False)
+    return config.getoption("dist", "no") == "loadgroup"
+
+
+def _pin_env(names):
+    """Не даёт load_dotenv(override=True) в тестах перезаписать переменные значениями из .env"""
+    original = dotenv.load_dotenv
+
+    def load_dotenv(*args, **kwargs):
+        kept = {name: os.environ[name] for name in names if name in os.environ}
+        result = original(*args, **kwargs)
+        os.environ.update(kept)
+        return result
+
+    # Тесты импортируют load_dotenv при сборе, то есть уже после pytest_configure
+    pytest.MonkeyPatch().setattr(dotenv, "load_dotenv", load_dotenv)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--show-order",
+        action="store_true",
+        default=False,
+        help="Показать этапы и порядок выполнения модулей (удобно вместе с --collect-only)"
+    )
+    parser.addoption(
+        "--run-state-file",
+        default=None,
+        help="JSON-файл общего состояния прогона (ID сущностей): читается при старте, записывается в конце"
+    )
+    parser.addoption(
+        "--attach-mode",
+        choices=attachments.MODES,
+        default="always",
+        help="Когда записывать вложения Allure: always — всегда, on-failure — только для упавших тестов"
+    )
+    parser.addoption(
+        "--attach-max-bytes",
+        type=int,
+        default=attachments.DEFAULT_MAX_BYTES,
+        help="Максимальный размер одного вложения Allure в байтах (0 — без ограничения)"
+    )
+    parser.addoption(
+        "--cassette-mode",
+        choices=CASSETTE_MODES,
+        default=None,
+        help="record — записывать трафик API в кассету, replay — отвечать из кассеты без сети"
+    )
+    parser.addoption(
+        "--cassette",
+        default=str(CASSETTE_FILE),
+        help="Файл кассеты JSONL (по умолчанию cassettes/api.jsonl)"
+    )
+    parser.addoption(
+        "--timing-json",
+        default=str(TIMING_FILE),
+        help="JSON-отчёт о времени вызовов API по эндпоинтам (пустая строка — не записывать)"
+    )
+    parser.addoption(
+        "--refdata-cache",
+        choices=refdata.MODES,
+        default="memory",
+        help="Кэш справочников API: off — без кэша, memory — в памяти процесса, disk — ещё и в .pytest_cache/refdata"
+    )
+    parser.addoption(
+        "--refdata-ttl",
+        type=float,
+        default=600.0,
+        help="Время жизни записи кэша справочников, сек"
+    )
+    parser.addoption(
+        "--standin",
+        action="store_true",
+        default=False,
+        help="Запустить локальный заменитель API (helpers/standin.py) и направить на него весь прогон"
+    )
+    parser.addoption(
+        "--standin-port",
+        type=int,
+        default=0,
+        help="Порт заменителя API (по умолчанию — любой свободный)"
+    )
+    parser.addoption(
+        "--collect-profile",
+        action="store_true",
+        default=False,
+        help="Показать время запуска и сбора по модулям тестов"
+    )
+    parser.addoption(
+        "--startup-budget",
+        type=float,
+        default=0.0,
+        help="Бюджет запуска и сбора тестов, сек: при превышении прогон неуспешен (0 — без проверки)"
+    )
+    parser.addoption(
+        "--keep-entities",
+        action="store_true",
+        default=False,
+        help="Не удалять в конце сессии сущности, созданные тестами"
+    )
+    parser.addoption(
+        "--cleanup-concurrency",
+        type=int,
+        default=8,
+        help="Одновременных DELETE при очистке созданных сущностей"
+    )
+    parser.addoption(
+        "--memo-scope",
+        choices=MEMO_SCOPES,
+        default="off",
+        help="Запоминать ответы GET и объединять одинаковые запросы: в пределах теста, модуля или прогона"
+    )
+    parser.addoption(
+        "--validator-cache",
+        choices=traffic.MODES,
+        default="reference",
+        help="Условные GET (If-None-Match/If-Modified-Since): reference — только справочники, all — все GET, off — нет"
+    )
+
+
+def pytest_configure(config):
+    global _run_state, _run_state_address, _standin, _collection_profile, _memo, _data_pool_seed
+
+    attachments.configure(config.getoption("attach_mode"), config.getoption("attach_max_bytes"))
+
+    # Постраничная выдача списков, найденная прошлыми прогонами: без пробных запросов
+    # (config.cache нет при -p no:cacheprovider)
+    cache = getattr(config, "cache", None)
+    if cache is not None:
+        pages.load_detected(cache.get("pages/paging", {}))
+
+    # Запись сбрасывает запомненные GET только в своём процессе: при -n другой
+    # воркер может изменить данные, и запомненный ответ устареет
+    parallel = config.getoption("numprocesses", None) or hasattr(config, "workerinput")
+    if config.getoption("memo_scope") != "off" and parallel:
+        if not hasattr(config, "workerinput"):
+            config.issue_config_time_warning(
+                pytest.PytestConfigWarning("--memo-scope не действует при -n: запоминание GET выключено"),
+                stacklevel=2,
+            )
+    elif config.getoption("memo_scope") != "off":
+        from helpers import memo
+
+        _memo = memo.MemoCache(config.getoption("memo_scope"))
+
+    if config.getoption("collect_profile") or config.getoption("startup_budget"):
+        _collection_profile = startup.CollectionProfile(config.getoption("startup_budget"))
+        config.pluginmanager.register(_collection_profile, "collection-profile")
+
+    # При запуске с -n тесты одной цепочки CRUD должны попадать на один воркер
+    if config.getoption("numprocesses", None) and config.getoption("dist", "no") == "load":
+        config.option.dist = "loadgroup"
+
+    # Заменитель API живёт в управляющем процессе; воркеры наследуют окружение
+    if config.getoption("standin"):
+        from helpers import standin
+
+        if not hasattr(config, "workerinput"):
+            _standin = standin.StandinServer(port=config.getoption("standin_port")).start()
+            standin.export_env(_standin.url)
+        _pin_env(("API_URL", *standin.ENV))
+
+    # Случайный seed пула данных (без DATA_POOL_SEED) один на все воркеры
+    workerinput = getattr(config, "workerinput", None)
+    _data_pool_seed = workerinput["data_pool_seed"] if workerinput else datapool.random_seed()
+
+    # Кассета очищается один раз в управляющем процессе; воркеры дописывают в неё
+    cassette_mode = config.getoption("cassette_mode")
+    if cassette_mode and not workerinput:
+        from helpers import cassette
+
+        cassette_path = config.getoption("cassette")
+        if cassette_mode == "record":
+            pool = datapool.DataPool.from_env(DATA_POOL_DIR, run_seed=_data_pool_seed)
+            cassette.start_recording(cassette_path, {"data_pool": pool.settings()})
+        elif not os.path.exists(cassette_path):
+            raise pytest.UsageError(f"Кассета не найдена: {cassette_path}")
+
+    # Общее состояние прогона: воркеры подключаются к хранилищу управляющего процесса
+    if workerinput and workerinput.get("loadgroup"):
+        # Суффикс @<группа> в nodeid, по которому xdist распределяет группы
+        config.option.loadgroup = True
+    if workerinput and "run_state_address" in workerinput:
+        _run_state = state.connect(workerinput["run_state_address"], workerinput["run_state_authkey"])
+        return
+
+    state_file = config.getoption("run_state_file")
+    store = state.StateStore(state.load(state_file) if state_file else None)
+    _run_state = state.RunState(store)
+    # Бюджет повторов и токен — на прогон, а не переносятся из --run-state-file
+    _run_state.delete(resilience.BUDGET_KEY)
+    _run_state.delete("TOKEN_ID")
+    if config.getoption("numprocesses", None):
+        _run_state_address = state.serve(store)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["loadgroup"] = _is_parallel(node.config)
+    node.workerinput["data_pool_seed"] = _data_pool_seed
+    if _run_state_address:
+        node.workerinput["run_state_address"], node.workerinput["run_state_authkey"] = _run_state_address
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # Замеры вызовов API с воркера собираются в управляющем процессе
+    _timings.merge(getattr(node, "workeroutput", {}).get("api_timing", []))
+    if _collection_profile is not None:
+        _collection_profile.merge(getattr(node, "workeroutput", {}).get("collection_profile"))
+    registry.merge(_cleanup_summary, getattr(node, "workeroutput", {}).get("cleanup"))
+    _transport_stats.merge(getattr(node, "workeroutput", {}).get("transport"))
+    if _memo is not None:
+        _memo.merge(getattr(node, "workeroutput", {}).get("memo"))
+    _traffic.merge(getattr(node, "workeroutput", {}).get("traffic"))
+    pages.load_detected(getattr(node, "workeroutput", {}).get("paging"))
+
+
+@pytest.fixture(scope="session")
+def token_broker(pytestconfig):
+    """Брокер токенов: один запрос к /api/v1/tocken на прогон, общий для всех воркеров"""
+    # Токен из кассеты (или подставной "***") не должен попасть в общий кэш токена
+    replay = pytestconfig.getoption("cassette_mode") == "replay"
+    return get_token_broker(cache_dir=None if replay else TOKEN_CACHE_DIR)
+
+
+@pytest.fixture
+def auth_token(token_broker):
+    """Действующий токен аутентификации (обновляется до истечения TOKEN_TIMEOUT)"""
+    return token_broker.get()
+
+
+@pytest.fixture(scope="session")
+def run_state():
+    """Общее состояние прогона: ID созданных сущностей вместо set_key в .env"""
+    return _run_state
+
+
+@pytest.fixture(scope="session")
+def data_pool(run_state, pytestconfig):
+    """Пул тестовых данных: lease("organization" | "user" | "tariff") — тело запроса"""
+    if pytestconfig.getoption("cassette_mode") == "replay":
+        from helpers import cassette
+
+        # Те же данные, что при записи: иначе тела запросов не совпадут с кассетой
+        settings = cassette.read_meta(pytestconfig.getoption("cassette")).get("data_pool")
+        if settings:
+            return datapool.DataPool.from_settings(settings, counter=run_state.increment)
+    return datapool.DataPool.from_env(DATA_POOL_DIR, counter=run_state.increment, run_seed=_data_pool_seed)
+
+
+@pytest.fixture(scope="session")
+def api_client(token_broker, pytestconfig):
+    """HTTP-клиент API на общем пуле keep-alive соединений"""
+    client = ApiClient.from_env(token_provider=token_broker.get, on_unauthorized=token_broker.invalidate)
+    # Повторы внутри кассеты: записывается итоговый ответ, а не промежуточные 503
+    resilience.install(client.session, resilience.Policy.from_env(), _transport_stats, counter=_run_state.increment)
+    validator_cache = pytestconfig.getoption("validator_cache")
+    validators = None
+    if validator_cache != "off":
+        validators = traffic.ValidatorCache(paths=None if validator_cache == "all" else traffic.REFERENCE_PATHS)
+    traffic.install(client.session, _traffic, validators)
+    cassette_mode = pytestconfig.getoption("cassette_mode")
+    if cassette_mode:
+        from helpers import cassette
+
+        cassette.install(client.session, cassette_mode, pytestconfig.getoption("cassette"))
+    timing.install(client.session, _timings)
 
+    global _reference_cache
+    _reference_cache = refdata.ReferenceCache(
+        client,
+        mode=pytestconfig.getoption("refdata_cache"),
+        ttl=pytestconfig.getoption("refdata_ttl"),
+        cache_dir=REFDATA_CACHE_DIR,
+    )
+    refdata.install(client.session, _reference_cache)
+    entities = registry.EntityRegistry()
+    registry.install(client.session, entities)
+    if _memo is not None:
+        from helpers import memo
 
-def pytest_collection_modifyitems(items):
+        memo.install(client.session, _memo)
+    yield client
+    # При воспроизведении кассеты на стенде ничего не создавалось
+    if not pytestconfig.getoption("keep_entities") and cassette_mode != "replay":
+        registry.merge(_cleanup_summary, entities.teardown(client, pytestconfig.getoption("cleanup_concurrency")))
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def reference_data(api_client):
+    """Кэш справочников API: get(эндпоинт), index(эндпоинт), invalidate()"""
+    return _reference_cache
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Пул соединений с БД стенда для проверок сохранения (None, если DB_DSN не задан)"""
+    from helpers import db
+
+    pool = db.Database.from_env()
+    yield pool
+    if pool is not None:
+        pool.close()
+
+
+@pytest.fixture
+def db_verify(database):
+    """Ожидания к БД за фазу теста: created/updated/deleted, затем check() — запрос на тип сущности"""
+    from helpers import db
+
+    return db.Verification(database)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def pooled_requests(api_client):
+    """Направляет модульные вызовы requests.get/post/put/delete/request в общий пул соединений"""
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(requests.api, "request", api_client.send_raw)
+    # requests.request связан с requests.api.request при импорте пакета
+    monkeypatch.setattr(requests, "request", api_client.send_raw)
+    yield
+    monkeypatch.undo()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def capped_attachments():
+    """allure.attach с лимитом размера и режимом --attach-mode"""
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(allure, "attach", attachments.attach)
+    yield
+    monkeypatch.undo()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
     """
-    Изменяем порядок выполнения тестов:
-    1. Аутентификация
-    2. Пользователи
-    3. Организации
-    4. Связи пользователей и организаций
-    5. Роли
-    6. Отчёты
-    7. Ресурсы: resource_service (CRUD)
-    8. Ресурсы: resource_atom (CRUD)
-    9. Остальные ресурсы
-    10. Тарифы
-    11. Остальные тесты
+    Изменяем порядок выполнения тестов по таблице этапов ORDER_RULES
+    (helpers/ordering.py): аутентификация, пользователи, организации,
+    роли, отчёты, ресурсы (CRUD), тарифы, остальные тесты.
     """
-    ordered_items = []
-
-    # 1. Тесты аутентификации
-    ordered_items.extend([i for i in items if "token/test_auth" in i.nodeid])
-
-    # 2. Тесты пользователей
-    ordered_items.extend([i for i in items if "user/test_user_create" in i.nodeid])
-    ordered_items.extend([i for i in items if "user/test_user_read" in i.nodeid])
-    ordered_items.extend([i for i in items if "user/test_user_update" in i.nodeid])
-    ordered_items.extend([i for i in items if "user/test_user_delete" in i.nodeid])
-    ordered_items.extend([i for i in items if "user/test_user_crud" in i.nodeid])
-
-    # 3. Тесты организаций
-    ordered_items.extend([i for i in items if "organizations/test_organization_create" in i.nodeid])
-    ordered_items.extend([i for i in items if "organizations/test_organization_read" in i.nodeid])
-    ordered_items.extend([i for i in items if "organizations/test_organization_update" in i.nodeid])
-    ordered_items.extend([i for i in items if "organizations/test_organization_delete" in i.nodeid])
-    ordered_items.extend([i for i in items if "organizations/test_organizations_read" in i.nodeid])
-
-    # 4. Тесты связей пользователей и организаций
-    ordered_items.extend([i for i in items if "users/test_users_add_org" in i.nodeid])
-    ordered_items.extend([i for i in items if "users/test_users_org" in i.nodeid])
-    ordered_items.extend([i for i in items if "users/test_users_read" in i.nodeid])
-
-    # 5. Тесты ролей
-    role_tests = [i for i in items if "role/" in i.nodeid and i not in ordered_items]
-    ordered_items.extend(role_tests)
-
-    # 6. Тесты отчётов
-    report_tests = [i for i in items if "report/" in i.nodeid and i not in ordered_items]
-    ordered_items.extend(report_tests)
-
-    # 7. Тесты resource_service — CRUD порядок
-    resource_service_path = "resource_service/"
-    create_rs = [i for i in items if resource_service_path in i.nodeid and "test_resource_service_create" in i.nodeid]
-    read_rs = [i for i in items if resource_service_path in i.nodeid and "test_resource_service_read" in i.nodeid]
-    update_rs = [i for i in items if resource_service_path in i.nodeid and "test_resource_service_update" in i.nodeid]
-    delete_rs = [i for i in items if resource_service_path in i.nodeid and "test_resource_service_delete" in i.nodeid]
-
-    ordered_items.extend(create_rs)
-    ordered_items.extend(read_rs)
-    ordered_items.extend(update_rs)
-    ordered_items.extend(delete_rs)
-
-    # 8. Тесты resource_pool — CRUD порядок
-    resource_pool_path = "resource_pool/"
-    create_rp = [i for i in items if resource_pool_path in i.nodeid and "test_resource_pool_create" in i.nodeid]
-    read_rp = [i for i in items if resource_pool_path in i.nodeid and "test_resource_pool_read" in i.nodeid]
-    update_rp = [i for i in items if resource_pool_path in i.nodeid and "test_resource_pool_update" in i.nodeid]
-    delete_rp = [i for i in items if resource_pool_path in i.nodeid and "test_resource_pool_delete" in i.nodeid]
-
-    ordered_items.extend(create_rp)
-    ordered_items.extend(read_rp)
-    ordered_items.extend(update_rp)
-    ordered_items.extend(delete_rp)
-
-    # 9. Тесты resource_atom — CRUD порядок
-    resource_atom_path = "resource_atom/"
-    create_ra = [i for i in items if resource_atom_path in i.nodeid and "test_create_resource_atom" in i.nodeid]
-    read_ra = [i for i in items if resource_atom_path in i.nodeid and "test_get_resource_atom_by_id" in i.nodeid]
-    update_ra = [i for i in items if resource_atom_path in i.nodeid and "test_update_resource_atom" in i.nodeid]
-    delete_ra = [i for i in items if resource_atom_path in i.nodeid and "test_delete_resource_atom_by_id" in i.nodeid]
-
-    ordered_items.extend(create_ra)
-    ordered_items.extend(read_ra)
-    ordered_items.extend(update_ra)
-    ordered_items.extend(delete_ra)
-
-    # 10. Тесты resource_atom — CRUD порядок
-    resource_location_path = "resource_location/"
-    create_rl = [i for i in items if resource_location_path in i.nodeid and "test_resource_location_create" in i.nodeid]
-    read_rl = [i for i in items if resource_location_path in i.nodeid and "test_resource_location_read" in i.nodeid]
-    update_rl = [i for i in items if resource_location_path in i.nodeid and "test_resource_location_update" in i.nodeid]
-    delete_rl = [i for i in items if resource_location_path in i.nodeid and "test_resource_location_delete" in i.nodeid]
-
-    ordered_items.extend(create_rl)
-    ordered_items.extend(read_rl)
-    ordered_items.extend(update_rl)
-    ordered_items.extend(delete_rl)
-
-    # 11. Тесты resource_atom — CRUD порядок
-    resource_category_path = "resource_category_ref/"
-    create_rc = [i for i in items if resource_category_path in i.nodeid and "test_resource_category_ref_create" in i.nodeid]
-    read_rc = [i for i in items if resource_category_path in i.nodeid and "test_resource_category_ref_read" in i.nodeid]
-    update_rc = [i for i in items if resource_category_path in i.nodeid and "test_resource_category_ref_update" in i.nodeid]
-    delete_rc = [i for i in items if resource_category_path in i.nodeid and "test_resource_category_ref_delete" in i.nodeid]
-    list_rc = [i for i in items if resource_category_path in i.nodeid and "test_resource_category_ref_list" in i.nodeid]
-
-    ordered_items.extend(create_rc)
-    ordered_items.extend(read_rc)
-    ordered_items.extend(update_rc)
-    ordered_items.extend(delete_rc)
-    ordered_items.extend(list_rc)
-
-    # 12. Остальные тесты ресурсов (например, /resource/, /resource_pools/ и т.д.)
-    other_resource_tests = [
-        i for i in items 
-        if ("resource/" in i.nodeid or "resource_pools" in i.nodeid) 
-        and i not in ordered_items
-    ]
-    ordered_items.extend(other_resource_tests)
-
-    # 13. Тесты тарифов
-    # tariff_crud
-    ordered_items.extend([i for i in items if "tariff/tariff_crud/test_tariff_create" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_crud/test_tariff_read" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_crud/test_tariff_update" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_crud/test_tariff_delete" in i.nodeid])
-    # tariff_link_organization_crud
-    ordered_items.extend([i for i in items if "tariff/tariff_link_organization_crud/test_tariff_link_organization_create" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_link_organization_crud/test_tariff_link_organization_read" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_link_organization_crud/test_tariff_link_organization_update" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_link_organization_crud/test_tariff_link_organization_delete" in i.nodeid])
-    # tariff_link_tenant_crud
-    ordered_items.extend([i for i in items if "tariff/tariff_link_tenant_crud/test_tariff_link_tenant_create" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_link_tenant_crud/test_tariff_link_tenant_read" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_link_tenant_crud/test_tariff_link_tenant_delete" in i.nodeid])
-    # tariff_links_organization
-    ordered_items.extend([i for i in items if "tariff/tariff_links_organization/test_tariff_links_organization_read" in i.nodeid])
-    # tariff_links_tenant
-    ordered_items.extend([i for i in items if "tariff/tariff_links_tenant/test_tariff_links_tenant_read" in i.nodeid])
-    # tariff_setting_types
-    ordered_items.extend([i for i in items if "tariff/tariff_setting_types/test_tariff_setting_types_read" in i.nodeid])
-    # tariff_tenant_settings_crud
-    ordered_items.extend([i for i in items if "tariff/tariff_tenant_settings_crud/test_tariff_tenant_settings_create" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_tenant_settings_crud/test_tariff_tenant_settings_read" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_tenant_settings_crud/test_tariff_tenant_settings_update" in i.nodeid])
-    ordered_items.extend([i for i in items if "tariff/tariff_tenant_settings_crud/test_tariff_tenant_settings_delete" in i.nodeid])
-    # tariff_tenants_settings
-    ordered_items.extend([i for i in items if "tariff/tariff_tenants_settings/test_tariff_tenants_settings_read" in i.nodeid])
-    # tariff_time_intervals
-    ordered_items.extend([i for i in items if "tariff/tariff_time_intervals/test_tariff_time_intervals_read" in i.nodeid])
-    # tariffs
-    ordered_items.extend([i for i in items if "tariff/tariffs/test_tariffs_read" in i.nodeid])
-    # tariffs_settings
-    ordered_items.extend([i for i in items if "tariff/tariffs_settings/test_tariffs_settings_read" in i.nodeid])
-
-    # 14. Все остальные тесты
-    remaining = [i for i in items if i not in ordered_items]
-    ordered_items.extend(remaining)
-
-    # Применяем порядок
-    items[:] = ordered_items
\ No newline at end of file
+    items[:] = order_items(items)
+
+    # Параллельный запуск: цепочки распределяются по воркерам целиком,
+    # самые долгие (по прошлому прогону) стартуют первыми
+    if _is_parallel(config):
+        cache = getattr(config, "cache", None)
+        durations = cache.get("scheduler/durations", {}) if cache is not None else {}
+        ordered_items, groups = assign_groups(items, durations)
+        for group, group_items in groups.items():
+            for item in group_items:
+                item.add_marker(pytest.mark.xdist_group(group))
+        items[:] = ordered_items
+
+
+def pytest_report_collectionfinish(config, items):
+    if config.getoption("show_order"):
+        return describe(items)
+
+
+def pytest_runtest_setup(item):
+    # Область запоминания GET: смена теста или модуля сбрасывает записи
+    if _memo is not None:
+        _memo.enter(item.nodeid, item.module.__name__ if item.module else None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # В режиме on-failure вложения упавшего теста записываются в отчёт,
+    # вложения прошедшего — отбрасываются после teardown
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed:
+        attachments.flush()
+    elif report.when == "teardown":
+        attachments.discard()
+
+
+def pytest_runtest_logreport(report):
+    # Длительности тестов для балансировки следующего параллельного прогона
+    # (в режиме loadgroup к nodeid добавляется суффикс @<группа>)
+    nodeid = report.nodeid.rsplit("@", 1)[0]
+    _durations[nodeid] = _durations.get(nodeid, 0.0) + report.duration
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, "workerinput"):
+        config.workeroutput["api_timing"] = _timings.export()
+        if _collection_profile is not None:
+            config.workeroutput["collection_profile"] = _collection_profile.export()
+        config.workeroutput["cleanup"] = _cleanup_summary
+        config.workeroutput["transport"] = _transport_stats.export()
+        config.workeroutput["traffic"] = _traffic.export()
+        config.workeroutput["paging"] = pages.export_detected()
+        if _memo is not None:
+            config.workeroutput["memo"] = _memo.export()
+        return
+
+    if _collection_profile is not None and _collection_profile.over_budget and session.exitstatus == 0:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    cache = getattr(config, "cache", None)
+    if cache is not None and _is_parallel(config) and _durations:
+        cache.set("scheduler/durations", _durations)
+
+    # У заменителя API каждый раз новый порт: сохранять нечего
+    if cache is not None and not config.getoption("standin"):
+        cache.set("pages/paging", {**cache.get("pages/paging", {}), **pages.export_detected()})
+
+    state_file = config.getoption("run_state_file")
+    if state_file:
+        state.dump(_run_state, state_file)
+
+    # Следующий прогон с тем же DATA_POOL_SEED продолжит выдачу данных пула с этой позиции
+    seed = datapool.seed_from_env()
+    snapshot = _run_state.snapshot()
+    if seed is not None and config.getoption("cassette_mode") != "replay" and any(datapool.cursor_key(kind) in snapshot for kind in datapool.GENERATORS):
+        datapool.save_cursor(DATA_POOL_DIR, seed, snapshot)
+
+    timing_file = config.getoption("timing_json")
+    if timing_file and _timings:
+        timing.write_json(_timings.summary(), timing_file)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if _collection_profile is not None:
+        terminalreporter.write_sep("-", "запуск и сбор тестов")
+        for line in _collection_profile.format():
+            terminalreporter.write_line(line)
+
+    if _timings:
+        terminalreporter.write_sep("-", "время вызовов API")
+        for line in timing.format_table(_timings.summary(), limit=20):
+            terminalreporter.write_line(line)
+        if config.getoption("timing_json"):
+            terminalreporter.write_line(f"JSON-отчёт: {config.getoption('timing_json')}")
+
+    if _traffic:
+        terminalreporter.write_sep("-", "трафик API")
+        for line in _traffic.format():
+            terminalreporter.write_line(line)
+
+    if _transport_stats:
+        terminalreporter.write_sep("-", "повторы и выключатель API")
+        for line in _transport_stats.format():
+            terminalreporter.write_line(line)
+
+    if _memo is not None:
+        terminalreporter.write_sep("-", "запоминание GET")
+        for line in _memo.format():
+            terminalreporter.write_line(line)
+
+    if _cleanup_summary:
+        terminalreporter.write_sep("-", "очистка созданных сущностей")
+        for line in registry.format_summary(_cleanup_summary):
+            terminalreporter.write_line(line)
+
+    if _reference_cache is not None and _reference_cache.hits + _reference_cache.fetches:
+        terminalreporter.write_line(
+            f"Справочники API: запросов {_reference_cache.fetches}, из кэша {_reference_cache.hits}"
+        )
+
+    if _standin is None:
+        return
+    # Время работы бэкенда отдельно от накладных расходов самого набора
+    total = sum(_durations.values())
+    stats = _standin.stats
+    terminalreporter.write_sep("-", "заменитель API")
+    terminalreporter.write_line(f"URL: {_standin.url}, запросов: {stats.requests}")
+    terminalreporter.write_line(f"Обработка запросов сервером: {stats.seconds:.2f} с")
+    if total and not _is_parallel(config):
+        terminalreporter.write_line(f"Накладные расходы набора (тесты минус сервер): {total - stats.seconds:.2f} с")
+
+
+def pytest_unconfigure(config):
+    if _standin is not None:
+        _standin.stop()
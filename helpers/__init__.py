@@ -0,0 +1 @@
+"""Общие вспомогательные модули для автотестов API"""
@@ -0,0 +1,102 @@
+"""HTTP-клиент API на общем пуле keep-alive соединений"""
+
+import os
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from config import ENV_FILE
+
+
+class ApiClient:
+    """Клиент API: базовый URL, заголовок tockenid и таймауты по умолчанию"""
+
+    def __init__(self, base_url, token_provider=None, pool_size=10,
+                 connect_timeout=10.0, read_timeout=60.0, keep_alive=True, on_unauthorized=None):
+        self.base_url = base_url.rstrip("/")
+        self.token_provider = token_provider
+        # Сброс токена после ответа 401 (например, TokenBroker.invalidate): запрос повторяется один раз
+        self.on_unauthorized = on_unauthorized
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["accept"] = "application/json"
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    @classmethod
+    def from_env(cls, token_provider=None, on_unauthorized=None):
+        """Создаёт клиент по параметрам из .env"""
+        load_dotenv(ENV_FILE)
+        base_url = os.getenv("API_URL")
+        if not base_url:
+            raise RuntimeError("API_URL не задан в .env")
+
+        return cls(
+            base_url=base_url,
+            token_provider=token_provider,
+            on_unauthorized=on_unauthorized,
+            pool_size=int(os.getenv("API_POOL_SIZE", 10)),
+            connect_timeout=float(os.getenv("API_CONNECT_TIMEOUT", 10)),
+            read_timeout=float(os.getenv("API_READ_TIMEOUT", 60)),
+            keep_alive=os.getenv("API_KEEP_ALIVE", "1") not in ("0", "false", "False"),
+        )
+
+    def url(self, path):
+        """Полный URL: относительные пути дополняются базовым адресом API"""
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, headers=None, auth=True, **kwargs):
+        """Выполняет запрос через общий пул; tockenid подставляется автоматически.
+
+        На 401 с токеном клиента токен сбрасывается (on_unauthorized) и запрос
+        повторяется один раз со свежим токеном.
+        """
+        headers = dict(headers or {})
+        if auth and self.token_provider is not None:
+            if not any(key.lower() == "tockenid" for key in headers):
+                headers["tockenid"] = self.token_provider()
+        kwargs.setdefault("timeout", self.timeout)
+        return self._send(method, self.url(path), headers, kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def send_raw(self, method, url, headers=None, **kwargs):
+        """Замена requests.request: тот же пул, но без подстановки tockenid и базового URL.
+
+        Просроченный токен клиента в заголовках тоже обновляется после 401.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self._send(method, url, dict(headers or {}), kwargs)
+
+    def _send(self, method, url, headers, kwargs):
+        response = self.session.request(method, url, headers=headers, **kwargs)
+        if response.status_code != 401 or self.on_unauthorized is None or self.token_provider is None:
+            return response
+        name = next((key for key in headers if key.lower() == "tockenid"), None)
+        # Чужой или заведомо неверный токен (негативные тесты) не подменяется
+        if name is None or headers[name] != self.token_provider():
+            return response
+        response.close()
+        self.on_unauthorized()
+        headers[name] = self.token_provider()
+        return self.session.request(method, url, headers=headers, **kwargs)
+
+    def close(self):
+        self.session.close()
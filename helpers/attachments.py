@@ -0,0 +1,135 @@
+"""Вложения Allure с ограничением размера и отложенной записью.
+
+- Тело вложения может быть строкой, байтами, объектом для JSON или функцией
+  без аргументов, возвращающей генератор частей: части собираются потоково,
+  и при обрезке полная строка не строится.
+- Текстовое вложение больше лимита обрезается; в конец добавляется исходный
+  размер и sha256 полного содержимого. Двоичные вложения (PNG, PDF, видео и
+  т. п.) записываются как есть: обрезка и перекодировка их испортили бы.
+- В режиме "on-failure" вложения сериализуются сразу при вызове (объект
+  может измениться до конца теста), копятся в памяти и записываются в отчёт,
+  только если тест упал; для зелёных тестов они отбрасываются.
+"""
+
+import hashlib
+import json
+import types
+
+from allure_commons._allure import attach as _allure_attach
+from allure_commons.types import AttachmentType
+
+MODES = ("always", "on-failure")
+
+DEFAULT_MAX_BYTES = 64 * 1024
+
+# Типы, которые можно обрезать и показывать как текст (None — текст по умолчанию)
+TEXT_TYPES = frozenset({
+    AttachmentType.TEXT, AttachmentType.CSV, AttachmentType.TSV, AttachmentType.URI_LIST,
+    AttachmentType.HTML, AttachmentType.XML, AttachmentType.JSON, AttachmentType.YAML,
+})
+
+_settings = {"mode": "always", "max_bytes": DEFAULT_MAX_BYTES}
+_buffer = []
+
+
+def configure(mode="always", max_bytes=DEFAULT_MAX_BYTES):
+    """Задаёт режим записи и лимит размера одного вложения (0 — без лимита)"""
+    if mode not in MODES:
+        raise ValueError(f"Неизвестный режим вложений: {mode}. Допустимо: {', '.join(MODES)}")
+    _settings["mode"] = mode
+    _settings["max_bytes"] = max_bytes
+
+
+def _truncate(chunks, max_bytes):
+    """Собирает не более max_bytes байт из потока строк; хэш считается по всему потоку"""
+    digest = hashlib.sha256()
+    head = []
+    size = 0
+    for chunk in chunks:
+        data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        digest.update(data)
+        if max_bytes and size < max_bytes:
+            head.append(data[:max_bytes - size])
+        elif not max_bytes:
+            head.append(data)
+        size += len(data)
+
+    body = b"".join(head)
+    if max_bytes and size > max_bytes:
+        shown = body.decode("utf-8", errors="ignore")
+        note = (
+            f"\n\n… [обрезано: показано {len(body)} из {size} байт, "
+            f"sha256 {digest.hexdigest()}]"
+        )
+        return shown + note, True
+    return body.decode("utf-8", errors="replace"), False
+
+
+def _chunks(body):
+    if callable(body):
+        body = body()
+    if isinstance(body, (str, bytes)):
+        return [body]
+    if isinstance(body, types.GeneratorType):
+        return body
+    # Объекты сериализуются потоково: при обрезке не строится вся строка целиком
+    return json.JSONEncoder(ensure_ascii=False, indent=2, default=str).iterencode(body)
+
+
+def _render(body, attachment_type):
+    """Готовое содержимое вложения и его тип"""
+    if attachment_type is not None and attachment_type not in TEXT_TYPES:
+        return b"".join(c.encode("utf-8") if isinstance(c, str) else c for c in _chunks(body)), attachment_type
+    text, truncated = _truncate(_chunks(body), _settings["max_bytes"])
+    if truncated and attachment_type == AttachmentType.JSON:
+        # Обрезанный JSON не откроется во вьюере Allure
+        attachment_type = AttachmentType.TEXT
+    return text, attachment_type
+
+
+class Attach:
+    """Замена allure.attach с тем же интерфейсом"""
+
+    def __call__(self, body, name=None, attachment_type=None, extension=None):
+        content, attachment_type = _render(body, attachment_type)
+        if _settings["mode"] == "on-failure":
+            _buffer.append((content, name, attachment_type, extension))
+        else:
+            _allure_attach(content, name=name, attachment_type=attachment_type, extension=extension)
+
+    def file(self, source, name=None, attachment_type=None, extension=None):
+        _allure_attach.file(source, name=name, attachment_type=attachment_type, extension=extension)
+
+
+attach = Attach()
+
+
+def attach_json(data, name):
+    """JSON-вложение; сериализуется потоково и обрезается по лимиту"""
+    attach(data, name=name, attachment_type=AttachmentType.JSON)
+
+
+def attach_response(response, name="Response Details"):
+    """Пара запрос/ответ одним вложением; тело ответа не склеивается в одну строку перед обрезкой"""
+    def render():
+        request = response.request
+        yield f"{request.method} {request.url}\n"
+        yield f"Status Code: {response.status_code}\n"
+        yield f"Elapsed: {response.elapsed.total_seconds():.3f} s\n\n"
+        yield "Response: "
+        yield response.content
+
+    attach(render, name=name, attachment_type=AttachmentType.TEXT)
+
+
+def flush():
+    """Записывает накопленные вложения в отчёт (тест упал)"""
+    pending = list(_buffer)
+    _buffer.clear()
+    for content, name, attachment_type, extension in pending:
+        _allure_attach(content, name=name, attachment_type=attachment_type, extension=extension)
+
+
+def discard():
+    """Отбрасывает накопленные вложения (тест прошёл)"""
+    _buffer.clear()
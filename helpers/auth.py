@@ -0,0 +1,195 @@
+"""Брокер токенов аутентификации.
+
+Токен запрашивается у /api/v1/tocken один раз на прогон и обновляется
+заранее, до истечения TOKEN_TIMEOUT. Кэш токена хранится в файле под
+межпроцессной блокировкой, поэтому параллельные воркеры используют один токен.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import allure
+import requests
+from dotenv import load_dotenv
+
+from config import ENV_FILE, TOKEN_CACHE_DIR
+
+
+class _FileLock:
+    """Межпроцессная блокировка на основе lock-файла (работает и на Windows)"""
+
+    def __init__(self, path, timeout=30.0, stale_after=60.0):
+        self.path = str(path)
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self._fd = None
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                return self
+            except FileExistsError:
+                # Блокировка, брошенная упавшим процессом, снимается по возрасту
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                        os.unlink(self.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Не удалось захватить блокировку {self.path}")
+                time.sleep(0.05)
+
+    def __exit__(self, exc_type, exc, tb):
+        os.close(self._fd)
+        self._fd = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class TokenBroker:
+    """Выдаёт токен, общий для всех тестов, потоков и воркеров прогона"""
+
+    def __init__(self, base_url, login, password, domain, timeoutlive=600,
+                 cache_dir=None, refresh_margin=None):
+        self.base_url = base_url
+        self.login = login
+        self.password = password
+        self.domain = domain
+        self.timeoutlive = int(timeoutlive)
+        # Токен обновляется заранее: за 10% времени жизни, но не более чем за 60 секунд
+        if refresh_margin is None:
+            refresh_margin = max(1, min(60, self.timeoutlive // 10))
+        self.refresh_margin = refresh_margin
+        self.cache_dir = cache_dir
+        self.requests_made = 0
+
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0.0
+
+    @classmethod
+    def from_env(cls, cache_dir=None):
+        """Создаёт брокер по параметрам из .env"""
+        load_dotenv(ENV_FILE)
+        values = {}
+        for name in ("API_URL", "API_LOGIN", "API_PASSWORD", "API_DOMAIN"):
+            values[name] = os.getenv(name)
+            if not values[name]:
+                raise RuntimeError(f"{name} не задан в .env")
+
+        return cls(
+            base_url=values["API_URL"],
+            login=values["API_LOGIN"],
+            password=values["API_PASSWORD"],
+            domain=values["API_DOMAIN"],
+            timeoutlive=int(os.getenv("TOKEN_TIMEOUT", 600)),
+            cache_dir=cache_dir,
+        )
+
+    def get(self):
+        """Возвращает действующий токен, при необходимости обновляя его"""
+        with self._lock:
+            if self._is_fresh(self._expires_at):
+                return self._token
+
+            if self.cache_dir is None:
+                self._fetch()
+                return self._token
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with _FileLock(self._cache_path() + ".lock"):
+                cached = self._read_cache()
+                if cached and self._is_fresh(cached["expires_at"]):
+                    self._token = cached["token"]
+                    self._expires_at = cached["expires_at"]
+                else:
+                    self._fetch()
+                    self._write_cache()
+            return self._token
+
+    def invalidate(self):
+        """Сбрасывает токен, например после ответа 401"""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+            if self.cache_dir is not None:
+                try:
+                    os.unlink(self._cache_path())
+                except FileNotFoundError:
+                    pass
+
+    def _is_fresh(self, expires_at):
+        return time.time() < expires_at - self.refresh_margin
+
+    def _cache_path(self):
+        # Ключ кэша зависит от стенда и учётной записи, чтобы не смешивать окружения
+        key = hashlib.sha1(f"{self.base_url}|{self.login}|{self.domain}".encode()).hexdigest()[:16]
+        return os.path.join(str(self.cache_dir), f"token_{key}.json")
+
+    def _read_cache(self):
+        try:
+            with open(self._cache_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_cache(self):
+        path = self._cache_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"token": self._token, "expires_at": self._expires_at}, f)
+        os.replace(tmp_path, path)
+
+    @allure.step("Получение токена аутентификации")
+    def _fetch(self):
+        url = f"{self.base_url}/api/v1/tocken"
+        params = {
+            "login": self.login,
+            "password": self.password,
+            "timeoutlive": self.timeoutlive,
+            "domain": self.domain
+        }
+        allure.attach(
+            f"curl -X POST '{url}?login={self.login}&password=*****&timeoutlive={self.timeoutlive}&domain={self.domain}' "
+            f"-H 'accept: application/json'",
+            name="CURL команда",
+            attachment_type=allure.attachment_type.TEXT
+        )
+
+        issued_at = time.time()
+        response = requests.post(url, headers={"accept": "application/json"}, params=params, timeout=10)
+        self.requests_made += 1
+        response.raise_for_status()
+
+        token = response.json().get("tockenID")
+        if not token:
+            raise KeyError("Поле 'tockenID' отсутствует в ответе API")
+
+        self._token = token
+        self._expires_at = issued_at + self.timeoutlive
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_token_broker(cache_dir=TOKEN_CACHE_DIR):
+    """Возвращает брокер токенов, общий для всего процесса.
+
+    cache_dir=None — без общего файла токена: так воспроизведение кассеты не
+    оставляет поддельный токен для следующих прогонов на настоящем стенде.
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = TokenBroker.from_env(cache_dir=cache_dir)
+        return _broker
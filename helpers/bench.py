@@ -0,0 +1,390 @@
+"""Микробенчмарки собственного кода набора тестов.
+
+Замеряются горячие пути обвязки, а не бэкенд: сборка curl-команды, порядок и
+группы тестов (хук pytest_collection_modifyitems) на 100/1 000/10 000
+синтетических тестов, сериализация вложений, генерация тел запросов,
+проверка и потоковый разбор ответов. Замеры standin/* идут через api_client
+к локальному заменителю API; время обработки на сервере выводится отдельно,
+остальное — накладные расходы клиента, адаптеров и проверок.
+
+Каждый замер калибруется (число повторов в серии — пока серия не займёт
+--min-time), затем выполняется --repeat серий с отключённым сборщиком мусора.
+В таблице — медиана на одну операцию, межквартильный размах и минимум.
+
+    python -m helpers.bench                          # все замеры
+    python -m helpers.bench --filter ordering        # только совпадающие по имени
+    python -m helpers.bench --save                   # записать базовую линию
+    python -m helpers.bench --compare                # сравнить с базовой линией
+
+Регрессия — медиана больше базовой на --threshold (по умолчанию 25%) и
+нижний квартиль выше верхнего квартиля базовой линии (разброс не
+перекрывается). При регрессиях код завершения — 1. Базовая линия зависит от
+машины: сравнивайте замеры, сделанные на одной и той же.
+"""
+
+import argparse
+import gc
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import requests
+
+from config import BENCH_BASELINE_FILE
+from helpers import attachments, datapool, dataset, refdata, resilience, schema, timing, traffic
+from helpers.api_client import ApiClient
+from helpers.ordering import order_items
+from helpers.scheduler import CHAINS, assign_groups
+from helpers.stream import ArrayStream
+from utils import create_curl_command
+
+ITEM_COUNTS = (100, 1000, 10000)
+ATOMS = 1000
+POOL_ID = 441
+CATEGORY_ID = 261
+
+# Имя замера -> функция подготовки: context -> функция без аргументов для замера
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+class _Item:
+    """Минимальный заменитель pytest.Item для хука порядка"""
+
+    __slots__ = ("nodeid",)
+
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+
+
+def synthetic_items(count, seed=0):
+    """count тестов по папкам цепочек и фазам CRUD в перемешанном порядке"""
+    rng = random.Random(seed)
+    folders = [prefix for prefixes in CHAINS.values() for prefix in prefixes] + ["misc/", "service/vmw/"]
+    phases = ("create", "read", "update", "delete", "list")
+    items = []
+    for n in range(count):
+        folder = rng.choice(folders)
+        module = f"tests/{folder}test_{folder.strip('/').replace('/', '_')}_{rng.choice(phases)}.py"
+        items.append(_Item(f"{module}::test_case_{n}"))
+    rng.shuffle(items)
+    return items
+
+
+class Context:
+    """Общие данные замеров; заменитель API запускается при первом обращении"""
+
+    def __init__(self):
+        self._standin = None
+        self._client = None
+        self._atoms = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from helpers import standin
+
+            store = standin.Store()
+            for n in range(ATOMS):
+                atom = store.insert("resource_atom", {
+                    "name": f"Атом {n}", "description": "бенчмарк", "category_id": CATEGORY_ID,
+                    "duplicate": False, "usedInTS": 0,
+                })
+                store.insert("resource_pool_link_atom", {
+                    "pool_id": POOL_ID, "atom_id": atom["id"], "min_count": 0, "max_count": 10,
+                    "cost_price_active": 1.5, "cost_price_passive": 0.5, "type_use": 1,
+                })
+            self._standin = standin.StandinServer(store=store).start()
+            # Те же адаптеры, что ставит фикстура api_client
+            self._client = ApiClient(self._standin.url, token_provider=lambda: "bench")
+            resilience.install(self._client.session, resilience.Policy.from_env(), resilience.TransportStats())
+            traffic.install(self._client.session, traffic.Traffic(), traffic.ValidatorCache())
+            timing.install(self._client.session, timing.Timings())
+            refdata.install(self._client.session, refdata.ReferenceCache(self._client))
+        return self._client
+
+    @property
+    def server_seconds(self):
+        return self._standin.stats.seconds if self._standin else 0.0
+
+    @property
+    def atoms_params(self):
+        return {"by_pool_id": POOL_ID, "by_category_id": CATEGORY_ID}
+
+    @property
+    def atoms(self):
+        """Ответ resource_atoms заменителя: ATOMS атомов пула"""
+        if self._atoms is None:
+            response = self.client.get("/api/v1/resource_atoms", params=self.atoms_params)
+            response.raise_for_status()
+            self._atoms = response.json()
+        return self._atoms
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._standin.stop()
+
+
+@case("curl/create_curl_command")
+def _curl(context):
+    payload = datapool.organization(random.Random(0), 1)
+    headers = {"accept": "application/json", "content-type": "application/json", "tockenid": "0" * 32}
+    return lambda: create_curl_command("POST", "http://127.0.0.1/api/v1/organization", headers, payload)
+
+
+def _ordering_case(count):
+    def order(context):
+        items = synthetic_items(count)
+        return lambda: order_items(items)
+
+    def groups(context):
+        items = order_items(synthetic_items(count))
+        durations = {item.nodeid: 0.1 for item in items[::3]}
+        return lambda: assign_groups(items, durations)
+
+    case(f"ordering/order_items[{count}]")(order)
+    case(f"ordering/assign_groups[{count}]")(groups)
+
+
+for _count in ITEM_COUNTS:
+    _ordering_case(_count)
+
+
+def _attach_case(max_bytes):
+    def setup(context):
+        atoms = context.atoms
+
+        def run():
+            attachments.configure("always", max_bytes)
+            try:
+                attachments.attach_json(atoms, name="Атомы ресурсов")
+            finally:
+                attachments.configure()
+        return run
+    return setup
+
+
+case(f"attachments/json[{ATOMS} атомов, лимит 64 КиБ]")(_attach_case(attachments.DEFAULT_MAX_BYTES))
+case(f"attachments/json[{ATOMS} атомов, без лимита]")(_attach_case(0))
+
+
+@case("payload/datapool[organization×500]")
+def _datapool(context):
+    pool = datapool.DataPool(seed=0, batch_size=500)
+    return lambda: pool._generate("organization", 0)
+
+
+@case("payload/dataset[2000 услуг]")
+def _dataset(context):
+    rng = random.Random(0)
+    resources = [{"id": n, "name": f"Ресурс {n}", "category": {"unitMeasure": {"id": n % 3 + 1}}}
+                 for n in range(1, 11)]
+    catalog = dataset.build_catalog(resources, {}, [1, 2], 10, rng)
+    return lambda: dataset.generate([1], 2000, catalog, date(2025, 1, 1), date(2025, 12, 31), seed=0)
+
+
+@case(f"validation/schema[{ATOMS} атомов]")
+def _schema(context):
+    atoms = context.atoms
+    validator = schema.compile_schema(schema.SCHEMAS["resource_atoms"],
+                                      where={"pool_id": POOL_ID, "category.id": CATEGORY_ID})
+    return lambda: schema.assert_valid_list(atoms, validator)
+
+
+@case(f"validation/stream[{ATOMS} атомов]")
+def _stream(context):
+    body = json.dumps(context.atoms, ensure_ascii=False).encode("utf-8")
+
+    def run():
+        response = requests.Response()
+        response.raw = io.BytesIO(body)
+        return sum(1 for _ in ArrayStream(response))
+    return run
+
+
+@case("standin/get[роль]")
+def _standin_get(context):
+    client = context.client
+
+    def run():
+        response = client.get("/api/v1/role/1")
+        response.raise_for_status()
+        return response.json()
+    return run
+
+
+@case(f"standin/resource_atoms[{ATOMS}, поток и схема]")
+def _standin_atoms(context):
+    client = context.client
+    validator = schema.compile_schema(schema.SCHEMAS["resource_atoms"],
+                                      where={"pool_id": POOL_ID, "category.id": CATEGORY_ID})
+
+    def run():
+        response = client.get("/api/v1/resource_atoms", params=context.atoms_params, stream=True)
+        response.raise_for_status()
+        return schema.assert_valid_list(ArrayStream(response), validator)
+    return run
+
+
+def _series(func, loops):
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - started
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def measure(func, repeat=9, min_time=0.05, server_seconds=None):
+    """Статистика времени одной операции: медиана, квартили, минимум (секунды)"""
+    loops = 1
+    while _series(func, loops) < min_time:
+        loops *= 2
+    server_before = server_seconds() if server_seconds else 0.0
+    samples = [_series(func, loops) / loops for _ in range(repeat)]
+    q1, _, q3 = statistics.quantiles(samples, n=4) if len(samples) > 1 else samples * 3
+    result = {
+        "median": statistics.median(samples),
+        "q1": q1,
+        "q3": q3,
+        "min": min(samples),
+        "loops": loops,
+        "repeat": repeat,
+    }
+    if server_seconds:
+        result["server"] = (server_seconds() - server_before) / (loops * repeat)
+    return result
+
+
+def machine():
+    return {"python": platform.python_version(), "platform": platform.platform(), "node": platform.node()}
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results):
+    """Дописывает результаты в файл базовой линии (замеры с теми же именами заменяются)"""
+    baseline = load_baseline(path) or {"results": {}}
+    baseline["results"].update(results)
+    baseline["machine"] = machine()
+    baseline["created"] = datetime.now().isoformat(timespec="seconds")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+def regressed(current, base, threshold):
+    return current["median"] > base["median"] * (1 + threshold) and current["q1"] > base["q3"]
+
+
+def _format_time(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} с"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} мс"
+    return f"{seconds * 1e6:.1f} мкс"
+
+
+def format_table(results, baseline=None, threshold=0.25):
+    width = max([len(name) for name in results] + [6])
+    lines = [f"{'Замер':<{width}} {'медиана':>10} {'±IQR':>7} {'минимум':>10} {'сервер':>10}  базовая линия"]
+    for name, result in results.items():
+        spread = (result["q3"] - result["q1"]) / result["median"] * 100 if result["median"] else 0.0
+        server = _format_time(result["server"]) if "server" in result else "—"
+        line = (f"{name:<{width}} {_format_time(result['median']):>10} {spread:>6.1f}% "
+                f"{_format_time(result['min']):>10} {server:>10}")
+        base = (baseline or {}).get(name)
+        if base:
+            ratio = result["median"] / base["median"]
+            mark = "  РЕГРЕССИЯ" if regressed(result, base, threshold) else ""
+            line += f"  ×{ratio:.2f}{mark}"
+        lines.append(line)
+    return lines
+
+
+def run(names, repeat=9, min_time=0.05, progress=None):
+    """Выполняет замеры по именам; результаты в порядке CASES"""
+    context = Context()
+    results = {}
+    try:
+        for name in names:
+            func = CASES[name](context)
+            server = (lambda: context.server_seconds) if name.startswith("standin/") else None
+            results[name] = measure(func, repeat, min_time, server)
+            if progress:
+                progress(name, results[name])
+    finally:
+        context.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Микробенчмарки обвязки набора тестов")
+    parser.add_argument("--filter", default="", help="Только замеры, в имени которых есть подстрока")
+    parser.add_argument("--repeat", type=int, default=9, help="Серий на замер")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Минимальная длительность серии, с")
+    parser.add_argument("--baseline", default=str(BENCH_BASELINE_FILE), help="Файл базовой линии")
+    parser.add_argument("--save", action="store_true", help="Записать результаты в базовую линию")
+    parser.add_argument("--compare", action="store_true", help="Сравнить с базовой линией; код 1 при регрессии")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Допустимое замедление медианы (доля)")
+    parser.add_argument("--json", help="Сохранить результаты в JSON-файл")
+    parser.add_argument("--list", action="store_true", help="Показать имена замеров")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return
+    if not names:
+        raise SystemExit(f"Нет замеров с «{args.filter}» в имени")
+
+    results = run(names, args.repeat, args.min_time,
+                  progress=lambda name, result: print(f"  {name}: {_format_time(result['median'])}", file=sys.stderr))
+
+    baseline_path = Path(args.baseline)
+    baseline = load_baseline(baseline_path) if args.compare else None
+    if args.compare and baseline is None:
+        raise SystemExit(f"Базовая линия не найдена: {baseline_path} (создайте её с --save)")
+    if baseline and baseline.get("machine") != machine():
+        print(f"Внимание: базовая линия снята на другой машине: {baseline.get('machine')}")
+    for line in format_table(results, baseline and baseline["results"], args.threshold):
+        print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "results": results}, f, ensure_ascii=False, indent=2)
+    if args.save:
+        save_baseline(baseline_path, results)
+        print(f"Базовая линия: {baseline_path}")
+    if baseline:
+        failed = [name for name, result in results.items()
+                  if name in baseline["results"] and regressed(result, baseline["results"][name], args.threshold)]
+        if failed:
+            raise SystemExit(f"Регрессии ({len(failed)}): {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Запись и воспроизведение трафика API (кассеты JSONL).
+
+В режиме record каждый запрос и ответ дописывается в кассету отдельной
+строкой JSON. В режиме replay ответы берутся из кассеты без обращения к сети.
+Запись ищется по ключу (метод, путь, нормализованные query-параметры, sha256
+тела запроса). Тела POST/PUT часто содержат случайные данные (пул тестовых данных), поэтому
+при отсутствии точного совпадения берётся запись с тем же методом, путём и
+параметрами. Одинаковые запросы воспроизводятся в порядке записи, каждая
+запись выдаётся один раз; когда записи заканчиваются, повторяется последняя.
+
+Потоковые ответы (stream=True) записываются байтами по мере чтения, при
+дочитывании или закрытии: запись не заставляет читать тело целиком. Токен
+при воспроизведении выдаётся вне кассеты — прогон, взявший токен из кэша
+брокера, записывает кассету без POST /api/v1/tocken.
+
+Первая строка кассеты может содержать {"meta": {...}} — параметры прогона,
+без которых воспроизведение не повторит запросы (настройки пула данных).
+
+Хост в ключ не входит: кассету, записанную на одном стенде, можно
+воспроизвести с любым API_URL и сравнить (diff) с кассетой другого стенда.
+Значения секретных параметров (password) и выданные токены в кассету
+не попадают.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import deque
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config import CASSETTE_MODES
+
+MODES = CASSETTE_MODES
+
+SECRET_PARAMS = ("password",)
+SECRET_FIELDS = ("tockenID",)
+TOKEN_PATH = "/api/v1/tocken"
+
+
+class CassetteMiss(requests.ConnectionError):
+    """В кассете нет ответа на запрос (режим replay)"""
+
+
+def _params(url):
+    pairs = []
+    for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True):
+        pairs.append([name, "***" if name.lower() in SECRET_PARAMS else value])
+    return sorted(pairs)
+
+
+def _body_hash(body):
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    try:
+        # JSON нормализуется: порядок ключей и пробелы не влияют на ключ
+        body = json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False).encode("utf-8")
+    except ValueError:
+        pass
+    return hashlib.sha256(body).hexdigest()
+
+
+def request_key(method, url, body=None):
+    """Ключ записи: (метод, путь, параметры, sha256 тела)"""
+    params = json.dumps(_params(url), ensure_ascii=False)
+    return method.upper(), urlsplit(url).path, params, _body_hash(body)
+
+
+def _entry(request, response, content):
+    """Запись кассеты по телу ответа content (байты, прочитанные клиентом)"""
+    method, path, _, body_sha256 = request_key(request.method, request.url, request.body)
+    entry = {
+        "method": method,
+        "path": path,
+        "params": _params(request.url),
+        "body_sha256": body_sha256,
+        "status": response.status_code,
+        "content_type": response.headers.get("Content-Type"),
+    }
+    try:
+        data = json.loads(content)
+    except ValueError:
+        entry["text"] = content.decode(response.encoding or "utf-8", errors="replace")
+    else:
+        if isinstance(data, dict):
+            data = {k: "***" if k in SECRET_FIELDS else v for k, v in data.items()}
+        entry["json"] = data
+    return entry
+
+
+class Recorder(BaseAdapter):
+    """Адаптер-обёртка: передаёт запрос дальше и дописывает пару в кассету"""
+
+    def __init__(self, inner, path):
+        super().__init__()
+        self.inner = inner
+        self.path = str(path)
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        if kwargs.get("stream"):
+            self._record_stream(request, response)
+        else:
+            self._write(_entry(request, response, response.content))
+        return response
+
+    def _write(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        # Одна запись O_APPEND на строку: воркеры xdist пишут в общий файл
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+
+    def _record_stream(self, request, response):
+        """Потоковый ответ записывается прочитанными байтами при дочитывании или закрытии"""
+        iter_content, close = response.iter_content, response.close
+        chunks = []
+        recorded = []
+
+        def record():
+            if not recorded:
+                recorded.append(True)
+                self._write(_entry(request, response, b"".join(chunks)))
+
+        def recording(*args, **kwargs):
+            try:
+                for chunk in iter_content(*args, **kwargs):
+                    chunks.append(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+                    yield chunk
+            finally:
+                record()
+
+        def closing():
+            record()
+            close()
+
+        response.iter_content = recording
+        response.close = closing
+
+    def close(self):
+        self.inner.close()
+
+
+class Player(BaseAdapter):
+    """Адаптер без сети: ответы из кассеты по индексу"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = str(path)
+        self._exact = {}
+        self._loose = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "meta" in entry:
+                    continue
+                params = json.dumps(entry["params"], ensure_ascii=False)
+                key = (entry["method"], entry["path"], params, entry["body_sha256"])
+                # Запись стоит в обеих очередях, но выдаётся один раз
+                slot = {"entry": entry, "used": False}
+                self._exact.setdefault(key, deque()).append(slot)
+                self._loose.setdefault(key[:3], deque()).append(slot)
+                self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    @staticmethod
+    def _take(slots):
+        """Следующая не выданная запись очереди или None; последняя в очереди не удаляется"""
+        while len(slots) > 1 and slots[0]["used"]:
+            slots.popleft()
+        slot = slots[0]
+        if slot["used"]:
+            return None
+        slot["used"] = True
+        if len(slots) > 1:
+            slots.popleft()
+        return slot["entry"]
+
+    def lookup(self, method, url, body=None):
+        key = request_key(method, url, body)
+        with self._lock:
+            queues = [slots for slots in (self._exact.get(key), self._loose.get(key[:3])) if slots]
+            for slots in queues:
+                entry = self._take(slots)
+                if entry is not None:
+                    return entry
+            # Записи закончились — повторяется последняя
+            if queues:
+                return queues[0][-1]["entry"]
+        return None
+
+    def send(self, request, **kwargs):
+        entry = self.lookup(request.method, request.url, request.body)
+        if entry is None and request.method == "POST" and urlsplit(request.url).path == TOKEN_PATH:
+            # Токен в кассету не пишется (SECRET_FIELDS), запись о нём необязательна
+            entry = {"status": 200, "content_type": "application/json", "json": {"tockenID": "***"}}
+        if entry is None:
+            raise CassetteMiss(
+                f"Нет записи в кассете {self.path}: {request.method} {request.url}", request=request
+            )
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = "OK" if entry["status"] < 400 else "Error"
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        response.elapsed = timedelta(0)
+        response.headers = CaseInsensitiveDict()
+        if entry.get("content_type"):
+            response.headers["Content-Type"] = entry["content_type"]
+        if "json" in entry:
+            response._content = json.dumps(entry["json"], ensure_ascii=False).encode("utf-8")
+        else:
+            response._content = (entry.get("text") or "").encode("utf-8")
+        # Тело уже в памяти: iter_content (stream=True) отдаёт его кусками
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
+
+
+def start_recording(path, meta=None):
+    """Начинает новую кассету (существующий файл очищается), meta — первой строкой"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        if meta:
+            f.write(json.dumps({"meta": meta}, ensure_ascii=False) + "\n")
+
+
+def read_meta(path):
+    """Параметры прогона из первой строки кассеты ({} — их нет)"""
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.readline()
+    try:
+        return json.loads(first).get("meta") or {}
+    except (ValueError, AttributeError):
+        return {}
+
+
+def install(session, mode, path):
+    """Подключает запись или воспроизведение к сессии requests"""
+    if mode == "record":
+        adapter = Recorder(session.get_adapter("http://"), path)
+    elif mode == "replay":
+        adapter = Player(path)
+    else:
+        raise ValueError(f"Неизвестный режим кассеты: {mode}. Допустимо: {', '.join(MODES)}")
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
@@ -0,0 +1,355 @@
+"""Пул тестовых данных: организации, пользователи, тарифы, единицы измерения.
+
+Тела запросов генерируются пачками по batch_size из random.Random(seed, вид,
+номер пачки) и небольших словарей — без Faker.
+
+Тесты берут элементы в аренду: lease("organization") возвращает следующий ещё
+не выданный элемент. Номера выдаются счётчиком из общего состояния прогона,
+поэтому параллельные воркеры не получают одинаковых данных.
+
+По умолчанию seed случайный на каждый прогон (один на все воркеры), а к
+уникальным полям (логин, почта, название) добавляется метка прогона: свежие
+checkout'ы в CI не создают на общем стенде одинаковых сущностей. С явным
+DATA_POOL_SEED пул детерминирован: пачка создаётся при первом обращении к её
+элементам и сохраняется в кэш (JSON, сжатый gzip), а позиция, до которой пул
+израсходован, сохраняется после прогона — следующий прогон с тем же seed
+продолжает с неё, и уникальные поля не повторяются.
+
+    DATA_POOL_SEED=0              — фиксированный seed пула (по умолчанию случайный)
+    DATA_POOL_BATCH=500           — размер пачки
+
+Прогрев кэша перед нагрузочным прогоном на 10 000 организаций:
+    DATA_POOL_SEED=0 python -m helpers.datapool --kind organization --count 10000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import string
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from config import DATA_POOL_DIR, ENV_FILE
+
+# Меняется при изменении генераторов: старый кэш перестаёт подходить
+VERSION = 1
+
+# Метка прогона со случайным seed: короткая, чтобы логин оставался в 20 символах
+RUN_TAG_ALPHABET = string.digits + string.ascii_lowercase
+RUN_TAG_BASE = len(RUN_TAG_ALPHABET)
+RUN_TAG_LENGTH = 4
+
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Daniel", "Nancy", "Matthew", "Lisa",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Jackson",
+    "Martin", "Lee", "Thompson", "White", "Harris", "Clark", "Lewis", "Walker",
+)
+COMPANY_WORDS = (
+    "Vector", "Orbit", "Summit", "Harbor", "Granite", "Nimbus", "Atlas", "Beacon",
+    "Cobalt", "Delta", "Ember", "Falcon", "Horizon", "Ionic", "Juniper", "Keystone",
+)
+COMPANY_SUFFIXES = ("LLC", "Inc", "Group", "Ltd", "and Sons", "PLC")
+STREETS = ("Main St", "Oak Ave", "Pine Rd", "Maple Dr", "Cedar Ln", "Elm St", "Lake Blvd", "Hill Rd")
+CITIES = ("Springfield", "Riverside", "Franklin", "Greenville", "Bristol", "Clinton", "Fairview", "Salem")
+JOBS = ("Manager", "Accountant", "Engineer", "Analyst", "Consultant", "Director", "Administrator")
+DOMAINS = ("example.com", "example.org", "example.net")
+WORDS = (
+    "service", "account", "contract", "billing", "resource", "network", "storage", "support",
+    "tariff", "period", "report", "client", "access", "backup", "monitoring", "license",
+)
+PASSWORD_SPECIAL = "!@#$%^&*()_+"
+
+
+def _digits(rng, count):
+    """Строка ровно из count цифр, без ведущего нуля"""
+    return str(rng.randrange(10 ** (count - 1), 10 ** count))
+
+
+def _address(rng):
+    return (f"{rng.randrange(1, 9999)} {rng.choice(STREETS)}, "
+            f"{rng.choice(CITIES)}, {_digits(rng, 5)}")
+
+
+def _text(rng, words=12):
+    return " ".join(rng.choices(WORDS, k=words)).capitalize() + "."
+
+
+def _company(rng):
+    return f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}"
+
+
+def _password(rng, length=12):
+    # Как faker.password(special_chars=True): есть цифра, буквы обоих регистров и спецсимвол
+    chars = [rng.choice(string.digits), rng.choice(string.ascii_uppercase),
+             rng.choice(string.ascii_lowercase), rng.choice(PASSWORD_SPECIAL)]
+    chars += rng.choices(string.ascii_letters + string.digits + PASSWORD_SPECIAL, k=length - len(chars))
+    rng.shuffle(chars)
+    return "".join(chars)
+
+
+def organization(rng, number):
+    """Тело POST /api/v1/organization"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "name": f"{_company(rng)} {number}",
+        "number_contract": _digits(rng, 10),
+        "cid": _digits(rng, 4),
+        "contract_begin_time": "2025-07-16",
+        "address": _address(rng),
+        "fact_address": _address(rng),
+        "contact_name": f"{first} {last}",
+        "contact_data": rng.choice(JOBS),
+        "contact_phone": f"+7{_digits(rng, 10)}",
+        "contact_mail": f"{first.lower()}.{last.lower()}{number}@{rng.choice(DOMAINS)}",
+        "description": _text(rng),
+        "inn": _digits(rng, 10),
+        "kpp": _digits(rng, 6),
+        "bik": _digits(rng, 9),
+        "pay_account": _digits(rng, 12),
+        "kor_account": _digits(rng, 10),
+        "bank_name": f"{_company(rng)} Bank",
+        "sub_right_ref_id": 2,
+        "manager_id": 434,
+        "tenant_id": 123,
+        "type_right_ref_id": 9,
+    }
+
+
+def user(rng, number):
+    """Тело POST /api/v1/user; логин и почта уникальны в пределах seed и метки прогона"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    login = f"{first[0].lower()}{last.lower()}{number}"
+    return {
+        "fio": f"{first} {last}",
+        "login": login,
+        "password": _password(rng),
+        "mail": f"{login}@{rng.choice(DOMAINS)}",
+        "phone": f"79{_digits(rng, 9)}",
+        "role_id": 1,
+        "tenant_id": 123,
+        "is_manager": rng.choice((0, 1)),
+    }
+
+
+def tariff(rng, number):
+    """Тело POST /api/v1/tariff"""
+    return {
+        "name": f"AutoTest Tariff {number}",
+        "description": f"Created by API test: {_text(rng, 4)}",
+        "service_id": 418,
+        "status_id": 2,
+        "type_level_resource": 2,
+        "location_id": 125,
+        "time_interval_id": 3,
+        "permanent_service": 1,
+    }
+
+
+def unit_measure(rng, number):
+    """Тело POST /api/v1/resource_units_measure"""
+    return {"name": f"Ед. изм. {number}"}
+
+
+GENERATORS = {
+    "organization": organization,
+    "user": user,
+    "tariff": tariff,
+    "unit_measure": unit_measure,
+}
+
+
+def seed_from_env():
+    """Явно заданный DATA_POOL_SEED или None"""
+    load_dotenv(ENV_FILE)
+    value = os.getenv("DATA_POOL_SEED", "").strip()
+    return int(value) if value else None
+
+
+def random_seed():
+    """Seed прогона без DATA_POOL_SEED: выбирается один раз и передаётся воркерам"""
+    return random.SystemRandom().randrange(RUN_TAG_BASE ** RUN_TAG_LENGTH)
+
+
+def run_tag(seed):
+    """Метка прогона для уникальных полей: seed в RUN_TAG_LENGTH символах [0-9a-z]"""
+    digits = []
+    for _ in range(RUN_TAG_LENGTH):
+        seed, digit = divmod(seed, RUN_TAG_BASE)
+        digits.append(RUN_TAG_ALPHABET[digit])
+    return "".join(reversed(digits))
+
+
+def cursor_key(kind):
+    """Ключ счётчика выданных элементов в общем состоянии прогона"""
+    return f"DATA_POOL_{kind.upper()}"
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class _LocalCounter:
+    """Счётчик выдачи в одном процессе (без общего состояния прогона)"""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, key, amount=1, start=0):
+        with self._lock:
+            value = self._values.get(key, start)
+            self._values[key] = value + amount
+            return value
+
+
+class DataPool:
+    """Пачки тел запросов с ленивой генерацией, кэшем на диске и арендой"""
+
+    def __init__(self, seed=0, cache_dir=None, batch_size=500, counter=None, tag=""):
+        if batch_size < 1:
+            raise ValueError("Размер пачки должен быть положительным")
+        self.seed = seed
+        # Приписывается к номеру элемента в уникальных полях
+        self.tag = tag
+        self.batch_size = batch_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        # counter(ключ, сколько, начало) -> номер первого выданного элемента
+        self._counter = counter or _LocalCounter()
+        self._batches = {}
+        self._lock = threading.Lock()
+        self.offsets = load_cursor(self.cache_dir, seed) if self.cache_dir else {}
+        self.generated = 0
+        self.loaded = 0
+
+    @classmethod
+    def from_env(cls, cache_dir=None, counter=None, run_seed=None):
+        """Пул с seed и размером пачки из .env.
+
+        Без DATA_POOL_SEED используется run_seed (или новый случайный) с меткой
+        прогона в уникальных полях; такие пачки на диск не сохраняются.
+        """
+        seed = seed_from_env()
+        batch_size = int(os.getenv("DATA_POOL_BATCH", 500))
+        if seed is not None:
+            return cls(seed=seed, cache_dir=cache_dir, batch_size=batch_size, counter=counter)
+        seed = random_seed() if run_seed is None else run_seed
+        return cls(seed=seed, batch_size=batch_size, counter=counter, tag=run_tag(seed))
+
+    def settings(self):
+        """Всё, что определяет выдаваемые данные: seed, метка, размер пачки и позиция"""
+        return {"seed": self.seed, "tag": self.tag, "batch_size": self.batch_size, "offsets": dict(self.offsets)}
+
+    @classmethod
+    def from_settings(cls, settings, counter=None):
+        """Пул, выдающий те же данные, что пул с settings() (без кэша на диске)"""
+        pool = cls(seed=settings["seed"], batch_size=settings["batch_size"], counter=counter, tag=settings["tag"])
+        pool.offsets = dict(settings["offsets"])
+        return pool
+
+    def _path(self, kind, batch):
+        return self.cache_dir / f"v{VERSION}-{kind}-{self.seed}-{self.batch_size}-{batch}.json.gz"
+
+    def _generate(self, kind, batch):
+        make = GENERATORS[kind]
+        rng = random.Random(f"{self.seed}:{kind}:{batch}")
+        first = batch * self.batch_size
+        return [make(rng, f"{self.tag}{number}") for number in range(first + 1, first + self.batch_size + 1)]
+
+    def _batch(self, kind, batch):
+        with self._lock:
+            items = self._batches.get((kind, batch))
+            if items is not None:
+                return items
+            path = self._path(kind, batch) if self.cache_dir else None
+            if path is not None and path.exists():
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    items = json.load(f)
+                self.loaded += 1
+            else:
+                items = self._generate(kind, batch)
+                self.generated += 1
+                if path is not None:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    data = json.dumps(items, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                    _atomic_write(path, gzip.compress(data, compresslevel=6, mtime=0))
+            self._batches[(kind, batch)] = items
+            return items
+
+    def item(self, kind, index):
+        """Элемент пула по номеру (с нуля) — копия, её можно менять"""
+        if kind not in GENERATORS:
+            raise KeyError(f"Неизвестный вид данных {kind}: {', '.join(GENERATORS)}")
+        batch, position = divmod(index, self.batch_size)
+        return dict(self._batch(kind, batch)[position])
+
+    def lease_many(self, kind, count):
+        """count ещё не выданных элементов подряд"""
+        if kind not in GENERATORS:
+            raise KeyError(f"Неизвестный вид данных {kind}: {', '.join(GENERATORS)}")
+        first = self._counter(cursor_key(kind), count, self.offsets.get(kind, 0))
+        return [self.item(kind, index) for index in range(first, first + count)]
+
+    def lease(self, kind):
+        """Следующий ещё не выданный элемент"""
+        return self.lease_many(kind, 1)[0]
+
+
+def _cursor_path(cache_dir, seed):
+    return Path(cache_dir) / f"v{VERSION}-cursor-{seed}.json"
+
+
+def load_cursor(cache_dir, seed):
+    """Сколько элементов каждого вида выдано прошлыми прогонами с этим seed"""
+    try:
+        with open(_cursor_path(cache_dir, seed), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_cursor(cache_dir, seed, values):
+    """Сохраняет позиции из счётчиков прогона {cursor_key(вид): значение}"""
+    cursor = load_cursor(cache_dir, seed)
+    for kind in GENERATORS:
+        if cursor_key(kind) in values:
+            cursor[kind] = max(cursor.get(kind, 0), int(values[cursor_key(kind)]))
+    path = _cursor_path(cache_dir, seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write(path, json.dumps(cursor, indent=2).encode("utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Прогрев кэша пула тестовых данных")
+    parser.add_argument("--kind", choices=sorted(GENERATORS), default="organization")
+    parser.add_argument("--count", type=int, default=10000, help="Сколько элементов подготовить")
+    parser.add_argument("--seed", type=int, default=seed_from_env() or 0)
+    parser.add_argument("--batch", type=int, default=int(os.getenv("DATA_POOL_BATCH", 500)))
+    parser.add_argument("--no-cache", action="store_true", help="Только сгенерировать, не сохраняя")
+    args = parser.parse_args(argv)
+
+    pool = DataPool(args.seed, None if args.no_cache else DATA_POOL_DIR, args.batch)
+    started = time.perf_counter()
+    offset = pool.offsets.get(args.kind, 0)
+    for index in range(offset, offset + args.count):
+        pool.item(args.kind, index)
+    elapsed = time.perf_counter() - started
+    print(f"{args.kind}: элементы {offset}–{offset + args.count - 1}, пачек сгенерировано "
+          f"{pool.generated}, загружено из кэша {pool.loaded}, {elapsed:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Генератор синтетических данных для объёмных тестов биллинга.
+
+По каталогу услуг строит план ручных начислений (pre_billing/manual/items)
+для N организаций по M услуг в каждой за произвольный период (через месяцы и
+годы) и одновременно считает ожидаемые итоги: по организации, по атому
+ресурса и по дням. Генерация детерминирована: один seed — один и тот же план.
+
+Каждая услуга длится duration_days, между слотами — gap_days перерыва. Если
+услуг больше, чем слотов в периоде, они равномерно делят слоты. Без конца
+периода он подбирается по числу услуг, но не длиннее MAX_AUTO_PERIOD_DAYS.
+
+Столбцы (услуга, количество, час) выбираются пачками через
+random.Random.choices — без внешних зависимостей.
+
+    python -m helpers.dataset --orgs 5 --services 2000 --start 2024-01-01 --end 2025-12-31 --seed 1
+"""
+
+import argparse
+import json
+import random
+from datetime import date, timedelta
+
+PAYMENT_TYPES = ("service", "total")
+
+# Предел периода, подбираемого без end: 10 000 услуг не растягиваются на 80 лет
+MAX_AUTO_PERIOD_DAYS = 365
+
+
+def build_catalog(resources, units_map, billing_type_ids, size, rng):
+    """Каталог услуг из атомов ресурсов: цена, тип оплаты и тип биллинга — случайные"""
+    selected = rng.sample(resources, min(size, len(resources)))
+    prices = rng.choices(range(100, 5001), k=len(selected))
+    payment_types = rng.choices(PAYMENT_TYPES, k=len(selected))
+    billing_types = rng.choices(list(billing_type_ids) or [2], k=len(selected))
+    catalog = []
+    for res, price, payment_type, billing_type_id in zip(selected, prices, payment_types, billing_types):
+        unit_measure_id = res["category"]["unitMeasure"]["id"]
+        catalog.append({
+            "name": res["name"],
+            "price": price,
+            "unit_measure_id": unit_measure_id,
+            "resource_atom_id": res["id"],
+            "payment_type": payment_type,
+            "billing_type_id": billing_type_id,
+            "unit_name": units_map.get(unit_measure_id, "Неизвестно"),
+        })
+    return catalog
+
+
+def slots(start, end, duration_days=2, gap_days=1):
+    """Даты начала слотов в периоде [start, end]: услуга целиком помещается в период"""
+    step = duration_days + gap_days
+    count = ((end - start).days - duration_days + 1) // step + 1
+    return [start + timedelta(days=step * n) for n in range(max(0, count))]
+
+
+def _empty_totals():
+    return {"services": 0, "amount": 0, "atoms": {}, "days": {}}
+
+
+def _add(totals, item):
+    amount = item["quantity"] * item["service"]["price"]
+    totals["services"] += 1
+    totals["amount"] += amount
+    atom = totals["atoms"].setdefault(item["service"]["resource_atom_id"], {"quantity": 0, "cost": 0})
+    atom["quantity"] += item["quantity"]
+    atom["cost"] += amount
+    totals["days"][item["record_start_date"]] = totals["days"].get(item["record_start_date"], 0) + amount
+
+
+class Dataset:
+    """План начислений и ожидаемые итоги по организациям"""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.plan = []
+        self.totals = {}
+
+    def add(self, item):
+        self.plan.append(item)
+        _add(self.totals.setdefault(item["org_id"], _empty_totals()), item)
+
+    def expected(self, org_id, begin=None, end=None):
+        """Итоги организации по услугам, начавшимся в [begin, end] (даты ГГГГ-ММ-ДД)"""
+        if begin is None and end is None:
+            return self.totals.get(org_id, _empty_totals())
+        totals = _empty_totals()
+        for item in self.plan:
+            started = item["record_start_date"]
+            if item["org_id"] == org_id and (begin or started) <= started <= (end or started):
+                _add(totals, item)
+        return totals
+
+
+def generate(org_ids, services_per_org, catalog, start, end=None, seed=0,
+             duration_days=2, gap_days=1, quantity=(1, 5), hours=(9, 17)):
+    """План на services_per_org услуг для каждой организации и ожидаемые итоги.
+
+    end=None — период подбирается так, чтобы на каждую услугу пришёлся свой слот,
+    но не длиннее MAX_AUTO_PERIOD_DAYS (дальше услуги делят слоты).
+    """
+    if not catalog:
+        raise ValueError("Пустой каталог услуг")
+    if end is None:
+        days = min((duration_days + gap_days) * services_per_org, MAX_AUTO_PERIOD_DAYS)
+        end = start + timedelta(days=max(days, duration_days - 1))
+    starts = slots(start, end, duration_days, gap_days)
+    if not starts and services_per_org:
+        raise ValueError(f"В период {start} — {end} не помещается ни одна услуга длиной {duration_days} дн.")
+
+    rng = random.Random(seed)
+    dataset = Dataset(seed)
+    length = timedelta(days=duration_days - 1)
+    slot_of = [n * len(starts) // services_per_org for n in range(services_per_org)] if services_per_org else []
+    quantities = range(quantity[0], quantity[1] + 1)
+    hour_values = range(hours[0], hours[1] + 1)
+    for org_id in org_ids:
+        # Столбцы одной организации выбираются пачкой
+        services = rng.choices(catalog, k=services_per_org)
+        counts = rng.choices(quantities, k=services_per_org)
+        at_hours = rng.choices(hour_values, k=services_per_org)
+        for slot, service, count, hour in zip(slot_of, services, counts, at_hours):
+            started = starts[slot]
+            item = {
+                "org_id": org_id,
+                "service": service,
+                "start_date": started,
+                "record_start_date": started.isoformat(),
+                "record_end_date": (started + length).isoformat(),
+                "quantity": count,
+                "hour": hour,
+            }
+            dataset.add(item)
+    return dataset
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Синтетический план начислений и ожидаемые итоги")
+    parser.add_argument("--orgs", type=int, default=1, help="Число организаций")
+    parser.add_argument("--services", type=int, default=10, help="Услуг на организацию")
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today().replace(day=1),
+                        help="Начало периода, ГГГГ-ММ-ДД")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Конец периода, ГГГГ-ММ-ДД")
+    parser.add_argument("--catalog", type=int, default=10, help="Размер синтетического каталога")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Сохранить план и итоги в JSON-файл")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    resources = [
+        {"id": n, "name": f"Ресурс {n}", "category": {"unitMeasure": {"id": n % 3 + 1}}}
+        for n in range(1, args.catalog + 1)
+    ]
+    catalog = build_catalog(resources, {}, [1, 2], args.catalog, rng)
+    dataset = generate(range(1, args.orgs + 1), args.services, catalog, args.start, args.end, args.seed)
+
+    for org_id, totals in dataset.totals.items():
+        days = sorted(totals["days"])
+        print(f"Организация {org_id}: услуг {totals['services']}, сумма {totals['amount']:.2f} руб., "
+              f"атомов {len(totals['atoms'])}, период {days[0]} — {days[-1]}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "seed": args.seed,
+                "plan": [{**item, "start_date": item["record_start_date"]} for item in dataset.plan],
+                "totals": {str(org_id): totals for org_id, totals in dataset.totals.items()},
+            }, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Фильтры читающих тестов — общие для тестов и сценариев helpers/load.py.
+
+Нагрузочный прогон повторяет запросы тестов чтения; чтобы сценарий не
+разошёлся с тестом, значения фильтров и переменные .env, из которых они
+берутся, описаны здесь один раз. Функции принимают окружение (os.environ
+после load_dotenv или словарь) и возвращают query-параметры.
+"""
+
+# GET /api/v1/organizations (tests/organizations/test_organizations_read.py)
+DEFAULT_TENANT_ID = "123"
+
+# GET /api/v1/resource_atoms (tests/resource/resource_atoms/test_resource_atoms_read.py)
+DEFAULT_POOL_ID = "441"
+DEFAULT_CATEGORY_ID = "261"
+
+# GET /api/v1/tariffs (tests/tariff/tariffs/test_tariffs_read.py)
+TARIFF_FILTERS = {
+    "by_service_id": 304,
+    "by_name": "Услуги ЦОД",
+}
+
+# GET /api/v1/billing/services по одному параметру (tests/service/services/test_services_read.py):
+# (параметр, переменная .env со значением, описание)
+SERVICE_FILTERS = [
+    ("by_organization_id", "ORGANIZATION_ID", "по ID организации"),
+    ("by_service_system_name", "SERVICE_SYSTEM_NAME", "по системному имени сервиса"),
+    ("by_render_resource", "RENDER_RESOURCE_ID", "по ID рендер-ресурса"),
+]
+
+
+def tenant_id(env):
+    """TEST_TENANT_ID — тенант для списка организаций"""
+    return env.get("TEST_TENANT_ID", DEFAULT_TENANT_ID)
+
+
+def resource_atoms_filters(env):
+    """by_pool_id и by_category_id из FILTER_BY_POOL_ID и FILTER_BY_CATEGORY_ID"""
+    return {
+        "by_pool_id": env.get("FILTER_BY_POOL_ID", DEFAULT_POOL_ID),
+        "by_category_id": env.get("FILTER_BY_CATEGORY_ID", DEFAULT_CATEGORY_ID),
+    }
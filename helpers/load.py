@@ -0,0 +1,313 @@
+"""Нагрузочный прогон читающих сценариев на asyncio.
+
+Сценарии повторяют запросы тестов чтения (те же эндпоинты, фильтры и
+значения по умолчанию из .env). N виртуальных пользователей выполняют их
+по кругу с заданной суммарной частотой (RPS). Для каждого эндпоинта
+выводятся p50/p95/p99, пропускная способность и доля ошибок.
+
+    python -m helpers.load --users 20 --rps 200 --duration 30
+    python -m helpers.load --scenario tariffs_read --standin
+
+HTTP-клиент — собственный пул keep-alive соединений HTTP/1.1 на asyncio
+streams, без внешних зависимостей. Задержка считается от запланированного
+момента отправки, а не от фактического: если все пользователи заняты,
+ожидание в очереди входит в задержку (без coordinated omission).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import time
+from urllib.parse import urlencode, urlsplit
+
+from dotenv import load_dotenv
+
+from config import ENV_FILE
+from helpers import filters
+from helpers.timing import percentile
+
+# Сценарий -> (тест-источник, функция env -> [(эндпоинт, путь, параметры)]);
+# фильтры — из helpers/filters.py, как в самих тестах
+SCENARIOS = {
+    "organizations_read": (
+        "tests/organizations/test_organizations_read.py",
+        lambda env: [
+            ("GET /organizations", "/api/v1/organizations", {"by_tenant_id": filters.tenant_id(env)}),
+        ],
+    ),
+    "resource_atoms_read": (
+        "tests/resource/resource_atoms/test_resource_atoms_read.py",
+        lambda env: [
+            ("GET /resource_atoms", "/api/v1/resource_atoms", filters.resource_atoms_filters(env)),
+        ],
+    ),
+    "tariffs_read": (
+        "tests/tariff/tariffs/test_tariffs_read.py",
+        lambda env: [
+            ("GET /tariffs", "/api/v1/tariffs", dict(filters.TARIFF_FILTERS)),
+        ],
+    ),
+    "services_read": (
+        "tests/service/services/test_services_read.py",
+        lambda env: [
+            (f"GET /billing/services?{param}", "/api/v1/billing/services", {param: env[name]})
+            for param, name, _ in filters.SERVICE_FILTERS
+            if env.get(name)
+        ],
+    ),
+}
+
+
+def build_plan(names, env=None):
+    """Список запросов выбранных сценариев"""
+    env = os.environ if env is None else env
+    plan = []
+    for name in names:
+        plan.extend(SCENARIOS[name][1](env))
+    if not plan:
+        raise RuntimeError("Нет запросов для выбранных сценариев: проверьте переменные .env")
+    return plan
+
+
+class AsyncHttpClient:
+    """Асинхронный HTTP/1.1-клиент с пулом keep-alive соединений"""
+
+    def __init__(self, base_url, headers=None, pool_size=10, timeout=30.0):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.headers = {"Host": parts.netloc, "Accept": "application/json", **(headers or {})}
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._slots = asyncio.Semaphore(pool_size)
+        self._idle = []
+
+    async def _connect(self):
+        self.connections_opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def request(self, method, path, params=None):
+        """Возвращает (статус, тело); соединение возвращается в пул"""
+        target = self.prefix + path + (f"?{urlencode(params)}" if params else "")
+        async with self._slots:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await self._connect()
+            try:
+                status, body, keep = await asyncio.wait_for(self._exchange(connection, method, target), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if not reused:
+                    raise
+                # Соединение из пула мог закрыть сервер — повтор на новом
+                connection = await self._connect()
+                status, body, keep = await asyncio.wait_for(self._exchange(connection, method, target), self.timeout)
+            except BaseException:
+                connection[1].close()
+                raise
+            if keep:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+        return status, body
+
+    async def _exchange(self, connection, method, target):
+        reader, writer = connection
+        lines = [f"{method} {target} HTTP/1.1"] + [f"{k}: {v}" for k, v in self.headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("utf-8"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Соединение закрыто сервером")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep = headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while await reader.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep = False
+        return status, body, keep
+
+    async def close(self):
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+class Pacer:
+    """Открытая модель нагрузки: n-й запрос запланирован на start + n / rps"""
+
+    def __init__(self, rps, duration):
+        self.rps = rps
+        self.start = time.perf_counter()
+        self.deadline = self.start + duration
+        self._sent = 0
+
+    async def next_slot(self):
+        """Запланированное время отправки или None, если время прогона вышло"""
+        now = time.perf_counter()
+        if not self.rps:
+            return now if now < self.deadline else None
+        slot = self.start + self._sent / self.rps
+        self._sent += 1
+        if slot >= self.deadline:
+            return None
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return slot
+
+
+class Stats:
+    """Задержки и ошибки по эндпоинтам"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, endpoint, seconds, ok):
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        self.errors[endpoint] = self.errors.get(endpoint, 0) + (not ok)
+
+
+def summarize(stats, elapsed):
+    """Строки отчёта по эндпоинтам и итоговая строка"""
+    rows = []
+    groups = list(stats.latencies.items())
+    everything = [value for _, values in groups for value in values]
+    groups.append(("ИТОГО", everything))
+    for endpoint, values in groups:
+        ordered = sorted(values)
+        errors = sum(stats.errors.values()) if endpoint == "ИТОГО" else stats.errors[endpoint]
+        rows.append({
+            "endpoint": endpoint,
+            "requests": len(ordered),
+            "error_rate": errors / len(ordered) if ordered else 0.0,
+            "throughput_rps": len(ordered) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(ordered, 50) * 1000,
+            "p95_ms": percentile(ordered, 95) * 1000,
+            "p99_ms": percentile(ordered, 99) * 1000,
+        })
+    return rows
+
+
+def format_table(rows):
+    width = max(len(row["endpoint"]) for row in rows)
+    lines = [f"{'Эндпоинт':<{width}}  {'Запросов':>8}  {'Ошибки':>7}  {'RPS':>8}  {'p50, мс':>8}  {'p95, мс':>8}  {'p99, мс':>8}"]
+    for row in rows:
+        lines.append(
+            f"{row['endpoint']:<{width}}  {row['requests']:>8}  {row['error_rate']:>7.1%}  "
+            f"{row['throughput_rps']:>8.1f}  {row['p50_ms']:>8.1f}  {row['p95_ms']:>8.1f}  {row['p99_ms']:>8.1f}"
+        )
+    return lines
+
+
+def _is_ok(status, body):
+    if status != 200:
+        return False
+    try:
+        json.loads(body)
+    except ValueError:
+        return False
+    return True
+
+
+async def _virtual_user(number, client, plan, pacer, stats):
+    step = number
+    while True:
+        scheduled = await pacer.next_slot()
+        if scheduled is None:
+            return
+        endpoint, path, params = plan[step % len(plan)]
+        step += 1
+        try:
+            status, body = await client.request("GET", path, params)
+            ok = _is_ok(status, body)
+        except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            ok = False
+        stats.add(endpoint, time.perf_counter() - scheduled, ok)
+
+
+async def run(base_url, token, plan, users=10, rps=0, duration=10.0, timeout=30.0):
+    """Выполняет нагрузочный прогон; возвращает (строки отчёта, статистика клиента)"""
+    client = AsyncHttpClient(base_url, headers={"tockenid": token}, pool_size=users, timeout=timeout)
+    stats = Stats()
+    pacer = Pacer(rps, duration)
+    try:
+        await asyncio.gather(*(_virtual_user(n, client, plan, pacer, stats) for n in range(users)))
+    finally:
+        await client.close()
+    elapsed = time.perf_counter() - pacer.start
+    return summarize(stats, elapsed), {"connections_opened": client.connections_opened, "elapsed_s": elapsed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон читающих сценариев API")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Сценарий (можно несколько; по умолчанию все)")
+    parser.add_argument("--users", type=int, default=10, help="Число виртуальных пользователей")
+    parser.add_argument("--rps", type=float, default=0, help="Целевая суммарная частота запросов (0 — максимум)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Длительность прогона, сек")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Таймаут одного запроса, сек")
+    parser.add_argument("--standin", action="store_true", help="Нагружать локальный заменитель API")
+    parser.add_argument("--json", help="Сохранить отчёт в JSON-файл")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.standin:
+        from helpers import standin
+        server = standin.StandinServer().start()
+        standin.export_env(server.url)
+    load_dotenv(ENV_FILE)
+    base_url = os.getenv("API_URL")
+    if not base_url:
+        raise SystemExit("API_URL не задан в .env")
+
+    from helpers.auth import get_token_broker
+    token = get_token_broker().get()
+    names = args.scenario or list(SCENARIOS)
+    plan = build_plan(names)
+
+    print(f"Нагрузка: {base_url}, сценарии: {', '.join(names)}, пользователей: {args.users}, "
+          f"RPS: {args.rps or 'максимум'}, длительность: {args.duration} с")
+    try:
+        rows, client_stats = asyncio.run(
+            run(base_url, token, plan, args.users, args.rps, args.duration, args.timeout)
+        )
+    finally:
+        if server is not None:
+            server.stop()
+
+    for line in format_table(rows):
+        print(line)
+    print(f"Открыто соединений: {client_stats['connections_opened']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"scenarios": names, "users": args.users, "rps": args.rps,
+                       "duration_s": args.duration, "endpoints": rows, **client_stats},
+                      f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
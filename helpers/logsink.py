@@ -0,0 +1,77 @@
+"""Буферизованная запись текстового лога в фоновом потоке.
+
+Строки копятся в памяти и передаются фоновому потоку через очередь; поток
+забирает всё накопившееся и пишет одной операцией, так что файл открывается
+один раз на весь тест, а не на каждую строку. Готовое содержимое доступно
+через getvalue() — для вложения Allure файл не перечитывается.
+
+    with LogSink("organization_creation.log") as log:
+        log.write("[INFO] ...\\n")
+    allure.attach(log.getvalue(), ...)
+"""
+
+import queue
+import threading
+
+_STOP = object()
+
+
+class LogSink:
+    """Лог-файл с пакетной записью из фонового потока"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.batches = 0
+        self._lines = []
+        self._queue = queue.SimpleQueue()
+        self._error = None
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._thread = threading.Thread(target=self._drain, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, text):
+        if self._thread is None:
+            raise ValueError(f"Лог {self.path} уже закрыт")
+        self._lines.append(text)
+        self._queue.put(text)
+
+    def _drain(self):
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                batch.pop()
+                stop = True
+            if batch and self._error is None:
+                try:
+                    self._file.write("".join(batch))
+                    self._file.flush()
+                    self.batches += 1
+                except OSError as e:
+                    self._error = e
+
+    def close(self):
+        """Дописывает буфер и закрывает файл; ошибка записи поднимается здесь"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._file.close()
+        if self._error is not None:
+            raise self._error
+
+    def getvalue(self):
+        """Всё, что было записано в лог"""
+        return "".join(self._lines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
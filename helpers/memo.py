@@ -0,0 +1,240 @@
+"""Запоминание и объединение одинаковых GET-запросов на общем пуле api_client.
+
+Включается опцией --memo-scope (по умолчанию off):
+
+- test — ответы живут до конца теста (пары create → read, повторные чтения);
+- module — до конца модуля тестов;
+- session — весь прогон.
+
+Одинаковые GET (URL с параметрами, tockenid, accept) в пределах области
+отдаются из памяти; если такой же запрос уже выполняется в другом потоке,
+второй ждёт его ответа вместо нового обращения к API. Запоминаются только
+успешные (2xx) ответы без stream=True — потоковое чтение больших списков
+остаётся потоковым.
+
+Любой изменяющий запрос (POST/PUT/PATCH/DELETE) сбрасывает записи того же
+ресурса (/organization/5 сбрасывает /organization/5 и /organization/5/...) и
+все списочные записи (путь без ID). Вложенные в ответ связанные сущности не
+отслеживаются: если тест меняет тариф и читает связь с ним, используйте
+область test. Сброс действует только в своём процессе, поэтому при запуске
+с -n conftest запоминание не включает.
+"""
+
+import threading
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config import MEMO_SCOPES
+from helpers.timing import route_template
+
+SCOPES = MEMO_SCOPES
+
+_KEY_HEADERS = ("tockenid", "accept")
+
+
+def _is_item(path):
+    return route_template(path).endswith("/{id}")
+
+
+def stale_after_write(path, written):
+    """Устарел ли GET path после изменяющего запроса к written: тот же ресурс,
+    вложенный или родительский путь, а также любой список (путь без ID)"""
+    return (not _is_item(path) or path == written or path.startswith(written + "/")
+            or written.startswith(path + "/"))
+
+
+class _Flight:
+    """Выполняющийся запрос: остальные потоки ждут его ответ"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+
+
+class MemoCache:
+    """Ответы GET в пределах области и счётчики сэкономленных запросов"""
+
+    def __init__(self, scope="test"):
+        if scope not in SCOPES:
+            raise ValueError(f"Неизвестная область запоминания: {scope}. Допустимо: {', '.join(SCOPES)}")
+        self.scope = scope
+        self._entries = {}
+        self._flights = {}
+        self._generation = 0
+        self._owner = None
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def enter(self, nodeid, module):
+        """Начало теста: при смене области записи сбрасываются"""
+        owner = {"test": nodeid, "module": module}.get(self.scope)
+        with self._lock:
+            if owner != self._owner:
+                self._owner = owner
+                self._entries.clear()
+                self._generation += 1
+
+    def count(self, route, field):
+        with self._lock:
+            self._count(route, field)
+
+    def _count(self, route, field):
+        counts = self._routes.setdefault(route, {"hits": 0, "coalesced": 0, "fetches": 0, "invalidated": 0})
+        counts[field] += 1
+
+    def lookup(self, key, route):
+        """(запись, None) из памяти; (None, _Flight) — ждать чужой запрос; (None, None) — выполнять самому"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._count(route, "hits")
+                return entry, None
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._count(route, "coalesced")
+                return None, flight
+            self._flights[key] = _Flight()
+            self._count(route, "fetches")
+            return None, None
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def finish(self, key, entry, generation):
+        """Завершает собственный запрос: запоминает ответ, будит ожидающих"""
+        with self._lock:
+            flight = self._flights.pop(key)
+            # Изменение или смена области во время запроса — ответ мог устареть
+            if entry is not None and generation == self._generation:
+                self._entries[key] = entry
+        flight.entry = entry
+        flight.done.set()
+
+    def invalidate(self, path):
+        """Сбрасывает записи ресурса path и все списочные записи"""
+        with self._lock:
+            stale = [key for key in self._entries if stale_after_write(key[1], path)]
+            for key in stale:
+                self._count(route_template(key[1]), "invalidated")
+                del self._entries[key]
+            self._generation += 1
+
+    def export(self):
+        with self._lock:
+            return {route: dict(counts) for route, counts in self._routes.items()}
+
+    def merge(self, exported):
+        with self._lock:
+            for route, counts in (exported or {}).items():
+                target = self._routes.setdefault(route, dict.fromkeys(counts, 0))
+                for field, amount in counts.items():
+                    target[field] = target.get(field, 0) + amount
+
+    def totals(self):
+        totals = {"hits": 0, "coalesced": 0, "fetches": 0, "invalidated": 0}
+        for counts in self.export().values():
+            for field in totals:
+                totals[field] += counts[field]
+        return totals
+
+    def format(self, limit=10):
+        totals = self.totals()
+        saved = totals["hits"] + totals["coalesced"]
+        lines = [
+            f"Область: {self.scope}. Сэкономлено запросов: {saved} "
+            f"(из памяти {totals['hits']}, объединено {totals['coalesced']}), "
+            f"выполнено {totals['fetches']}, сброшено записей {totals['invalidated']}"
+        ]
+        rows = sorted(self.export().items(), key=lambda item: -(item[1]["hits"] + item[1]["coalesced"]))
+        for route, counts in rows[:limit]:
+            if counts["hits"] + counts["coalesced"]:
+                lines.append(f"  {route:<50} сэкономлено {counts['hits'] + counts['coalesced']:>5}  "
+                             f"выполнено {counts['fetches']:>5}")
+        return lines
+
+
+def _key(request):
+    headers = tuple(request.headers.get(name) for name in _KEY_HEADERS)
+    parts = urlsplit(request.url)
+    return parts.netloc, parts.path, parts.query, headers
+
+
+def _entry(response):
+    return {
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": dict(response.headers),
+        "encoding": response.encoding,
+        "content": response.content,
+    }
+
+
+def _response(entry, request):
+    """Новый объект Response из запомненного ответа: у каждого теста своя копия"""
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry["reason"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = entry["encoding"]
+    response.url = request.url
+    response.request = request
+    response.elapsed = timedelta(0)
+    response._content = entry["content"]
+    response._content_consumed = True
+    return response
+
+
+class MemoAdapter(BaseAdapter):
+    """Адаптер-обёртка: GET из памяти и объединение одинаковых запросов"""
+
+    def __init__(self, inner, cache):
+        super().__init__()
+        self.inner = inner
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            try:
+                return self.inner.send(request, **kwargs)
+            finally:
+                self.cache.invalidate(urlsplit(request.url).path.rstrip("/"))
+        if kwargs.get("stream"):
+            return self.inner.send(request, **kwargs)
+
+        key = _key(request)
+        route = route_template(request.url)
+        entry, flight = self.cache.lookup(key, route)
+        if entry is not None:
+            return _response(entry, request)
+        if flight is not None:
+            flight.done.wait()
+            if flight.entry is not None:
+                return _response(flight.entry, request)
+            # Ответ ведущего запроса не запоминается (ошибка) — свой запрос
+            return self.inner.send(request, **kwargs)
+
+        generation = self.cache.generation()
+        entry = None
+        try:
+            response = self.inner.send(request, **kwargs)
+            if 200 <= response.status_code < 300:
+                entry = _entry(response)
+            return response
+        finally:
+            self.cache.finish(key, entry, generation)
+
+    def close(self):
+        self.inner.close()
+
+
+def install(session, cache):
+    """Подключает запоминание GET к сессии requests"""
+    adapter = MemoAdapter(session.get_adapter("http://"), cache)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
@@ -0,0 +1,82 @@
+"""Порядок выполнения тестов.
+
+Порядок задаётся таблицей этапов ORDER_RULES. Модуль относится к первому
+этапу, префикс которого совпадает с началом его пути (относительно tests/).
+В этапах с фазами CRUD модули одной папки упорядочиваются как
+create → read → update → delete → остальные. Внутри модуля и между модулями
+с одинаковым рангом сохраняется порядок сбора тестов.
+"""
+
+# (название этапа, префиксы путей относительно tests/, упорядочивать ли по фазам CRUD)
+ORDER_RULES = (
+    ("Аутентификация", ("token/test_auth",), False),
+    ("Пользователи", ("user/",), True),
+    ("Организации", ("organizations/test_organization_",), True),
+    ("Список организаций", ("organizations/test_organizations_read",), False),
+    ("Связь пользователя с организацией", ("users/test_users_add_org",), False),
+    ("Пользователи организации", ("users/test_users_org",), False),
+    ("Список пользователей", ("users/test_users_read",), False),
+    ("Роли", ("role/",), False),
+    ("Отчёты", ("billing-report/", "report/"), False),
+    ("resource_service", ("resource/resource_service/",), True),
+    ("resource_pool", ("resource/resource_pool/",), True),
+    ("resource_atom", ("resource/resource_atom/",), True),
+    ("resource_location", ("resource/resource_location/",), True),
+    ("resource_category_ref", ("resource/resource_category_ref/",), True),
+    ("Остальные ресурсы", ("resource/", "pre-billing_resource/"), False),
+    ("Тарифы", ("tariff/",), True),
+)
+
+REMAINING_STAGE = "Остальные тесты"
+
+CRUD_PHASES = {"create": 0, "read": 1, "update": 2, "delete": 3}
+
+
+def module_path(nodeid):
+    """Путь модуля теста относительно tests/"""
+    path = nodeid.split("::", 1)[0]
+    if path.startswith("tests/"):
+        path = path[len("tests/"):]
+    return path
+
+
+def module_rank(path, rules=ORDER_RULES):
+    """Ранг модуля: (номер этапа, папка, фаза CRUD)"""
+    for stage, (_, prefixes, crud) in enumerate(rules):
+        if not path.startswith(prefixes):
+            continue
+        if not crud:
+            return stage, "", 0
+        directory, _, filename = path.rpartition("/")
+        phase = filename.rsplit(".", 1)[0].rsplit("_", 1)[-1]
+        return stage, directory, CRUD_PHASES.get(phase, len(CRUD_PHASES))
+    return len(rules), "", 0
+
+
+def order_items(items, rules=ORDER_RULES):
+    """Сортирует тесты по рангу модуля за O(n log n); ранг считается один раз на модуль"""
+    ranks = {}
+
+    def key(item):
+        path = module_path(item.nodeid)
+        rank = ranks.get(path)
+        if rank is None:
+            rank = ranks[path] = module_rank(path, rules)
+        return rank
+
+    return sorted(items, key=key)
+
+
+def describe(items, rules=ORDER_RULES):
+    """Строки для --show-order: этапы и модули в порядке выполнения"""
+    lines = ["Порядок выполнения тестов (helpers/ordering.py, ORDER_RULES):"]
+    seen = set()
+    for item in items:
+        path = module_path(item.nodeid)
+        if path in seen:
+            continue
+        seen.add(path)
+        stage = module_rank(path, rules)[0]
+        name = rules[stage][0] if stage < len(rules) else REMAINING_STAGE
+        lines.append(f"  {stage + 1:>2}. {name:<36} {path}")
+    return lines
@@ -0,0 +1,202 @@
+"""Чтение списочных эндпоинтов частями с упреждающей загрузкой.
+
+ListReader отдаёт элементы списка по одному, как ArrayStream, но большой
+набор читает частями:
+
+- страницы: если эндпоинт понимает limit/offset или per_page/page
+  (проверяется пробными запросами на один элемент, результат запоминается
+  на процесс, а conftest сохраняет его между прогонами в config.cache),
+  страницы по page_size запрашиваются одна за другой;
+- наборы фильтров: partitions — список by_*-параметров (например, по пулу
+  или тенанту), каждый набор читается отдельным запросом, а при поддержке
+  страниц — постранично.
+
+Следующая часть загружается в фоновом потоке, пока проверяется текущая: в
+памяти не больше двух страниц, сколько бы элементов ни было в списке.
+Эндпоинт без страниц и без partitions читается одним запросом потоково.
+
+    organizations = ListReader(f"{base_url}/api/v1/organizations", headers=headers,
+                               params={"by_tenant_id": 123}, keep=20)
+    for org in organizations:
+        ...
+    organizations.count, organizations.pages, organizations.paging, organizations.sample
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlsplit
+
+import requests
+
+from helpers.stream import ArrayStream, StreamError
+
+DEFAULT_PAGE_SIZE = 500
+
+AUTO = "auto"
+
+# Способ -> (параметр размера, параметр позиции, первая позиция, позиция считается в элементах)
+PAGING = {
+    "limit/offset": ("limit", "offset", 0, True),
+    "per_page/page": ("per_page", "page", 1, False),
+}
+
+# (хост, путь) эндпоинта -> найденный способ (None — эндпоинт отдаёт список целиком)
+_detected = {}
+
+
+class ListReadError(RuntimeError):
+    """Списочный эндпоинт ответил ошибкой"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ListReader:
+    """Итератор по элементам списочного эндпоинта: страницами или наборами фильтров"""
+
+    def __init__(self, url, headers=None, params=None, partitions=None, page_size=DEFAULT_PAGE_SIZE,
+                 paging=AUTO, keep=0, get=None):
+        if paging not in (AUTO, None) and paging not in PAGING:
+            raise ValueError(f"Неизвестный способ постраничной выдачи: {paging}")
+        self.url = url
+        self.headers = headers
+        self.params = dict(params or {})
+        self.partitions = [dict(partition) for partition in partitions or ()]
+        self.page_size = page_size
+        self.paging = paging
+        self.keep = keep
+        self.count = 0
+        self.pages = 0
+        self.bytes = 0
+        self.sample = []
+        self._get = get
+        self._started = False
+
+    def __iter__(self):
+        if self._started:
+            raise ListReadError("Список уже прочитан")
+        self._started = True
+        if self.paging == AUTO:
+            self.paging = detect_paging(self.url, self.headers, self.params, get=self._get)
+        if self.paging is None and not self.partitions:
+            yield from self._whole()
+        else:
+            yield from self._parts()
+
+    def _request(self, params):
+        get = self._get or requests.get
+        response = get(self.url, headers=self.headers, params=params, stream=True)
+        if response.status_code != 200:
+            raise ListReadError(
+                f"GET {urlsplit(self.url).path} {params}: HTTP {response.status_code} {response.text[:200]}",
+                response.status_code,
+            )
+        return response
+
+    def _take(self, item):
+        if len(self.sample) < self.keep:
+            self.sample.append(item)
+        self.count += 1
+        return item
+
+    def _whole(self):
+        self.pages = 1
+        items = ArrayStream(self._request(self.params))
+        try:
+            for item in items:
+                yield self._take(item)
+        finally:
+            self.bytes += items.bytes
+
+    def _query(self, position):
+        partition, page = position
+        params = {**self.params, **(self.partitions[partition] if self.partitions else {})}
+        if self.paging is not None:
+            size, offset, first, by_items = PAGING[self.paging]
+            params[size] = self.page_size
+            params[offset] = first + page * (self.page_size if by_items else 1)
+        return params
+
+    def _page(self, position):
+        items = ArrayStream(self._request(self._query(position)))
+        return list(items), items.bytes
+
+    def _following(self, position, full):
+        """Следующая часть после (набор, страница) или None"""
+        partition, page = position
+        if self.paging is not None and full:
+            return partition, page + 1
+        if partition + 1 < len(self.partitions):
+            return partition + 1, 0
+        return None
+
+    def _parts(self):
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="list-prefetch") as pool:
+            position = (0, 0)
+            pending = pool.submit(self._page, position)
+            try:
+                while pending is not None:
+                    items, size = pending.result()
+                    self.pages += 1
+                    self.bytes += size
+                    # Следующая страница грузится, пока вызывающий проверяет эту
+                    position = self._following(position, len(items) >= self.page_size)
+                    pending = pool.submit(self._page, position) if position is not None else None
+                    for item in items:
+                        yield self._take(item)
+                    del items
+            finally:
+                if pending is not None:
+                    pending.cancel()
+
+
+def _probe(url, headers, params, get):
+    """До двух первых элементов ответа; остальное тело не читается"""
+    response = (get or requests.get)(url, headers=headers, params=params, stream=True)
+    if response.status_code != 200:
+        response.close()
+        return None
+    items = iter(ArrayStream(response))
+    try:
+        return list(islice(items, 2))
+    except StreamError:
+        return None
+    finally:
+        items.close()
+
+
+def export_detected():
+    """Найденные способы {"хост/путь": способ или None} — для config.cache и воркеров"""
+    return {netloc + path: name for (netloc, path), name in _detected.items()}
+
+
+def load_detected(values):
+    """Способы, найденные прошлыми прогонами или другими воркерами (свои не заменяются)"""
+    for address, name in (values or {}).items():
+        if name is None or name in PAGING:
+            netloc, slash, path = address.partition("/")
+            _detected.setdefault((netloc, slash + path), name)
+
+
+def detect_paging(url, headers=None, params=None, get=None):
+    """Способ постраничной выдачи эндпоинта или None; запоминается по адресу"""
+    parts = urlsplit(url)
+    key = parts.netloc, parts.path
+    if key in _detected:
+        return _detected[key]
+    found, conclusive = None, False
+    for name, (size, offset, first, _) in PAGING.items():
+        head = _probe(url, headers, {**(params or {}), size: 1, offset: first}, get)
+        if head is None or len(head) != 1:
+            # Пустой список ничего не говорит; два элемента — параметры игнорируются
+            conclusive = conclusive or bool(head)
+            continue
+        second = _probe(url, headers, {**(params or {}), size: 1, offset: first + 1}, get)
+        if second is not None and len(second) <= 1 and second != head:
+            found, conclusive = name, True
+            break
+        conclusive = conclusive or second is not None
+    if conclusive:
+        _detected[key] = found
+    return found
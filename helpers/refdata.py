@@ -0,0 +1,170 @@
+"""Кэш справочников API (единицы измерения, типы биллинга, роли и т.д.).
+
+Справочники запрашиваются один раз на процесс и хранятся в памяти; с
+--refdata-cache=disk — ещё и в файлах .pytest_cache/refdata, общих для
+воркеров и следующих прогонов. Ключ записи — API_URL и эндпоинт, запись
+живёт --refdata-ttl секунд. Любой изменяющий запрос (POST/PUT/PATCH/DELETE)
+к ресурсу справочника через общий пул сбрасывает его запись.
+
+Тесты, проверяющие сами эндпоинты справочников, обращаются к API напрямую
+или вызывают get(..., bypass=True). Возвращаемые данные общие для всех
+тестов — изменять их нельзя.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter
+
+MODES = ("off", "memory", "disk")
+
+# Эндпоинт справочника -> ресурсы, изменение которых сбрасывает запись
+REFERENCE_ENDPOINTS = {
+    "resource_units_measure": ("resource_units_measure", "resource_unit_measure"),
+    "billing/roles_render_billing": ("billing/roles_render_billing",),
+    "resource_atoms": ("resource_atoms", "resource_atom"),
+    "roles": ("roles", "role"),
+    "resource/category_types": ("resource/category_types",),
+    "resource/type_services": ("resource/type_services",),
+    "tariff_setting_types": ("tariff_setting_types", "tariff_setting_type"),
+    "tariff_time_intervals": ("tariff_time_intervals", "tariff_time_interval"),
+}
+
+API_PREFIX = "/api/v1/"
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReferenceCache:
+    """Справочники по (API_URL, эндпоинт): память, необязательный диск, TTL"""
+
+    def __init__(self, client, mode="memory", ttl=600.0, cache_dir=None):
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим кэша справочников: {mode}. Допустимо: {', '.join(MODES)}")
+        self.client = client
+        self.mode = mode
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.fetches = 0
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    def get(self, endpoint, bypass=False):
+        """Данные справочника; bypass=True — всегда свежий запрос к API"""
+        if endpoint not in REFERENCE_ENDPOINTS:
+            raise KeyError(f"{endpoint} не является справочником: {', '.join(REFERENCE_ENDPOINTS)}")
+        return self._entry(endpoint, bypass)["data"]
+
+    def index(self, endpoint, key="id", value="name"):
+        """Словарь item[key] -> item[value] (value=None — весь элемент), строится один раз"""
+        with self._lock:
+            entry = self._entry(endpoint)
+            indexes = entry.setdefault("indexes", {})
+            if (key, value) not in indexes:
+                indexes[(key, value)] = {
+                    item[key]: item if value is None else item.get(value)
+                    for item in entry["data"]
+                }
+            return indexes[(key, value)]
+
+    def invalidate(self, endpoint=None):
+        """Сбрасывает запись эндпоинта (None — все записи) в памяти и на диске"""
+        endpoints = list(REFERENCE_ENDPOINTS) if endpoint is None else [endpoint]
+        with self._lock:
+            for name in endpoints:
+                self._entries.pop(self._key(name), None)
+                if self.mode == "disk":
+                    try:
+                        os.unlink(self._disk_path(name))
+                    except FileNotFoundError:
+                        pass
+
+    def observe(self, method, url):
+        """Сбрасывает справочники, которые мог изменить запрос"""
+        if method.upper() in _READ_METHODS:
+            return
+        path = urlsplit(url).path
+        if not path.startswith(API_PREFIX):
+            return
+        resource = path[len(API_PREFIX):]
+        for endpoint, resources in REFERENCE_ENDPOINTS.items():
+            if any(resource == name or resource.startswith(name + "/") for name in resources):
+                self.invalidate(endpoint)
+
+    def _key(self, endpoint):
+        return self.client.base_url, endpoint
+
+    def _is_fresh(self, entry):
+        return time.time() < entry["stored_at"] + self.ttl
+
+    def _entry(self, endpoint, bypass=False):
+        with self._lock:
+            if self.mode != "off" and not bypass:
+                entry = self._entries.get(self._key(endpoint))
+                if entry is None and self.mode == "disk":
+                    entry = self._read_disk(endpoint)
+                if entry is not None and self._is_fresh(entry):
+                    self._entries[self._key(endpoint)] = entry
+                    self.hits += 1
+                    return entry
+
+            response = self.client.get(API_PREFIX + endpoint)
+            response.raise_for_status()
+            self.fetches += 1
+            entry = {"stored_at": time.time(), "data": response.json()}
+            if self.mode != "off":
+                self._entries[self._key(endpoint)] = entry
+                if self.mode == "disk":
+                    self._write_disk(endpoint, entry)
+            return entry
+
+    def _disk_path(self, endpoint):
+        key = hashlib.sha1(f"{self.client.base_url}|{endpoint}".encode()).hexdigest()[:16]
+        return os.path.join(str(self.cache_dir), f"{endpoint.replace('/', '_')}_{key}.json")
+
+    def _read_disk(self, endpoint):
+        try:
+            with open(self._disk_path(endpoint), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return {"stored_at": stored["stored_at"], "data": stored["data"]}
+
+    def _write_disk(self, endpoint, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._disk_path(endpoint)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"base_url": self.client.base_url, "endpoint": endpoint,
+                       "stored_at": entry["stored_at"], "data": entry["data"]}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class InvalidatingAdapter(BaseAdapter):
+    """Адаптер-обёртка: после изменяющего запроса сбрасывает затронутые справочники"""
+
+    def __init__(self, inner, cache):
+        super().__init__()
+        self.inner = inner
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        try:
+            return self.inner.send(request, **kwargs)
+        finally:
+            self.cache.observe(request.method, request.url)
+
+    def close(self):
+        self.inner.close()
+
+
+def install(session, cache):
+    """Подключает сброс кэша справочников к сессии requests"""
+    adapter = InvalidatingAdapter(session.get_adapter("http://"), cache)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
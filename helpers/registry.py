@@ -0,0 +1,224 @@
+"""Реестр сущностей, созданных за прогон, и их удаление в конце сессии.
+
+Адаптер на общем пуле api_client видит каждый успешный POST на эндпоинт
+создания (user, organization, tariff_link_organization, ...) и записывает ID
+из ответа; DELETE той же записи — тестом или вручную — убирает её из реестра.
+В конце сессии оставшиеся записи удаляются по уровням: сначала сущности, на
+которые никто не ссылается (связи, настройки), затем тарифы, пулы, атомы и
+т.д., в последнюю очередь — организации. Внутри уровня запросы идут
+параллельно, не больше concurrency одновременно.
+
+Прерванный прогон (Ctrl+C, упавший *_create без парного *_delete) больше не
+оставляет на стенде данных, замедляющих списки. При параллельном запуске
+каждый воркер удаляет то, что создал сам; зависимые цепочки CRUD и так
+выполняются на одном воркере (helpers/scheduler.py).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter
+
+API_PREFIX = "/api/v1/"
+
+# Сущность -> (эндпоинт создания, эндпоинт записи для DELETE {эндпоинт}/{id})
+ENDPOINTS = {
+    "user": ("user", "user"),
+    "organization": ("organization", "organization"),
+    # Создаётся с user_id и organization_id в query; заменитель API удаление не
+    # поддерживает — в сводке очистки такие связи попадают в «не поддерживается»
+    "user_organization_link": ("user_organization_link", "user_organization_link"),
+    "resource_service": ("resource_service", "resource_service"),
+    "resource_location": ("resource_location", "resource_location"),
+    "resource_pool": ("resource_pool", "resource_pool"),
+    "resource_unit_measure": ("resource_units_measure", "resource_unit_measure"),
+    "resource_category_ref": ("resource_category_ref", "resource_category_ref"),
+    "resource_atom": ("resource_atom", "resource_atom"),
+    "resource_pool_link_atom": ("resource_pool_link_atom", "resource_pool_link_atom"),
+    "tariff": ("tariff", "tariff"),
+    "tariff_link_organization": ("tariff_link_organization", "tariff_link_organization"),
+    "tariff_link_tenant": ("tariff_link_tenant", "tariff_link_tenant"),
+    "tariff_tenant_settings": ("tariff_tenant_settings", "tariff_tenant_settings"),
+    "user_group_billing_service": ("billing/user_group_billing_service", "billing/user_group_billing_service"),
+    "pre_billing_manual_item": ("pre_billing/manual/items", "pre_billing/manual/item"),
+    "pre_billing_resource_item": ("pre_billing/resource/items", "pre_billing/resource/item"),
+    "pre_billing_organization": ("pre_billing/organizations", "pre_billing/organizations"),
+}
+
+# Сущность -> сущности, на которые она ссылается (их удалять после неё)
+DEPENDENCIES = {
+    "user_organization_link": ("user", "organization"),
+    "resource_pool": ("resource_location",),
+    "resource_category_ref": ("resource_unit_measure",),
+    "resource_atom": ("resource_category_ref",),
+    "resource_pool_link_atom": ("resource_pool", "resource_atom"),
+    "tariff": ("resource_service", "resource_location"),
+    "tariff_link_organization": ("tariff", "organization"),
+    "tariff_link_tenant": ("tariff",),
+    "tariff_tenant_settings": ("tariff_link_organization",),
+    "pre_billing_manual_item": ("organization", "resource_atom"),
+    "pre_billing_resource_item": ("organization", "resource_atom"),
+    "pre_billing_organization": ("organization",),
+}
+
+_CREATE = {create: entity for entity, (create, _) in ENDPOINTS.items()}
+_ITEM = {item: entity for entity, (_, item) in ENDPOINTS.items()}
+
+
+def teardown_levels(entities=ENDPOINTS, dependencies=DEPENDENCIES):
+    """Уровни удаления: на сущность уровня N ссылаются только сущности уровней < N"""
+    level = {}
+
+    def depth(entity, path=()):
+        if entity in path:
+            raise ValueError(f"Цикл в зависимостях сущностей: {' -> '.join(path + (entity,))}")
+        if entity not in level:
+            referrers = [other for other, required in dependencies.items() if entity in required]
+            level[entity] = 1 + max((depth(other, path + (entity,)) for other in referrers), default=-1)
+        return level[entity]
+
+    for entity in entities:
+        depth(entity)
+    levels = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for entity in entities:
+        levels[level[entity]].append(entity)
+    return levels
+
+
+def _route(url):
+    path = urlsplit(url).path
+    return path[len(API_PREFIX):].strip("/") if path.startswith(API_PREFIX) else None
+
+
+class EntityRegistry:
+    """ID созданных сущностей, ещё не удалённых за прогон"""
+
+    def __init__(self):
+        self._entities = {}
+        self._lock = threading.Lock()
+
+    def created(self, entity, entity_id):
+        with self._lock:
+            self._entities.setdefault(entity, {})[str(entity_id)] = None
+
+    def deleted(self, entity, entity_id):
+        with self._lock:
+            self._entities.get(entity, {}).pop(str(entity_id), None)
+
+    def pending(self):
+        """{сущность: [ID в порядке создания]} — только непустые"""
+        with self._lock:
+            return {entity: list(ids) for entity, ids in self._entities.items() if ids}
+
+    def observe(self, request, response, stream=False):
+        """Учитывает запрос через общий пул: создание или удаление записи"""
+        route = _route(request.url)
+        if route is None:
+            return
+        if request.method == "POST" and route in _CREATE and response.status_code < 300 and not stream:
+            # Тело читается здесь же; Session затем берёт его из response.content
+            entity_id = _created_id(response)
+            if entity_id is not None:
+                self.created(_CREATE[route], entity_id)
+        elif request.method == "DELETE" and (response.status_code < 300 or response.status_code == 404):
+            self._forget(route)
+
+    def _forget(self, route):
+        item, _, entity_id = route.rpartition("/")
+        if item in _ITEM:
+            self.deleted(_ITEM[item], entity_id)
+
+    def teardown(self, client, concurrency=8):
+        """Удаляет оставшиеся сущности по уровням; возвращает сводку по сущностям"""
+        summary = {}
+        pending = self.pending()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="cleanup") as pool:
+            for level in teardown_levels():
+                jobs = [(entity, entity_id) for entity in level for entity_id in pending.get(entity, ())]
+                for (entity, entity_id), outcome in zip(jobs, pool.map(lambda job: _delete(client, *job), jobs)):
+                    counts = summary.setdefault(entity, _counts())
+                    counts[outcome[0]] += 1
+                    if outcome[0] == "failed" and len(counts["errors"]) < 5:
+                        counts["errors"].append(f"{entity_id}: {outcome[1]}")
+                    if outcome[0] in ("deleted", "missing"):
+                        self.deleted(entity, entity_id)
+        return summary
+
+
+def _counts():
+    return {"deleted": 0, "missing": 0, "unsupported": 0, "failed": 0, "errors": []}
+
+
+def _created_id(response):
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if isinstance(body, dict) and isinstance(body.get("id"), (int, str)) and str(body["id"]).strip():
+        return body["id"]
+    return None
+
+
+def _delete(client, entity, entity_id):
+    try:
+        response = client.delete(f"/api/v1/{ENDPOINTS[entity][1]}/{entity_id}")
+    except Exception as e:
+        return "failed", f"{type(e).__name__}: {e}"
+    if response.status_code < 300:
+        return "deleted", None
+    if response.status_code == 404:
+        return "missing", None
+    if "method - not found" in response.text:
+        # Удаление этой сущности API не поддерживает (как и тест *_delete)
+        return "unsupported", None
+    return "failed", f"HTTP {response.status_code} {response.text[:200]}"
+
+
+def merge(total, summary):
+    """Складывает сводки (воркеры при параллельном запуске)"""
+    for entity, counts in (summary or {}).items():
+        target = total.setdefault(entity, _counts())
+        for key in ("deleted", "missing", "unsupported", "failed"):
+            target[key] += counts[key]
+        target["errors"].extend(counts["errors"][:5 - len(target["errors"])])
+    return total
+
+
+def format_summary(summary):
+    deleted = sum(counts["deleted"] for counts in summary.values())
+    missing = sum(counts["missing"] for counts in summary.values())
+    unsupported = sum(counts["unsupported"] for counts in summary.values())
+    failed = sum(counts["failed"] for counts in summary.values())
+    lines = [f"Удалено: {deleted}, уже отсутствовали: {missing}, удаление не поддерживается: {unsupported}, "
+             f"ошибок: {failed}"]
+    for entity, counts in summary.items():
+        lines.append(f"  {entity:<28} удалено {counts['deleted']:>5}  отсутствовали {counts['missing']:>4}  "
+                     f"не поддерживается {counts['unsupported']:>4}  ошибок {counts['failed']:>4}")
+        lines.extend(f"      {error}" for error in counts["errors"])
+    return lines
+
+
+class RegistryAdapter(BaseAdapter):
+    """Адаптер-обёртка: записывает созданные и удалённые сущности в реестр"""
+
+    def __init__(self, inner, registry):
+        super().__init__()
+        self.inner = inner
+        self.registry = registry
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        self.registry.observe(request, response, stream=kwargs.get("stream", False))
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+def install(session, registry):
+    """Подключает реестр созданных сущностей к сессии requests"""
+    adapter = RegistryAdapter(session.get_adapter("http://"), registry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
@@ -0,0 +1,298 @@
+"""Устойчивый транспорт: таймауты по эндпоинтам, повторы и автоматический выключатель.
+
+Адаптер-обёртка на общем пуле api_client:
+
+- таймаут чтения задаётся для отдельных эндпоинтов (API_TIMEOUTS), остальные
+  запросы получают таймауты клиента (API_CONNECT_TIMEOUT/API_READ_TIMEOUT);
+- идемпотентные запросы (GET, HEAD, OPTIONS, PUT, DELETE) при обрыве
+  соединения, таймауте или ответе 502/503/504 повторяются с экспоненциальной
+  задержкой со случайным разбросом (full jitter), не больше API_RETRIES раз на
+  запрос и не больше API_RETRY_BUDGET раз за прогон (бюджет общий для всех
+  воркеров: счётчик в общем состоянии прогона);
+- выключатель: после API_BREAKER_THRESHOLD неудач подряд эндпоинт (а при
+  ошибках соединения — весь хост) считается недоступным, и следующие запросы
+  к нему API_BREAKER_COOLDOWN секунд сразу завершаются CircuitOpenError вместо
+  ожидания таймаута. После паузы пропускается один пробный запрос: успех
+  закрывает выключатель, неудача открывает снова.
+
+Когда стенд деградировал, прогон падает за минуты, а не за часы. Счётчики
+повторов и отказов выводятся в конце прогона.
+"""
+
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import BaseAdapter
+
+from config import ENV_FILE
+from helpers.state import StateStore
+from helpers.timing import route_template
+
+# Счётчик израсходованных повторов в общем состоянии прогона
+BUDGET_KEY = "retry_budget"
+
+IDEMPOTENT = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Эндпоинт или хост помечен недоступным: запрос не отправлялся"""
+
+
+def parse_timeouts(value):
+    """API_TIMEOUTS: "GET /api/v1/resource_atoms=120, /api/v1/report_organization/{id}=90" """
+    timeouts = {}
+    for entry in filter(None, (part.strip() for part in (value or "").split(","))):
+        key, sep, seconds = entry.rpartition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"API_TIMEOUTS: ожидалось [МЕТОД ]маршрут=секунды, получено {entry!r}")
+        method, _, route = key.strip().rpartition(" ")
+        timeouts[(method.upper() or None, route)] = float(seconds)
+    return timeouts
+
+
+class Policy:
+    """Параметры повторов, выключателя и таймаутов по эндпоинтам"""
+
+    def __init__(self, retries=2, backoff=0.5, max_delay=10.0, budget=50,
+                 breaker_threshold=5, breaker_cooldown=30.0, timeouts=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.budget = budget
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.timeouts = dict(timeouts or {})
+
+    @classmethod
+    def from_env(cls):
+        load_dotenv(ENV_FILE)
+        return cls(
+            retries=int(os.getenv("API_RETRIES", 2)),
+            backoff=float(os.getenv("API_RETRY_BACKOFF", 0.5)),
+            max_delay=float(os.getenv("API_RETRY_MAX_DELAY", 10)),
+            budget=int(os.getenv("API_RETRY_BUDGET", 50)),
+            breaker_threshold=int(os.getenv("API_BREAKER_THRESHOLD", 5)),
+            breaker_cooldown=float(os.getenv("API_BREAKER_COOLDOWN", 30)),
+            timeouts=parse_timeouts(os.getenv("API_TIMEOUTS")),
+        )
+
+    def read_timeout(self, method, route):
+        """Таймаут чтения для эндпоинта или None — оставить таймаут клиента"""
+        return self.timeouts.get((method, route), self.timeouts.get((None, route)))
+
+    def delay(self, attempt, retry_after=None):
+        """Пауза перед повтором attempt (с 1): full jitter, Retry-After — нижняя граница"""
+        delay = random.uniform(0, min(self.max_delay, self.backoff * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class Breaker:
+    """Выключатель одного эндпоинта или хоста"""
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def ready(self, now):
+        """Закрыт или пауза истекла, а пробный запрос ещё не отправлен"""
+        if self.opened_at is None:
+            return True
+        return not self.probing and now - self.opened_at >= self.cooldown
+
+    def admit(self):
+        # После паузы пропускается ровно один пробный запрос
+        if self.opened_at is not None:
+            self.probing = True
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def failure(self, now):
+        """True, если выключатель только что открылся"""
+        self.failures += 1
+        reopened = self.probing
+        self.probing = False
+        if reopened or (self.opened_at is None and self.threshold and self.failures >= self.threshold):
+            self.opened_at = now
+            return True
+        return False
+
+
+class TransportStats:
+    """Счётчики по эндпоинтам: повторы, отказы выключателя, таймауты (потокобезопасно)"""
+
+    FIELDS = ("retries", "short_circuits", "breaker_opens", "timeouts", "budget_exhausted")
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def add(self, route, field, amount=1):
+        with self._lock:
+            counts = self._routes.setdefault(route, dict.fromkeys(self.FIELDS, 0))
+            counts[field] += amount
+
+    def totals(self):
+        with self._lock:
+            return {field: sum(counts[field] for counts in self._routes.values()) for field in self.FIELDS}
+
+    def export(self):
+        with self._lock:
+            return {route: dict(counts) for route, counts in self._routes.items()}
+
+    def merge(self, exported):
+        for route, counts in (exported or {}).items():
+            for field, amount in counts.items():
+                if amount:
+                    self.add(route, field, amount)
+
+    def __bool__(self):
+        return any(self.totals().values())
+
+    def format(self, limit=15):
+        totals = self.totals()
+        lines = [
+            f"Повторов: {totals['retries']}, отказов выключателя: {totals['short_circuits']}, "
+            f"срабатываний выключателя: {totals['breaker_opens']}, таймаутов: {totals['timeouts']}, "
+            f"без повтора из-за исчерпанного бюджета: {totals['budget_exhausted']}"
+        ]
+        rows = sorted(self.export().items(), key=lambda item: -sum(item[1].values()))
+        for route, counts in rows[:limit]:
+            lines.append(
+                f"  {route:<50} повторов {counts['retries']:>4}  отказов {counts['short_circuits']:>4}  "
+                f"таймаутов {counts['timeouts']:>4}"
+            )
+        return lines
+
+
+class ResilientAdapter(BaseAdapter):
+    """Адаптер-обёртка: таймауты по эндпоинтам, повторы в пределах бюджета, выключатель"""
+
+    def __init__(self, inner, policy, stats, sleep=time.sleep, clock=time.monotonic, counter=None):
+        super().__init__()
+        self.inner = inner
+        self.policy = policy
+        self.stats = stats
+        self._sleep = sleep
+        self._clock = clock
+        # counter(ключ, сколько, начало) -> значение до увеличения; по умолчанию — на процесс
+        self._counter = counter or StateStore().increment
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, key):
+        if key not in self._breakers:
+            self._breakers[key] = Breaker(self.policy.breaker_threshold, self.policy.breaker_cooldown)
+        return self._breakers[key]
+
+    def _take_retry(self):
+        return self._counter(BUDGET_KEY) < self.policy.budget
+
+    def _admit(self, endpoint, keys):
+        with self._lock:
+            now = self._clock()
+            blocked = [key for key in keys if not self._breaker(key).ready(now)]
+            if not blocked:
+                for key in keys:
+                    self._breaker(key).admit()
+                return
+        self.stats.add(endpoint, "short_circuits")
+        raise CircuitOpenError(f"{', '.join(blocked)}: недоступен по данным выключателя, запрос не отправлялся")
+
+    def _release(self, keys):
+        """Ошибка не транспортная: пробный запрос не в счёт"""
+        with self._lock:
+            for key in keys:
+                self._breaker(key).probing = False
+
+    def _record(self, endpoint, key, failed):
+        with self._lock:
+            breaker = self._breaker(key)
+            if not failed:
+                breaker.success()
+                return
+            opened = breaker.failure(self._clock())
+        if opened:
+            self.stats.add(endpoint, "breaker_opens")
+
+    def send(self, request, **kwargs):
+        route = route_template(request.url)
+        host = urlsplit(request.url).netloc
+        endpoint = f"{request.method} {route}"
+        read_timeout = self.policy.read_timeout(request.method, route)
+        if read_timeout is not None:
+            timeout = kwargs.get("timeout")
+            connect = timeout[0] if isinstance(timeout, tuple) else timeout
+            kwargs["timeout"] = (connect, read_timeout)
+
+        retryable = request.method in IDEMPOTENT
+        attempt = 0
+        while True:
+            self._admit(endpoint, (host, endpoint))
+            error = response = None
+            try:
+                response = self.inner.send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+                if isinstance(e, requests.exceptions.Timeout):
+                    self.stats.add(endpoint, "timeouts")
+                # Не удалось соединиться — неудача и хоста; таймаут чтения — только эндпоинта
+                self._record(endpoint, host, not isinstance(e, requests.exceptions.ReadTimeout))
+                self._record(endpoint, endpoint, True)
+            except Exception:
+                self._release((host, endpoint))
+                raise
+            else:
+                failed = response.status_code in RETRY_STATUSES
+                self._record(endpoint, host, False)
+                self._record(endpoint, endpoint, failed)
+                if not failed:
+                    return response
+
+            attempt += 1
+            if not retryable or attempt > self.policy.retries:
+                break
+            if not self._take_retry():
+                self.stats.add(endpoint, "budget_exhausted")
+                break
+            retry_after = _retry_after(response) if response is not None else None
+            if response is not None:
+                response.close()
+            self.stats.add(endpoint, "retries")
+            self._sleep(self.policy.delay(attempt, retry_after))
+
+        if error is not None:
+            raise error
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def install(session, policy, stats, counter=None):
+    """Подключает устойчивый транспорт к сессии requests"""
+    adapter = ResilientAdapter(session.get_adapter("http://"), policy, stats, counter=counter)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
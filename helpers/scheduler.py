@@ -0,0 +1,117 @@
+"""Цепочки тестов для параллельного запуска.
+
+Тесты create → read → update → delete одной сущности передают ID друг другу,
+поэтому должны выполняться в одном процессе и в заданном порядке. Цепочки,
+связанные зависимостями (например, связь пользователя с организацией), тоже
+объединяются в одну группу. Независимые группы распределяются по воркерам
+pytest-xdist (режим --dist loadgroup) и выполняются одновременно.
+"""
+
+# Цепочка -> префиксы путей модулей (относительно tests/)
+CHAINS = {
+    "auth": ("token/",),
+    "user": ("user/",),
+    "organization": ("organizations/",),
+    "users_org": ("users/",),
+    "report": ("report/",),
+    "billing_report": ("billing-report/",),
+    "resource_service": ("resource/resource_service/",),
+    "resource_pool": ("resource/resource_pool/",),
+    "resource_atom": ("resource/resource_atom/",),
+    "resource_location": ("resource/resource_location/",),
+    "resource_category_ref": ("resource/resource_category_ref/",),
+    "resource_units_measure": ("resource/resource_units_measure/",),
+    "resource_pool_link_atom": ("resource/resource_pool_link_atom/",),
+    "tariff": ("tariff/tariff_crud/",),
+    "tariff_link_organization": ("tariff/tariff_link_organization_crud/",),
+    "tariff_link_tenant": ("tariff/tariff_link_tenant_crud/",),
+    "tariff_tenant_settings": ("tariff/tariff_tenant_settings_crud/", "tariff/tariff_tenants_settings/"),
+    "pre_billing_items": ("pre-billing_items/",),
+    "pre_billing_manual": ("pre-billing_manual/",),
+    "pre_billing_organizations": ("pre-billing_organizations/",),
+    "pre_billing_resource": ("pre-billing_resource/",),
+    "service": ("service/service_crud/",),
+    "service_paramets": ("service/service_paramets/",),
+    "service_pool_link_atom": ("service/service_pool_link_atom/",),
+    "service_pool_link_atom_history": ("service/service_pool_link_atom_history/",),
+    "services_parameters_copy": ("service/services_parameters_copy/",),
+    "user_group_billing_service": ("service/user_group_billing_service/",),
+    "user_group_make_billing_service": ("service/user_group_make_billing_service/",),
+}
+
+# Цепочка -> цепочки, чьи ID она использует (через .env)
+CHAIN_DEPENDENCIES = {
+    "users_org": ("user", "organization"),
+    "report": ("organization",),
+    "billing_report": ("organization",),
+    "tariff_link_organization": ("tariff",),
+    "tariff_link_tenant": ("tariff",),
+    "tariff_tenant_settings": ("tariff_link_organization",),
+}
+
+
+def chain_of(nodeid):
+    """Имя цепочки для теста или None, если тест ни от кого не зависит"""
+    path = nodeid.split("::", 1)[0]
+    if path.startswith("tests/"):
+        path = path[len("tests/"):]
+    for chain, prefixes in CHAINS.items():
+        if path.startswith(prefixes):
+            return chain
+    return None
+
+
+def build_groups(chains=CHAINS, dependencies=CHAIN_DEPENDENCIES):
+    """Объединяет зависимые цепочки в группы (компоненты связности графа зависимостей)"""
+    parent = {chain: chain for chain in chains}
+
+    def find(chain):
+        while parent[chain] != chain:
+            parent[chain] = parent[parent[chain]]
+            chain = parent[chain]
+        return chain
+
+    for chain, required in dependencies.items():
+        for dependency in required:
+            if chain not in parent or dependency not in parent:
+                raise ValueError(f"Неизвестная цепочка в зависимостях: {chain} -> {dependency}")
+            parent[find(chain)] = find(dependency)
+
+    members = {}
+    for chain in chains:
+        members.setdefault(find(chain), []).append(chain)
+    return {chain: "+".join(members[find(chain)]) for chain in chains}
+
+
+GROUPS = build_groups()
+
+
+def group_of(nodeid):
+    """Группа xdist для теста: общая для зависимых цепочек, иначе — модуль теста"""
+    chain = chain_of(nodeid)
+    if chain is None:
+        # Тесты одного модуля делят глобальные переменные, поэтому не разделяются
+        return nodeid.split("::", 1)[0]
+    return GROUPS[chain]
+
+
+def assign_groups(items, durations=None):
+    """Возвращает тесты с порядком для параллельного запуска.
+
+    Внутри группы порядок сохраняется. Группы упорядочиваются по убыванию
+    ожидаемой длительности (по прошлому прогону, иначе 1 секунда на тест),
+    чтобы самые длинные цепочки стартовали первыми.
+    """
+    durations = durations or {}
+    grouped = {}
+    for item in items:
+        grouped.setdefault(group_of(item.nodeid), []).append(item)
+
+    cost = {
+        group: sum(durations.get(item.nodeid, 1.0) for item in group_items)
+        for group, group_items in grouped.items()
+    }
+    ordered = []
+    for group in sorted(grouped, key=lambda name: -cost[name]):
+        ordered.extend(grouped[group])
+    return ordered, grouped
@@ -0,0 +1,228 @@
+"""Проверка структуры ответов API по компилируемым схемам.
+
+Схема описывается обычными значениями Python:
+    int, str, (int, float)   — тип поля
+    {"id": int, ...}         — объект (все поля обязательны)
+    [схема]                  — список элементов
+    Field(...)               — тип с условием, необязательное поле, null
+    Obj({...}, checks=...)   — объект с проверками нескольких полей сразу
+
+compile_schema() один раз превращает схему в цепочку замыканий, поэтому
+список из тысяч элементов проверяется за один проход без разбора схемы на
+каждом элементе. Ошибки не прерывают проверку: собираются все нарушения с
+индексом элемента и путём поля (например, [12] category.unitMeasure.id).
+"""
+
+import json
+from collections import Counter
+
+import allure
+
+# Дата в формате PHP DateTime: {"date": ..., "timezone_type": 3, "timezone": "UTC"}
+PHP_DATE = {"date": str, "timezone": str, "timezone_type": int}
+
+
+class Field:
+    """Поле: допустимые типы, условие на значение, обязательность, null"""
+
+    def __init__(self, types, check=None, message=None, required=True, nullable=False):
+        self.types = types
+        self.check = check
+        self.message = message or "значение не прошло проверку"
+        self.required = required
+        self.nullable = nullable
+
+
+class Obj:
+    """Объект: схемы полей и проверки, затрагивающие несколько полей"""
+
+    def __init__(self, fields, checks=()):
+        self.fields = fields
+        self.checks = checks
+
+
+def _type_names(types):
+    types = types if isinstance(types, tuple) else (types,)
+    return " | ".join(t.__name__ for t in types)
+
+
+def _compile(spec, path):
+    if isinstance(spec, Field):
+        return _compile_field(spec, path)
+    if isinstance(spec, dict):
+        spec = Obj(spec)
+    if isinstance(spec, Obj):
+        return _compile_object(spec, path)
+    if isinstance(spec, list):
+        return _compile_list(spec[0], path)
+    return _compile_field(Field(spec), path)
+
+
+def _compile_field(field, path):
+    types, test, message, nullable = field.types, field.check, field.message, field.nullable
+    expected = f"ожидался {_type_names(types)}"
+
+    def check(value, errors):
+        if value is None:
+            if not nullable:
+                errors.append((path, f"{expected}, получено null"))
+        elif not isinstance(value, types):
+            errors.append((path, f"{expected}, получено {type(value).__name__}"))
+        elif test is not None and not test(value):
+            errors.append((path, f"{message} (значение: {value!r})"))
+
+    return check
+
+
+def _compile_object(obj, path):
+    fields = []
+    for name, spec in obj.fields.items():
+        field_path = f"{path}.{name}" if path else name
+        required = not isinstance(spec, Field) or spec.required
+        fields.append((name, _compile(spec, field_path), required, field_path))
+    checks = tuple(obj.checks)
+    where = path or "<элемент>"
+
+    def check(value, errors):
+        if not isinstance(value, dict):
+            errors.append((where, f"ожидался объект, получено {type(value).__name__}"))
+            return
+        for name, validate, required, field_path in fields:
+            if name in value:
+                validate(value[name], errors)
+            elif required:
+                errors.append((field_path, "отсутствует поле"))
+        for test, message in checks:
+            try:
+                ok = test(value)
+            except (KeyError, TypeError):
+                # Поля для проверки отсутствуют или неверного типа — об этом уже есть ошибка
+                continue
+            if not ok:
+                errors.append((where, message))
+
+    return check
+
+
+def _compile_list(item_spec, path):
+    validate_item = _compile(item_spec, f"{path}[]")
+
+    def check(value, errors):
+        if not isinstance(value, list):
+            errors.append((path, f"ожидался список, получено {type(value).__name__}"))
+            return
+        for item in value:
+            validate_item(item, errors)
+
+    return check
+
+
+class Validator:
+    """Скомпилированная схема одного элемента ответа"""
+
+    def __init__(self, spec, where=None):
+        self._check = _compile(spec, "")
+        # where: путь поля -> ожидаемое значение (соответствие фильтрам запроса)
+        self._where = [(path, path.split("."), expected) for path, expected in (where or {}).items()]
+
+    def errors(self, value):
+        """Нарушения одного значения: [(путь, сообщение)]"""
+        errors = []
+        self._check(value, errors)
+        for path, keys, expected in self._where:
+            actual = value
+            for key in keys:
+                actual = actual.get(key) if isinstance(actual, dict) else None
+            if actual != expected:
+                errors.append((path, f"{actual!r} ≠ фильтру {expected!r}"))
+        return errors
+
+    def validate_list(self, items):
+        """Нарушения по всему списку за один проход: [(индекс, путь, сообщение)]"""
+        violations = []
+        for index, item in enumerate(items):
+            violations.extend((index, path, message) for path, message in self.errors(item))
+        return violations
+
+
+def compile_schema(spec, where=None):
+    """Компилирует схему элемента; where — ожидаемые значения полей по фильтрам запроса"""
+    return Validator(spec, where)
+
+
+def format_violations(violations, limit=20):
+    lines = [f"[{index}] {path}: {message}" for index, path, message in violations[:limit]]
+    if len(violations) > limit:
+        lines.append(f"… ещё {len(violations) - limit} нарушений")
+    return "\n".join(lines)
+
+
+def assert_valid_list(items, validator, name="Проверка схемы", max_kept=1000):
+    """Проверяет все элементы списка или потока; возвращает число проверенных элементов.
+
+    При нарушениях — вложение Allure со сводкой по полям (по всем элементам)
+    и первыми max_kept нарушениями.
+    """
+    violations = []
+    by_field = Counter()
+    invalid = set()
+    count = 0
+    for count, item in enumerate(items, 1):
+        errors = validator.errors(item)
+        if not errors:
+            continue
+        invalid.add(count - 1)
+        by_field.update(path for path, _ in errors)
+        if len(violations) < max_kept:
+            violations.extend((count - 1, path, message) for path, message in errors)
+    if not invalid:
+        return count
+    allure.attach(
+        json.dumps({
+            "items": count,
+            "invalid_items": len(invalid),
+            "violations_by_field": dict(by_field.most_common()),
+            "violations": [
+                {"index": index, "path": path, "message": message}
+                for index, path, message in violations[:max_kept]
+            ],
+        }, ensure_ascii=False, indent=2),
+        name=name,
+        attachment_type=allure.attachment_type.JSON
+    )
+    raise AssertionError(
+        f"{len(invalid)} из {count} элементов не соответствуют схеме:\n{format_violations(violations)}"
+    )
+
+
+# Схемы элементов списков по эндпоинтам
+RESOURCE_ATOM = Obj(
+    {
+        "id": Field(int, lambda v: v > 0, "id должен быть положительным"),
+        "name": Field(str, lambda v: bool(v.strip()), "пустое имя"),
+        "category": {
+            "id": int,
+            "name": str,
+            "unitMeasure": {"id": int, "name": str},
+            "typeRef": {"id": int, "name": str},
+        },
+        "pool_id": int,
+        "link_id": Field(int, lambda v: v > 0, "link_id должен быть положительным"),
+        "min_count": Field(int, lambda v: v >= 0, "min_count не может быть отрицательным"),
+        "max_count": int,
+        "cost_price_active": Field((int, float), lambda v: v >= 0, "отрицательная цена"),
+        "cost_price_passive": Field((int, float), lambda v: v >= 0, "отрицательная цена"),
+        "type_use": int,
+        "create_time": PHP_DATE,
+        "update_time": PHP_DATE,
+        "create_user_id": int,
+        "update_user_id": int,
+        "duplicate": bool,
+        "usedInTS": int,
+    },
+    checks=[(lambda atom: atom["max_count"] > atom["min_count"], "max_count должен быть больше min_count")],
+)
+
+SCHEMAS = {
+    "resource_atoms": RESOURCE_ATOM,
+}
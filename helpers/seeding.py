@@ -0,0 +1,67 @@
+"""Наполнение организации данными через ограниченный пул потоков.
+
+План (все интервалы и параметры услуг) составляется заранее в
+helpers/dataset.py, затем запросы отправляются пулом из concurrency потоков,
+при необходимости — не чаще rate запросов в секунду. Результаты возвращаются в порядке плана, поэтому лог по
+дням и итоговые суммы не зависят от того, в каком порядке завершились запросы.
+
+Параметры берутся из окружения (.env):
+    SEED_SERVICES_TOTAL — сколько услуг добавить (по умолчанию 10)
+    SEED_CONCURRENCY    — число параллельных запросов (по умолчанию 8)
+    SEED_RATE           — ограничение частоты, запросов/с (0 — без ограничения)
+
+Соединения берутся из общего пула api_client: при SEED_CONCURRENCY больше
+API_POOL_SIZE лишние потоки ждут свободного соединения.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from config import ENV_FILE
+
+
+def settings():
+    """(число услуг, параллельность, ограничение частоты) из окружения и .env"""
+    load_dotenv(ENV_FILE)
+    return (
+        int(os.getenv("SEED_SERVICES_TOTAL", 10)),
+        max(1, int(os.getenv("SEED_CONCURRENCY", 8))),
+        float(os.getenv("SEED_RATE", 0)),
+    )
+
+
+class RateLimiter:
+    """Не больше rate запусков в секунду на все потоки (0 — без ограничения)"""
+
+    def __init__(self, rate=0):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def run(plan, submit, concurrency=8, rate=0):
+    """Выполняет submit(item) для каждого элемента плана; результаты — в порядке плана"""
+    limiter = RateLimiter(rate)
+
+    def call(item):
+        limiter.wait()
+        return submit(item)
+
+    if concurrency <= 1:
+        return [call(item) for item in plan]
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="seeding") as pool:
+        return list(pool.map(call, plan))
@@ -0,0 +1,921 @@
+"""Локальный заменитель API для быстрых офлайн-прогонов.
+
+Реализует эндпоинты /api/v1/*, которые используют тесты, поверх хранилища
+в памяти. Справочники и записи, на которые ссылаются значения по умолчанию
+в тестах (пул 441, категория 261, тариф 256 и т.д.), создаются при старте
+из SEED. Время в ответах идёт по детерминированным «часам» (секунда на каждую
+запись), поэтому ответы воспроизводимы от прогона к прогону.
+
+    python -m helpers.standin --port 8080    # отдельный процесс
+    pytest tests/ --standin                  # весь прогон против заменителя
+
+Неизвестный маршрут отвечает так же, как настоящий стенд:
+500 {"error": "method - not found"}. Сервер считает запросы и время их
+обработки (StandinServer.stats), чтобы отделить накладные расходы самого
+набора тестов от задержек бэкенда.
+"""
+
+import argparse
+import copy
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+API_PREFIX = "/api/v1/"
+TIMEZONE = "Europe/Moscow"
+EPOCH = datetime(2025, 1, 1, 9, 0, 0)
+EXPAND_DEPTH = 3
+
+# Значения .env, которые при --standin указывают на записи из SEED
+ENV = {
+    "ORGANIZATION_ID": "1",
+    "SERVICE_ID": "1",
+    "SERVICE_COPY_ID": "2",
+    "SERVICE_SYSTEM_NAME": "iaas",
+    "RENDER_RESOURCE_ID": "1",
+    "POOL_ID": "441",
+    "ATOM_ID": "350",
+    "UPDATE_POOL_ID": "441",
+    "UPDATE_ATOM_ID": "339",
+    "RESOURCE_POOL_LINK_ID": "1",
+    "RESOURCE_POOL_LINK_ID_TO_UPDATE": "2",
+    "RESOURCE_POOL_LINK_ID_TO_DELETE": "3",
+    "RESOURCE_UNIT_MEASURE_ID": "100",
+    "CREATED_TARIFF_ID": "256",
+    "CREATED_TARIFF_SETTING_ID": "1",
+    "CREATED_TENANT_ID": "123",
+    "CREATED_LINK_ID": "320",
+}
+
+# Учётные данные по умолчанию: заменитель принимает любые
+CREDENTIALS = {
+    "API_LOGIN": "autotest",
+    "API_PASSWORD": "autotest",
+    "API_DOMAIN": "standin",
+    "TOKEN_TIMEOUT": "600",
+}
+
+
+class Clock:
+    """Детерминированное время: каждый вызов сдвигает часы на секунду"""
+
+    def __init__(self, start=EPOCH):
+        self._now = start
+        self._lock = threading.Lock()
+
+    def tick(self):
+        with self._lock:
+            self._now += timedelta(seconds=1)
+            return self._now
+
+
+def php_time(moment):
+    """Дата в формате PHP DateTime, как её отдаёт API"""
+    return {
+        "date": moment.strftime("%Y-%m-%d %H:%M:%S.000000"),
+        "timezone_type": 3,
+        "timezone": TIMEZONE,
+    }
+
+
+def iso_time(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Collection:
+    """Сущность API: маршруты, связи и фильтры списка.
+
+    relations — (поле с ID, сущность, имя вложенного объекта, проекция или None);
+    filters — query-параметр -> (путь в развёрнутой записи, операция: eq/contains/gte/lte);
+    stamp — "php" (create_time/update_time + *_user_id), "iso" (created_at) или None;
+    deleted — тело ответа на DELETE (по умолчанию null);
+    soft_delete — DELETE только проставляет deleted_at, как БД стенда: запись
+    пропадает из чтения по ID и списков, но остаётся для отчётов и связей.
+    """
+
+    def __init__(self, item=None, create=None, lists=(), relations=(), filters=None,
+                 stamp="php", hidden=(), methods=("GET", "PUT", "DELETE"),
+                 key="id", missing_status=404, defaults=None, deleted=None, soft_delete=False):
+        self.item = item
+        self.create = create
+        self.lists = lists
+        self.relations = relations
+        self.filters = filters or {}
+        self.stamp = stamp
+        self.hidden = hidden
+        self.methods = methods
+        self.key = key
+        self.missing_status = missing_status
+        self.defaults = defaults or {}
+        self.deleted = deleted
+        self.soft_delete = soft_delete
+
+
+def _sys_name(record):
+    return {"id": record["id"], "sys_name": record["sysname"], "name": record["name"]}
+
+
+COLLECTIONS = {
+    "user": Collection(item="user", create="user", lists=("users",), hidden=("password",)),
+    "organization": Collection(
+        item="organization", create="organization", lists=("organizations",),
+        relations=(
+            ("sub_right_ref_id", "right_ref", "sub_right_ref", None),
+            ("type_right_ref_id", "right_ref", "type_right_ref", None),
+        ),
+        filters={"by_tenant_id": ("tenant_id", "eq")},
+        soft_delete=True,
+    ),
+    "user_organization_link": Collection(
+        item="user_organization_link", create="user_organization_link",
+        methods=("GET",), key="organization_id",
+    ),
+    "role": Collection(item="role", lists=("roles",), stamp=None, methods=("GET",)),
+    "resource_service": Collection(item="resource_service", create="resource_service", lists=("resource_services",)),
+    "resource_location": Collection(item="resource_location", create="resource_location", lists=("resource_locations",)),
+    "pool_status": Collection(stamp=None),
+    "type_service": Collection(lists=("resource/type_services",), stamp=None),
+    "resource_pool": Collection(
+        item="resource_pool", create="resource_pool", lists=("resource_pools",),
+        relations=(
+            ("location_id", "resource_location", "location", None),
+            ("status_id", "pool_status", "status", None),
+            ("type_service_id", "type_service", "type_service", _sys_name),
+        ),
+        filters={"by_service_id": ("service_id", "eq"), "by_location_id": ("location_id", "eq")},
+        # Настоящий стенд отвечает 400 на запрос удалённого пула
+        missing_status=400,
+    ),
+    "resource_unit_measure": Collection(
+        item="resource_unit_measure", create="resource_units_measure", lists=("resource_units_measure",),
+        stamp=None, methods=("GET", "PUT"),
+    ),
+    "resource_type_ref": Collection(lists=("resource_types_ref",), stamp=None),
+    "category_type": Collection(lists=("resource/category_types",), stamp=None),
+    "resource_category_ref": Collection(
+        item="resource_category_ref", create="resource_category_ref", lists=("resource_categoryes_ref",),
+        relations=(
+            ("unit_measure_id", "resource_unit_measure", "unitMeasure", None),
+            ("type_ref_id", "resource_type_ref", "typeRef", None),
+            ("category_type_id", "category_type", "category_type", None),
+        ),
+    ),
+    "resource_atom": Collection(
+        item="resource_atom", create="resource_atom",
+        relations=(("category_id", "resource_category_ref", "category", None),),
+        defaults={"description": "", "duplicate": False, "usedInTS": 0},
+    ),
+    "resource_pool_link_atom": Collection(
+        item="resource_pool_link_atom", create="resource_pool_link_atom", stamp="iso",
+        deleted={"success": True},
+    ),
+    "tariff_status": Collection(stamp=None),
+    "tariff_time_interval": Collection(lists=("tariff_time_intervals",), stamp=None),
+    "tariff_setting_type": Collection(lists=("tariff_setting_types",), stamp=None),
+    "tariff": Collection(
+        item="tariff", create="tariff", lists=("tariffs",),
+        relations=(
+            ("service_id", "resource_service", "service", None),
+            ("location_id", "resource_location", "location", None),
+            ("status_id", "tariff_status", "status", None),
+            ("time_interval_id", "tariff_time_interval", "time_interval", None),
+        ),
+        filters={"by_service_id": ("service_id", "eq"), "by_name": ("name", "contains")},
+    ),
+    "tariff_setting": Collection(
+        lists=("tariffs_settings",),
+        relations=(
+            ("tariff_id", "tariff", "tariff", None),
+            ("resource_pool_id", "resource_pool", "resource_pool", None),
+            ("resource_atom_id", "resource_atom", "resource_atom", None),
+        ),
+        filters={"by_tariff_id": ("tariff_id", "eq")},
+    ),
+    "tariff_link_organization": Collection(
+        item="tariff_link_organization", create="tariff_link_organization", lists=("tariff_links_organization",),
+        relations=(("tariff_id", "tariff", "tariff", None),),
+        filters={
+            "by_tariff_id": ("tariff_id", "eq"),
+            "by_name": ("name", "contains"),
+            "by_service_id": ("tariff.service_id", "eq"),
+            "by_location_id": ("tariff.location_id", "eq"),
+        },
+        defaults={"is_organization": True, "description": ""},
+    ),
+    "tariff_link_tenant": Collection(
+        item="tariff_link_tenant", create="tariff_link_tenant", lists=("tariff_links_tenant",),
+        relations=(("tariff_id", "tariff", "tariff", None),),
+        filters={
+            "by_tenant_id": ("tenant_id", "eq"),
+            "by_tariff_id": ("tariff_id", "eq"),
+            "by_service_id": ("tariff.service_id", "eq"),
+            "by_location_id": ("tariff.location_id", "eq"),
+        },
+        defaults={"name": "", "type_tariff": 1},
+    ),
+    "tariff_tenant_settings": Collection(
+        item="tariff_tenant_settings", create="tariff_tenant_settings", lists=("tariff_tenants_settings",),
+        relations=(
+            ("tariff_setting_id", "tariff_setting", "tariff_setting", None),
+            ("tariff_link_organization_id", "tariff_link_organization", "tariff_link_organization", None),
+        ),
+        filters={"by_tariff_link_organization_id": ("tariff_link_organization_id", "eq")},
+    ),
+    "right_ref": Collection(stamp=None),
+    "billing_role": Collection(lists=("billing/roles_render_billing",), stamp=None),
+    "billing_service": Collection(
+        item="billing/service", lists=("billing/services",), methods=("GET",),
+        filters={
+            "by_organization_id": ("organization_id", "eq"),
+            "by_service_system_name": ("service_system_name", "eq"),
+            "by_render_resource": ("render_resource", "eq"),
+        },
+    ),
+    "billing_service_history": Collection(stamp="iso"),
+    "billing_service_parameter_history": Collection(stamp=None),
+    "billing_service_parameter": Collection(
+        lists=("billing/services_parametrs",), stamp="iso",
+        filters={"by_service_id": ("service_id", "eq")},
+    ),
+    "billing_service_pool_link_atom": Collection(
+        lists=("billing/service_pool_link_atoms",), stamp="iso",
+        filters={"by_service_id": ("service_id", "eq")},
+    ),
+    "user_group_billing_service": Collection(
+        item="billing/user_group_billing_service", create="billing/user_group_billing_service",
+        lists=("billing/user_groups_billing_service",),
+    ),
+    "user_group_make_billing_service": Collection(create="billing/user_group_make_billing_service"),
+    "vmw": Collection(
+        lists=("billing/vmw",), stamp=None,
+        filters={"service_id": ("service_id", "eq"), "start_date": ("date", "gte"), "end_date": ("date", "lte")},
+    ),
+    "pre_billing_manual": Collection(
+        item="pre_billing/manual/item", create="pre_billing/manual/items", lists=("pre_billing/manual/items",),
+        filters={
+            "org_id": ("org_id", "eq"),
+            "start_date": ("record_start_date", "gte"),
+            "end_date": ("record_end_date", "lte"),
+        },
+    ),
+    "pre_billing_resource": Collection(
+        item="pre_billing/resource/item", create="pre_billing/resource/items", lists=("pre_billing/resource/items",),
+    ),
+    "pre_billing_organization": Collection(
+        item="pre_billing/organizations", create="pre_billing/organizations", lists=("pre_billing/organizations",),
+    ),
+}
+
+
+def _atom(atom_id, name, category_id):
+    return {"id": atom_id, "name": name, "description": f"{name} (заменитель API)",
+            "category_id": category_id, "duplicate": False, "usedInTS": 0}
+
+
+SEED = {
+    "user": [
+        {"id": 1, "fio": "Администратор Тенанта", "login": "admin", "password": "admin",
+         "mail": "admin@example.com", "phone": "79000000001", "role_id": 5, "tenant_id": 123, "is_manager": 1},
+    ],
+    "right_ref": [
+        {"id": 2, "name": "Юридическое лицо"},
+        {"id": 9, "name": "Коммерческий клиент"},
+    ],
+    "organization": [
+        {"id": 1, "name": "ООО Заменитель", "number_contract": "0000000001", "cid": "0001",
+         "contract_begin_time": "2025-01-01", "address": "г. Москва, ул. Примерная, 1",
+         "fact_address": "г. Москва, ул. Примерная, 1", "contact_name": "Иван Иванов",
+         "contact_data": "Менеджер", "contact_phone": "+79000000000", "contact_mail": "org@example.com",
+         "description": "Организация заменителя API", "inn": "7700000000", "kpp": "770001",
+         "bik": "044525000", "pay_account": "407028100000", "kor_account": "3010181000",
+         "bank_name": "Банк", "sub_right_ref_id": 2, "manager_id": 1, "tenant_id": 123, "type_right_ref_id": 9},
+    ],
+    "user_organization_link": [
+        {"id": 1, "user_id": 1, "organization_id": 1},
+    ],
+    "role": [
+        {"id": 1, "name": "Пользователь Организации", "system_name": "ROLE_ORGANIZATION_USER"},
+        {"id": 2, "name": "Владелец Организации", "system_name": "ROLE_ORGANIZATION_OWNER"},
+        {"id": 3, "name": "Менеджер Тенанта", "system_name": "ROLE_TENANT_MANAGER"},
+        {"id": 4, "name": "Инженер Тенанта", "system_name": "ROLE_TENANT_ENGINEER"},
+        {"id": 5, "name": "Администратор Тенанта", "system_name": "ROLE_TENANT_ADMIN"},
+        {"id": 6, "name": "Супер Администратор", "system_name": "ROLE_SUPER_ADMIN"},
+    ],
+    "resource_service": [
+        {"id": 304, "name": "Услуги ЦОД", "system_name": "dc_services"},
+        {"id": 414, "name": "Доступ в Интернет", "system_name": "internet"},
+        {"id": 416, "name": "Облачные вычисления", "system_name": "cloud_compute"},
+        {"id": 418, "name": "Хранение данных", "system_name": "storage"},
+    ],
+    "resource_location": [
+        {"id": 125, "name": "ЦОД Москва", "address": "г. Москва, ул. Примерная, 1"},
+    ],
+    "pool_status": [
+        {"id": 1, "sys_name": "draft", "name": "Черновик"},
+        {"id": 2, "sys_name": "active", "name": "Активен"},
+        {"id": 3, "sys_name": "archive", "name": "В архиве"},
+    ],
+    "type_service": [
+        {"id": 1, "name": "Нематериальная услуга", "sysname": "simple"},
+        {"id": 2, "name": "Услуга аренды отдельной облачной службы", "sysname": "service"},
+        {"id": 3, "name": "Услуга аренды облачного сервиса", "sysname": "cloud"},
+        {"id": 4, "name": "Услуга аренды программного обеспечения", "sysname": "software"},
+        {"id": 6, "name": "Услуга аренды оборудования", "sysname": "hardware"},
+        {"id": 7, "name": "Услуга размещения оборудования", "sysname": "colacation"},
+        {"id": 8, "name": "Услуга аренды почтового сервиса", "sysname": "mail"},
+    ],
+    "resource_pool": [
+        {"id": 441, "name": "Пул IaaS Москва", "description": "Пул заменителя API", "status_id": 2,
+         "service_id": 414, "location_id": 125, "type_service_id": 1},
+    ],
+    "resource_unit_measure": [
+        {"id": 4, "name": "Гбайт"},
+        {"id": 61, "name": "Шт"},
+        {"id": 67, "name": "Час"},
+        {"id": 71, "name": "Мбит/с"},
+        {"id": 100, "name": "Единица автотеста"},
+    ],
+    "resource_type_ref": [
+        {"id": 1, "name": "Вычислительный ресурс"},
+        {"id": 2, "name": "Сетевой ресурс"},
+        {"id": 3, "name": "Программный ресурс"},
+    ],
+    "category_type": [
+        {"id": type_id, "name": f"Тип категории {type_id}"} for type_id in (1, 2, 3, 6, 7, 8, 9, 10, 11)
+    ],
+    "resource_category_ref": [
+        {"id": 256, "name": "Хранение данных", "unit_measure_id": 4, "type_ref_id": 1, "category_type_id": 1},
+        {"id": 261, "name": "Вычислительные ресурсы", "unit_measure_id": 67, "type_ref_id": 1, "category_type_id": 1},
+        {"id": 262, "name": "Сеть", "unit_measure_id": 71, "type_ref_id": 2, "category_type_id": 1},
+        {"id": 263, "name": "Лицензии", "unit_measure_id": 61, "type_ref_id": 3, "category_type_id": 2},
+    ],
+    "resource_atom": [
+        _atom(339, "vCPU", 261),
+        _atom(340, "vRAM", 261),
+        _atom(341, "vGPU", 261),
+        _atom(350, "Диск SSD", 256),
+        _atom(351, "Диск HDD", 256),
+        _atom(352, "Резервное копирование", 256),
+        _atom(360, "Интернет-канал", 262),
+        _atom(361, "Публичный IP", 262),
+        _atom(362, "VPN", 262),
+        _atom(370, "Лицензия ОС", 263),
+        _atom(371, "Лицензия СУБД", 263),
+        _atom(372, "Антивирус", 263),
+    ],
+    "resource_pool_link_atom": [
+        {"id": 1, "pool_id": 441, "atom_id": 339, "min_count": 0, "max_count": 64,
+         "cost_price_active": 120.0, "cost_price_passive": 60.0, "type_use": 1},
+        {"id": 2, "pool_id": 441, "atom_id": 340, "min_count": 1, "max_count": 32,
+         "cost_price_active": 80.0, "cost_price_passive": 40.0, "type_use": 1},
+        {"id": 3, "pool_id": 441, "atom_id": 341, "min_count": 0, "max_count": 16,
+         "cost_price_active": 900.0, "cost_price_passive": 450.0, "type_use": 2},
+    ],
+    "tariff_status": [
+        {"id": 1, "sys_name": "draft", "name": "Черновик"},
+        {"id": 2, "sys_name": "active", "name": "Действует"},
+        {"id": 3, "sys_name": "archive", "name": "В архиве"},
+    ],
+    "tariff_time_interval": [
+        {"id": 1, "name": "Секунда", "sysname": "second"},
+        {"id": 2, "name": "Минута", "sysname": "minute"},
+        {"id": 3, "name": "Час", "sysname": "hour"},
+        {"id": 4, "name": "День", "sysname": "day"},
+        {"id": 5, "name": "Месяц", "sysname": "month"},
+        {"id": 6, "name": "Год", "sysname": "year"},
+    ],
+    "tariff_setting_type": [
+        {"id": 1, "name": "Строка", "code": "string"},
+        {"id": 2, "name": "Флаг", "code": "boolean"},
+        {"id": 3, "name": "Целое число", "code": "integer"},
+        {"id": 4, "name": "Список", "code": "select"},
+    ],
+    "tariff": [
+        {"id": 256, "name": "Тариф IaaS", "description": "Почасовая оплата ресурсов", "service_id": 414,
+         "status_id": 2, "type_level_resource": 2, "location_id": 125, "time_interval_id": 3, "permanent_service": 1},
+        {"id": 257, "name": "Тариф тенанта", "description": "Тариф для тенанта", "service_id": 414,
+         "status_id": 2, "type_level_resource": 2, "location_id": 125, "time_interval_id": 5, "permanent_service": 1},
+        {"id": 291, "name": "Доступ в Интернет с бонусной полосой 20_11_24", "description": "Интернет", "service_id": 414,
+         "status_id": 2, "type_level_resource": 1, "location_id": 125, "time_interval_id": 5, "permanent_service": 1},
+        {"id": 304, "name": "Услуги ЦОД", "description": "Размещение оборудования", "service_id": 304,
+         "status_id": 2, "type_level_resource": 1, "location_id": 125, "time_interval_id": 5, "permanent_service": 1},
+    ],
+    "tariff_setting": [
+        {"id": 1, "tariff_id": 256, "resource_pool_id": 441, "resource_atom_id": 339, "resource_value": 1,
+         "base_price_active": 120.0, "base_price_passive": 60.0, "time_of_base_price": 3,
+         "type_state_of_resource": 1, "type_right_render": 1},
+        {"id": 2, "tariff_id": 256, "resource_pool_id": 441, "resource_atom_id": 340, "resource_value": 1,
+         "base_price_active": 80.0, "base_price_passive": 40.0, "time_of_base_price": 3,
+         "type_state_of_resource": 1, "type_right_render": 1},
+    ],
+    "tariff_link_organization": [
+        {"id": 320, "tariff_id": 291, "tenant_id": 123, "is_organization": True,
+         "name": "Доступ в Интернет с бонусной полосой 20_11_24", "description": "Связь заменителя API", "type_tariff": 1},
+    ],
+    "tariff_link_tenant": [
+        {"id": 1, "tariff_id": 257, "tenant_id": 123, "name": "Тариф тенанта", "type_tariff": 1},
+    ],
+    "tariff_tenant_settings": [
+        {"id": 1, "tariff_setting_id": 1, "tariff_link_organization_id": 320,
+         "tenant_rate_price_active": 100, "tenant_rate_price_passive": 50},
+    ],
+    "billing_role": [
+        {"id": 1, "name": "Постоплата"},
+        {"id": 2, "name": "Предоплата"},
+    ],
+    "billing_service": [
+        {"id": 1, "name": "IaaS ООО Заменитель", "organization_id": 1, "service_system_name": "iaas", "render_resource": 1},
+        {"id": 2, "name": "Хранение ООО Заменитель", "organization_id": 1, "service_system_name": "storage", "render_resource": 2},
+    ],
+    "billing_service_history": [
+        {"id": 1, "service_id": 1, "action": "create"},
+    ],
+    "billing_service_parameter_history": [
+        {"id": 1, "service_id": 1, "parameter_name": "cpu", "old_value": "2", "new_value": "4",
+         "changed_at": "2025-01-01T09:00:00Z"},
+    ],
+    "billing_service_parameter": [
+        {"id": 1, "service_id": 1, "name": "cpu", "value": "4"},
+        {"id": 2, "service_id": 2, "name": "disk", "value": "100"},
+    ],
+    "billing_service_pool_link_atom": [
+        {"id": 1, "service_id": 1, "pool_id": 441, "atom_id": 339},
+    ],
+    "vmw": [
+        {"id": 1, "service_id": 1, "date": "2025-01-01", "cpu": 4, "ram": 8},
+    ],
+}
+
+
+class StandinError(Exception):
+    """Ошибка, которую заменитель возвращает клиенту"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Store:
+    """Хранилище сущностей в памяти"""
+
+    def __init__(self, seed=None, clock=None, collections=COLLECTIONS):
+        self.collections = collections
+        self.clock = clock or Clock()
+        self._lock = threading.RLock()
+        self._tables = {name: {} for name in collections}
+        self._next_id = {}
+        for name, records in (SEED if seed is None else seed).items():
+            for record in records:
+                self._put(name, self._stamp(name, dict(record), created=True))
+        for name, table in self._tables.items():
+            self._next_id[name] = max(table, default=0) + 1
+
+    def _put(self, name, record):
+        self._tables[name][record["id"]] = record
+
+    def _stamp(self, name, record, created):
+        stamp = self.collections[name].stamp
+        moment = self.clock.tick()
+        if stamp == "php":
+            if created:
+                record.setdefault("create_time", php_time(moment))
+                record.setdefault("create_user_id", 1)
+            record["update_time"] = php_time(moment)
+            record["update_user_id"] = 1
+        elif stamp == "iso":
+            if created:
+                record.setdefault("created_at", iso_time(moment))
+            record["updated_at"] = iso_time(moment)
+        return record
+
+    def insert(self, name, data):
+        with self._lock:
+            record = dict(self.collections[name].defaults)
+            record.update(data)
+            record["id"] = self._next_id[name]
+            self._next_id[name] += 1
+            self._put(name, self._stamp(name, record, created=True))
+            return record
+
+    def find(self, name, value, key="id", deleted=False):
+        """Запись по ключу; мягко удалённые — только при deleted=True"""
+        with self._lock:
+            if key == "id":
+                record = self._tables[name].get(value)
+            else:
+                record = next((r for r in self._tables[name].values() if str(r.get(key)) == str(value)), None)
+            if record is not None and record.get("deleted_at") and not deleted:
+                return None
+            return record
+
+    def update(self, name, record_id, data):
+        with self._lock:
+            record = self.find(name, record_id)
+            if record is None:
+                return None
+            record.update({k: v for k, v in data.items() if k != "id"})
+            return self._stamp(name, record, created=False)
+
+    def delete(self, name, record_id):
+        with self._lock:
+            if not self.collections[name].soft_delete:
+                return self._tables[name].pop(record_id, None) is not None
+            record = self.find(name, record_id)
+            if record is None:
+                return False
+            record["deleted_at"] = php_time(self.clock.tick())
+            return True
+
+    def rows(self, name):
+        """Записи таблицы без мягко удалённых"""
+        with self._lock:
+            return [r for r in self._tables[name].values() if not r.get("deleted_at")]
+
+    def expand(self, name, record, depth=EXPAND_DEPTH):
+        """Копия записи со вложенными объектами связей и без скрытых полей"""
+        collection = self.collections[name]
+        result = {k: copy.deepcopy(v) for k, v in record.items() if k not in collection.hidden}
+        if depth <= 0:
+            return result
+        for field, target, embed, project in collection.relations:
+            related = self.find(target, _as_int(record.get(field)), deleted=True)
+            if related is not None:
+                related = self.expand(target, related, depth - 1)
+                if project:
+                    related = project(related)
+            result[embed] = related
+        return result
+
+    def select(self, name, query, rows=None):
+        """Развёрнутые записи списка, отфильтрованные по query-параметрам"""
+        filters = self.collections[name].filters
+        result = []
+        for record in self.rows(name) if rows is None else rows:
+            expanded = self.expand(name, record)
+            if all(_matches(expanded, filters[param], value) for param, value in query.items() if param in filters):
+                result.append(expanded)
+        return result
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _lookup(record, path):
+    value = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _matches(record, spec, expected):
+    path, op = spec
+    actual = _lookup(record, path)
+    if actual is None:
+        return False
+    if op == "contains":
+        return str(expected).lower() in str(actual).lower()
+    if op == "gte":
+        return str(actual) >= str(expected)
+    if op == "lte":
+        return str(actual) <= str(expected)
+    return str(actual) == str(expected)
+
+
+def _parse_date(value, fmt):
+    try:
+        return datetime.strptime(value, fmt).date()
+    except (TypeError, ValueError):
+        raise StandinError(400, f"Некорректная дата: {value}")
+
+
+class Api:
+    """Маршрутизация запросов /api/v1/* по описанию COLLECTIONS"""
+
+    def __init__(self, store=None):
+        self.store = store or Store()
+        self.routes = []
+        self._route("POST", r"tocken", self.token)
+        self._route("POST", r"user_organization_link", self.create_from_query("user_organization_link"))
+        self._route("GET", r"resource_atoms", self.resource_atoms)
+        self._route("GET", r"report_organization/(\d+)", self.report_organization)
+        self._route("GET", r"billing/service_history/(\d+)", self.by_service("billing_service_history"))
+        self._route("GET", r"billing/service_parametrs_history/(\d+)", self.by_service("billing_service_parameter_history"))
+        self._route("POST", r"billing/services_parameters_copy/(\d+)", self.copy_parameters)
+        self._route("GET", r"pre_billing/reports/(total|atom_total|ip_address)", self.pre_billing_report)
+        for name, collection in COLLECTIONS.items():
+            if collection.create:
+                self._route("POST", re.escape(collection.create), self.create(name))
+            for path in collection.lists:
+                self._route("GET", re.escape(path), self.list(name))
+            if collection.item:
+                for method in collection.methods:
+                    handler = {"GET": self.read, "PUT": self.update, "DELETE": self.delete}[method]
+                    self._route(method, re.escape(collection.item) + r"/([^/]+)", handler(name))
+
+    def _route(self, method, pattern, handler):
+        self.routes.append((method, re.compile(pattern + "$"), handler))
+
+    def handle(self, method, path, query, body, headers):
+        """Возвращает (статус, тело ответа)"""
+        if not path.startswith(API_PREFIX):
+            return 404, {"error": "route - not found"}
+        route = path[len(API_PREFIX):].strip("/")
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(route)
+            if route_method != method or not match:
+                continue
+            if handler != self.token and not headers.get("tockenid"):
+                return 401, {"error": "tocken - not found"}
+            try:
+                return 200, handler(query, body, *match.groups())
+            except StandinError as e:
+                return e.status, {"error": e.message}
+        return 500, {"error": "method - not found", "error_launcher": f"{method} {path}"}
+
+    # --- Обобщённые обработчики CRUD
+
+    def _record_id(self, raw):
+        try:
+            return int(raw)
+        except ValueError:
+            raise StandinError(400, f"id - not valid: {raw}")
+
+    def _existing(self, name, raw, deleted=False):
+        collection = COLLECTIONS[name]
+        value = self._record_id(raw)
+        record = self.store.find(name, value, collection.key, deleted)
+        if record is None:
+            raise StandinError(collection.missing_status, f"{name} {value} - not found")
+        return record
+
+    def create(self, name):
+        def handler(query, body):
+            if not isinstance(body, dict):
+                raise StandinError(400, "body - not valid")
+            return self.store.expand(name, self.store.insert(name, body))
+        return handler
+
+    def create_from_query(self, name):
+        def handler(query, body):
+            data = {key: _as_int(value) for key, value in query.items()}
+            if isinstance(body, dict):
+                data.update(body)
+            return self.store.expand(name, self.store.insert(name, data))
+        return handler
+
+    def read(self, name):
+        def handler(query, body, raw_id):
+            return self.store.expand(name, self._existing(name, raw_id))
+        return handler
+
+    def update(self, name):
+        def handler(query, body, raw_id):
+            if not isinstance(body, dict):
+                raise StandinError(400, "body - not valid")
+            record = self._existing(name, raw_id)
+            return self.store.expand(name, self.store.update(name, record["id"], body))
+        return handler
+
+    def delete(self, name):
+        def handler(query, body, raw_id):
+            record = self._existing(name, raw_id)
+            self.store.delete(name, record["id"])
+            return COLLECTIONS[name].deleted
+        return handler
+
+    def list(self, name):
+        def handler(query, body):
+            return self.store.select(name, query)
+        return handler
+
+    # --- Эндпоинты с собственной логикой
+
+    def token(self, query, body):
+        if not query.get("login") or not query.get("password"):
+            raise StandinError(400, "login/password - not found")
+        return {"tockenID": secrets.token_hex(16)}
+
+    def resource_atoms(self, query, body):
+        """Атомы с параметрами их связей с пулами (атом без связи — одной строкой)"""
+        links = {}
+        for link in self.store.rows("resource_pool_link_atom"):
+            links.setdefault(link["atom_id"], []).append(link)
+        rows = []
+        for atom in self.store.rows("resource_atom"):
+            atom_row = self.store.expand("resource_atom", atom)
+            for link in links.get(atom["id"], [None]):
+                row = dict(atom_row)
+                row.update({
+                    "pool_id": link and link["pool_id"],
+                    "link_id": link and link["id"],
+                    "min_count": link["min_count"] if link else 0,
+                    "max_count": link["max_count"] if link else 0,
+                    "cost_price_active": link["cost_price_active"] if link else 0,
+                    "cost_price_passive": link["cost_price_passive"] if link else 0,
+                    "type_use": link["type_use"] if link else 0,
+                })
+                rows.append(row)
+        filters = {"by_pool_id": ("pool_id", "eq"), "by_category_id": ("category_id", "eq")}
+        return [row for row in rows
+                if all(_matches(row, filters[p], v) for p, v in query.items() if p in filters)]
+
+    def by_service(self, name):
+        def handler(query, body, service_id):
+            return [self.store.expand(name, r) for r in self.store.rows(name) if r["service_id"] == int(service_id)]
+        return handler
+
+    def copy_parameters(self, query, body, service_id):
+        source = (body or {}).get("service_copy_id")
+        copied = [
+            self.store.insert("billing_service_parameter", {"service_id": int(service_id), "name": p["name"], "value": p["value"]})
+            for p in self.store.rows("billing_service_parameter") if p["service_id"] == _as_int(source)
+        ]
+        return {"service_id": int(service_id), "copied": len(copied)}
+
+    def _manual_items(self, organization_id, begin, end):
+        items = []
+        for item in self.store.rows("pre_billing_manual"):
+            if str(item.get("org_id")) != str(organization_id):
+                continue
+            started = _parse_date(item.get("record_start_date"), "%Y-%m-%d")
+            if begin <= started <= end:
+                items.append(item)
+        return items
+
+    def _atom_name(self, atom_id):
+        atom = self.store.find("resource_atom", _as_int(atom_id))
+        return atom["name"] if atom else str(atom_id)
+
+    def _unit_name(self, unit_id):
+        unit = self.store.find("resource_unit_measure", _as_int(unit_id))
+        return unit["name"] if unit else ""
+
+    def report_organization(self, query, body, organization_id):
+        """Отчёт по услугам организации за период (даты в формате ДД.ММ.ГГГГ)"""
+        # Отчёт строится и по удалённой организации: удаление на стенде мягкое
+        organization = self._existing("organization", organization_id, deleted=True)
+        begin = _parse_date(query.get("begin_date"), "%d.%m.%Y")
+        end = _parse_date(query.get("end_date"), "%d.%m.%Y")
+        totals = {}
+        for item in self._manual_items(organization["id"], begin, end):
+            row = totals.setdefault(item["resource_atom_id"], {
+                "service_id": item["resource_atom_id"],
+                "name": self._atom_name(item["resource_atom_id"]),
+                "quantity": 0,
+                "unit": self._unit_name(item.get("unit_measure_id")),
+                "cost": 0,
+            })
+            row["quantity"] += item.get("quantity", 0)
+            row["cost"] += item.get("quantity", 0) * item.get("price", 0)
+        return {
+            "header": {
+                "$organization": self.store.expand("organization", organization, depth=0),
+                "report_type": query.get("report_type"),
+                "begin_date": query.get("begin_date"),
+                "end_date": query.get("end_date"),
+            },
+            "items": list(totals.values()),
+        }
+
+    def pre_billing_report(self, query, body, kind):
+        begin = _parse_date(query.get("start_date"), "%Y-%m-%d")
+        end = _parse_date(query.get("end_date"), "%Y-%m-%d")
+        items = self._manual_items(query.get("organization_id"), begin, end)
+        if kind == "ip_address":
+            return []
+        if kind == "total":
+            return {
+                "organization_id": _as_int(query.get("organization_id")),
+                "start_date": query.get("start_date"),
+                "end_date": query.get("end_date"),
+                "total": sum(i.get("quantity", 0) * i.get("price", 0) for i in items),
+            }
+        totals = {}
+        for item in items:
+            row = totals.setdefault(item["resource_atom_id"], {
+                "resource_atom_id": item["resource_atom_id"],
+                "name": self._atom_name(item["resource_atom_id"]),
+                "total": 0,
+            })
+            row["total"] += item.get("quantity", 0) * item.get("price", 0)
+        return list(totals.values())
+
+
+class Stats:
+    """Число запросов и суммарное время их обработки сервером"""
+
+    def __init__(self):
+        self.requests = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self.requests += 1
+            self.seconds += seconds
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными записями: без TCP_NODELAY каждый
+    # ответ keep-alive ждёт delayed ACK клиента (~40 мс)
+    disable_nagle_algorithm = True
+    api = None
+    stats = None
+
+    def _dispatch(self):
+        started = time.perf_counter()
+        parts = urlsplit(self.path)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            status, payload = 400, {"error": "body - not valid json"}
+        else:
+            status, payload = self.api.handle(self.command, parts.path, query, body, headers)
+
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.stats.add(time.perf_counter() - started)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandinServer:
+    """HTTP-сервер заменителя в фоновом потоке"""
+
+    def __init__(self, host="127.0.0.1", port=0, store=None):
+        self.stats = Stats()
+        handler = type("Handler", (_Handler,), {"api": Api(store), "stats": self.stats})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+
+def export_env(url):
+    """Направляет на заменитель переменные окружения текущего процесса"""
+    os.environ["API_URL"] = url
+    os.environ.update(ENV)
+    for name, value in CREDENTIALS.items():
+        os.environ.setdefault(name, value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Локальный заменитель API /api/v1/*")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+
+    server = StandinServer(args.host, args.port)
+    print(f"Заменитель API: {server.url}")
+    print("Переменные окружения для прогона:")
+    for name, value in {"API_URL": server.url, **CREDENTIALS, **ENV}.items():
+        print(f"  {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Профиль запуска pytest: время до сбора и время сбора каждого модуля тестов.
+
+Запуск — время по часам от старта процесса до начала сбора: интерпретатор,
+плагины pytest и conftest.py (старт процесса берётся из /proc; где его нет —
+от импорта этого модуля). Сбор модуля — импорт файла теста (с переписыванием
+assert) и построение его тестов. Превышение бюджета --startup-budget
+(запуск + сбор, секунды) делает прогон неуспешным:
+
+    pytest tests --collect-only --collect-profile --startup-budget=3
+
+При параллельном запуске модули собирает каждый воркер; в профиль попадает
+самый медленный из них.
+"""
+
+import os
+import time
+
+import pytest
+
+# Запасная точка отсчёта запуска, если время старта процесса недоступно
+_IMPORTED = time.time()
+
+
+def process_started():
+    """Время старта процесса по часам (как time.time()) из /proc или None"""
+    try:
+        since_boot = time.clock_gettime(time.CLOCK_BOOTTIME)
+        with open(f"/proc/{os.getpid()}/stat") as stat:
+            # Поле 22 (starttime) после имени процесса в скобках — в тиках от загрузки
+            ticks = float(stat.read().rpartition(")")[2].split()[19])
+        return time.time() - (since_boot - ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class CollectionProfile:
+    """Плагин pytest: замеры запуска и сбора по модулям"""
+
+    def __init__(self, budget=0.0):
+        self.budget = budget
+        self.startup = 0.0
+        self.collection = 0.0
+        self.modules = {}
+        self._started = None
+
+    @property
+    def total(self):
+        return self.startup + self.collection
+
+    @property
+    def over_budget(self):
+        return bool(self.budget) and self.total > self.budget
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_collection(self, session):
+        self._started = time.time()
+        self.startup = self._started - (process_started() or _IMPORTED)
+        yield
+        self.collection = time.time() - self._started
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector):
+        if not isinstance(collector, pytest.Module):
+            yield
+            return
+        started = time.perf_counter()
+        yield
+        self.modules[collector.nodeid] = time.perf_counter() - started
+
+    def export(self):
+        return {"startup": self.startup, "collection": self.collection, "modules": self.modules}
+
+    def merge(self, data):
+        """Профиль воркера: остаётся самый медленный сбор"""
+        if data and data["startup"] + data["collection"] > self.total:
+            self.startup = data["startup"]
+            self.collection = data["collection"]
+            self.modules = dict(data["modules"])
+
+    def format(self, limit=15):
+        lines = [
+            f"Запуск (интерпретатор, плагины, conftest): {self.startup:.2f} с",
+            f"Сбор тестов: {self.collection:.2f} с, модулей: {len(self.modules)}",
+        ]
+        slowest = sorted(self.modules.items(), key=lambda item: -item[1])[:limit]
+        if slowest:
+            lines.append(f"Самые медленные модули (импорт и сбор), первые {len(slowest)}:")
+            lines.extend(f"  {seconds * 1000:8.1f} мс  {nodeid}" for nodeid, seconds in slowest)
+        if self.budget:
+            verdict = "превышен" if self.over_budget else "в пределах"
+            lines.append(f"Бюджет запуска {self.budget:.2f} с {verdict}: {self.total:.2f} с")
+        return lines
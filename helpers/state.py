@@ -0,0 +1,120 @@
+"""Общее состояние прогона: ID созданных сущностей, которые передаются между тестами.
+
+В одном процессе значения хранятся в памяти. При параллельном запуске хранилище
+живёт в управляющем процессе pytest и доступно воркерам через локальный сокет
+(multiprocessing.managers). Ключа нет в хранилище — берётся значение из
+окружения (.env), как раньше.
+"""
+
+import json
+import os
+import threading
+from functools import cache
+
+
+class StateStore:
+    """Потокобезопасное хранилище ключ/значение"""
+
+    def __init__(self, initial=None):
+        self._data = dict(initial or {})
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        with self._lock:
+            return key in self._data, self._data.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def increment(self, key, amount=1, start=0):
+        """Атомарно увеличивает счётчик; возвращает значение до увеличения"""
+        with self._lock:
+            value = self._data.get(key, start)
+            self._data[key] = value + amount
+            return value
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._data)
+
+
+class RunState:
+    """API для тестов: чтение и запись общих значений прогона"""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def get(self, key, default=None):
+        """Значение из хранилища, иначе из окружения (.env)"""
+        found, value = self._backend.lookup(key)
+        if found:
+            return value
+        return os.getenv(key, default)
+
+    def set(self, key, value):
+        self._backend.set(key, value)
+
+    def delete(self, key):
+        self._backend.delete(key)
+
+    def increment(self, key, amount=1, start=0):
+        return self._backend.increment(key, amount, start)
+
+    def snapshot(self):
+        return self._backend.snapshot()
+
+
+@cache
+def _managers():
+    """Классы менеджеров; multiprocessing нужен только при параллельном запуске"""
+    from multiprocessing.managers import BaseManager
+
+    class _StateServer(BaseManager):
+        pass
+
+    class _StateClient(BaseManager):
+        pass
+
+    _StateClient.register("store")
+    return _StateServer, _StateClient
+
+
+def serve(store):
+    """Открывает доступ к хранилищу для воркеров; возвращает (адрес, ключ)"""
+    _StateServer, _ = _managers()
+    authkey = os.urandom(16)
+    _StateServer.register("store", callable=lambda: store)
+    manager = _StateServer(address=("127.0.0.1", 0), authkey=authkey)
+    server = manager.get_server()
+    threading.Thread(target=server.serve_forever, name="run-state", daemon=True).start()
+    host, port = server.address
+    return f"{host}:{port}", authkey.hex()
+
+
+def connect(address, authkey):
+    """Подключается к хранилищу управляющего процесса"""
+    _, _StateClient = _managers()
+    host, port = address.rsplit(":", 1)
+    manager = _StateClient(address=(host, int(port)), authkey=bytes.fromhex(authkey))
+    manager.connect()
+    return RunState(manager.store())
+
+
+def load(path):
+    """Начальные значения из JSON-файла прошлого прогона (если он есть)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def dump(state, path):
+    """Сохраняет состояние прогона в JSON-файл"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state.snapshot(), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,130 @@
+"""Потоковый разбор JSON-массива из тела ответа.
+
+Ответ запрашивается с stream=True и читается из сокета кусками по
+chunk_size байт; элементы массива разбираются по одному и сразу отдаются
+проверкам и агрегаторам. В памяти держится только текущий кусок и
+разбираемый элемент — пиковое потребление не зависит от длины списка.
+
+    response = requests.get(url, headers=headers, params=params, stream=True)
+    items = ArrayStream(response, keep=20)
+    for atom in items:
+        ...
+    items.count, items.bytes, items.sample  # всего элементов, байт, первые 20
+"""
+
+import codecs
+import json
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\r\n"
+_AFTER_VALUE = ",]" + _WHITESPACE
+
+
+class StreamError(ValueError):
+    """Тело ответа не является корректным JSON-массивом"""
+
+
+class ArrayStream:
+    """Итератор по элементам JSON-массива из ответа requests (stream=True)"""
+
+    def __init__(self, response, chunk_size=DEFAULT_CHUNK_SIZE, keep=0):
+        self.response = response
+        self.count = 0
+        self.bytes = 0
+        self.keep = keep
+        self.sample = []
+        self._chunks = response.iter_content(chunk_size)
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._started = False
+
+    def __iter__(self):
+        if self._started:
+            raise StreamError("Тело ответа уже прочитано")
+        self._started = True
+        try:
+            yield from self._items()
+        finally:
+            # Соединение возвращается в пул и при досрочном выходе из цикла
+            self.response.close()
+
+    def _fill(self):
+        """Дочитывает следующий кусок; False — тело закончилось"""
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            chunk = b""
+        self.bytes += len(chunk)
+        self._buffer = self._buffer[self._pos:] + self._decode(chunk, final=self._eof)
+        self._pos = 0
+        return bool(chunk) or not self._eof
+
+    def _peek(self):
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, allowed):
+        # Быстрый путь: разделитель сразу за элементом, без пробелов
+        if self._pos < len(self._buffer) and self._buffer[self._pos] in allowed:
+            char = self._buffer[self._pos]
+            self._pos += 1
+            return char
+        char = self._peek()
+        if not char or char not in allowed:
+            found = repr(char) if char else "конец данных"
+            raise StreamError(f"Ожидалось {' или '.join(repr(c) for c in allowed)}, получено {found}")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        if self._pos >= len(self._buffer) or self._buffer[self._pos] in _WHITESPACE:
+            self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if not self._fill():
+                    raise StreamError(f"Некорректный JSON в элементе {self.count}: {e.msg}") from e
+                continue
+            # Число на границе куска могло прочитаться не целиком ("2." или "1e"):
+            # за элементом должен идти разделитель, иначе дочитываем
+            complete = end < len(self._buffer) and self._buffer[end] in _AFTER_VALUE
+            if not complete and not self._eof:
+                # _fill сдвигает буфер: элемент разбирается заново с начала
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _items(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+        else:
+            while True:
+                item = self._value()
+                if len(self.sample) < self.keep:
+                    self.sample.append(item)
+                self.count += 1
+                yield item
+                if self._expect(",]") == "]":
+                    break
+        if self._peek():
+            raise StreamError("Лишние данные после JSON-массива")
+
+
+def iter_array(response, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Элементы JSON-массива из ответа по одному"""
+    return iter(ArrayStream(response, chunk_size))
@@ -0,0 +1,160 @@
+"""Замер времени вызовов API на уровне транспорта.
+
+Каждый запрос через общий пул api_client записывается как (метод, шаблон
+маршрута, статус, байты ответа, время). Числовые сегменты пути заменяются на
+{id}: /api/v1/resource_pool/442 -> /api/v1/resource_pool/{id}. В конце прогона
+выводится таблица эндпоинтов (самые медленные по p95 — сверху) и JSON-файл
+для сравнения прогонов.
+"""
+
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter
+
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8}-[0-9a-f-]{27}|[0-9a-f]{24,})$", re.IGNORECASE)
+
+
+def percentile(ordered, q):
+    """Перцентиль по рангу (nearest-rank) отсортированного списка"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-q * len(ordered) // 100))
+    return ordered[int(rank) - 1]
+
+
+def route_template(url):
+    """Путь запроса без query-параметров, ID заменены на {id}"""
+    path = urlsplit(url).path
+    return "/".join("{id}" if _ID_SEGMENT.match(part) else part for part in path.split("/"))
+
+
+class Timings:
+    """Накопленные замеры по эндпоинтам (потокобезопасно)"""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def add(self, method, route, status, size, seconds):
+        with self._lock:
+            endpoint = self._endpoints.setdefault(
+                (method, route), {"durations": [], "bytes": 0, "statuses": {}}
+            )
+            endpoint["durations"].append(seconds)
+            endpoint["bytes"] += size
+            endpoint["statuses"][str(status)] = endpoint["statuses"].get(str(status), 0) + 1
+
+    def export(self):
+        """Сырые замеры в виде, пригодном для передачи от воркера xdist"""
+        with self._lock:
+            return [
+                {"method": method, "route": route, **endpoint}
+                for (method, route), endpoint in self._endpoints.items()
+            ]
+
+    def merge(self, exported):
+        with self._lock:
+            for item in exported:
+                endpoint = self._endpoints.setdefault(
+                    (item["method"], item["route"]), {"durations": [], "bytes": 0, "statuses": {}}
+                )
+                endpoint["durations"].extend(item["durations"])
+                endpoint["bytes"] += item["bytes"]
+                for status, count in item["statuses"].items():
+                    endpoint["statuses"][status] = endpoint["statuses"].get(status, 0) + count
+
+    def __bool__(self):
+        return bool(self._endpoints)
+
+    def summary(self):
+        """Строки по эндпоинтам, отсортированные по убыванию p95"""
+        rows = []
+        for item in self.export():
+            ordered = sorted(item["durations"])
+            errors = sum(
+                count for status, count in item["statuses"].items()
+                if not status.isdigit() or int(status) >= 400
+            )
+            rows.append({
+                "method": item["method"],
+                "route": item["route"],
+                "calls": len(ordered),
+                "errors": errors,
+                "statuses": item["statuses"],
+                "bytes": item["bytes"],
+                "total_ms": round(sum(ordered) * 1000, 3),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+            })
+        return sorted(rows, key=lambda row: (-row["p95_ms"], row["route"]))
+
+
+def format_table(rows, limit=None):
+    shown = rows[:limit] if limit else rows
+    width = max([len(f"{row['method']} {row['route']}") for row in shown] + [8])
+    lines = [
+        f"{'Эндпоинт':<{width}}  {'Вызовов':>7}  {'Ошибок':>6}  {'p50, мс':>8}  "
+        f"{'p95, мс':>8}  {'max, мс':>8}  {'Всего, мс':>10}  {'Байт':>10}"
+    ]
+    for row in shown:
+        lines.append(
+            f"{row['method'] + ' ' + row['route']:<{width}}  {row['calls']:>7}  {row['errors']:>6}  "
+            f"{row['p50_ms']:>8.1f}  {row['p95_ms']:>8.1f}  {row['max_ms']:>8.1f}  "
+            f"{row['total_ms']:>10.1f}  {row['bytes']:>10}"
+        )
+    if limit and len(rows) > limit:
+        lines.append(f"… ещё {len(rows) - limit} эндпоинтов — полный список в JSON-отчёте")
+    return lines
+
+
+def write_json(rows, path):
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "calls": sum(row["calls"] for row in rows),
+        "endpoints": rows,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+class TimingAdapter(BaseAdapter):
+    """Адаптер-обёртка: замеряет время запроса до получения тела ответа"""
+
+    def __init__(self, inner, timings):
+        super().__init__()
+        self.inner = inner
+        self.timings = timings
+
+    def send(self, request, **kwargs):
+        route = route_template(request.url)
+        started = time.perf_counter()
+        try:
+            response = self.inner.send(request, **kwargs)
+        except Exception as e:
+            self.timings.add(request.method, route, type(e).__name__, 0, time.perf_counter() - started)
+            raise
+        if kwargs.get("stream"):
+            size = int(response.headers.get("Content-Length") or 0)
+        else:
+            size = len(response.content)
+        self.timings.add(request.method, route, response.status_code, size, time.perf_counter() - started)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+def install(session, timings):
+    """Подключает замер ко всем запросам сессии requests"""
+    adapter = TimingAdapter(session.get_adapter("http://"), timings)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
@@ -0,0 +1,302 @@
+"""Сжатие ответов, условные GET и объём трафика API по эндпоинтам.
+
+Адаптер-обёртка на общем пуле api_client:
+
+- сессия объявляет в Accept-Encoding все кодировки, которые умеет
+  распаковывать urllib3 (gzip, deflate; br и zstd — если установлены brotli и
+  zstandard); API_ACCEPT_ENCODING задаёт список явно;
+- кэш валидаторов: ответ GET 200 с ETag или Last-Modified запоминается, и
+  следующий такой же GET уходит с If-None-Match / If-Modified-Since. На 304
+  тест получает запомненный ответ со статусом 200 — для тестов ничего не
+  меняется, а тело по сети не передаётся. По умолчанию только для
+  справочников (--validator-cache=reference), all — для всех GET, off —
+  выключен. Любой изменяющий запрос сбрасывает записи по тому же правилу,
+  что и helpers/memo.py: ресурс, вложенные и родительские пути, все списки;
+- для каждого эндпоинта считаются байты по сети (до распаковки) и после
+  распаковки, число сжатых ответов, ответов с валидаторами и ответов 304.
+
+Сводка в конце прогона показывает, поддерживает ли стенд сжатие и условные
+запросы и сколько трафика расходует прогон. Потоковые ответы (stream=True)
+учитываются при дочитывании или закрытии и в кэш валидаторов не попадают.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.request import ACCEPT_ENCODING
+
+from config import ENV_FILE
+from helpers.memo import stale_after_write
+from helpers.refdata import API_PREFIX, REFERENCE_ENDPOINTS
+from helpers.timing import route_template
+
+MODES = ("off", "reference", "all")
+
+# Редко меняющиеся справочники: для них условные GET включены по умолчанию
+REFERENCE_PATHS = frozenset(
+    API_PREFIX + endpoint for endpoint in (*REFERENCE_ENDPOINTS, "resource_types_ref")
+)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_KEY_HEADERS = ("tockenid", "accept")
+_FIELDS = ("responses", "wire_bytes", "decoded_bytes", "compressed", "validators", "not_modified", "saved_bytes")
+
+
+def accept_encoding():
+    """Значение Accept-Encoding: API_ACCEPT_ENCODING или всё, что распаковывает urllib3"""
+    load_dotenv(ENV_FILE)
+    return os.getenv("API_ACCEPT_ENCODING") or ", ".join(ACCEPT_ENCODING.split(","))
+
+
+class Traffic:
+    """Байты по сети и после распаковки, сжатие и 304 по эндпоинтам (потокобезопасно)"""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def add(self, route, **counts):
+        with self._lock:
+            target = self._routes.setdefault(route, dict.fromkeys(_FIELDS, 0))
+            for field, amount in counts.items():
+                target[field] += amount
+
+    def export(self):
+        with self._lock:
+            return {route: dict(counts) for route, counts in self._routes.items()}
+
+    def merge(self, exported):
+        for route, counts in (exported or {}).items():
+            self.add(route, **counts)
+
+    def __bool__(self):
+        with self._lock:
+            return bool(self._routes)
+
+    def format(self, limit=15):
+        rows = self.export()
+        totals = {field: sum(counts[field] for counts in rows.values()) for field in _FIELDS}
+        ratio = totals["wire_bytes"] / totals["decoded_bytes"] if totals["decoded_bytes"] else 1.0
+        lines = [
+            f"Ответов: {totals['responses']}, по сети: {_size(totals['wire_bytes'])}, "
+            f"после распаковки: {_size(totals['decoded_bytes'])} (доля {ratio:.0%})",
+            f"Сжатых ответов: {totals['compressed']}, с ETag/Last-Modified: {totals['validators']}, "
+            f"304 Not Modified: {totals['not_modified']} (не передано {_size(totals['saved_bytes'])})",
+        ]
+        if totals["responses"] and not totals["compressed"]:
+            lines.append("Стенд не сжимает ответы (Content-Encoding не приходит)")
+        if totals["responses"] and not totals["validators"]:
+            lines.append("Стенд не отдаёт ETag/Last-Modified: условные запросы не используются")
+        heaviest = sorted(rows.items(), key=lambda item: -item[1]["wire_bytes"])[:limit]
+        for route, counts in heaviest:
+            lines.append(
+                f"  {route:<50} по сети {_size(counts['wire_bytes']):>10}  "
+                f"распаковано {_size(counts['decoded_bytes']):>10}  304 {counts['not_modified']:>4}"
+            )
+        return lines
+
+
+def _size(count):
+    for unit in ("Б", "КБ", "МБ"):
+        if count < 1024 or unit == "МБ":
+            return f"{count:.0f} {unit}" if unit == "Б" else f"{count:.1f} {unit}"
+        count /= 1024
+
+
+class ValidatorCache:
+    """Ответы GET с ETag/Last-Modified, не больше max_bytes тел (LRU)"""
+
+    def __init__(self, paths=REFERENCE_PATHS, max_bytes=DEFAULT_MAX_BYTES):
+        self.paths = paths
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        size = len(entry["content"])
+        with self._lock:
+            self._drop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def discard(self, key):
+        with self._lock:
+            self._drop(key)
+
+    def invalidate(self, written):
+        """Сбрасывает записи, которые мог изменить запрос к written (правило helpers.memo)"""
+        with self._lock:
+            for key in [key for key in self._entries if stale_after_write(key[1], written)]:
+                self._drop(key)
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry["content"])
+
+
+def _key(request):
+    parts = urlsplit(request.url)
+    return parts.netloc, parts.path, parts.query, tuple(request.headers.get(name) for name in _KEY_HEADERS)
+
+
+def _validators(headers):
+    return {name: headers[name] for name in ("ETag", "Last-Modified") if headers.get(name)}
+
+
+def _wire_bytes(response):
+    tell = getattr(response.raw, "tell", None)
+    return tell() if tell is not None else None
+
+
+class TrafficAdapter(BaseAdapter):
+    """Адаптер-обёртка: условные GET по кэшу валидаторов и учёт байтов"""
+
+    def __init__(self, inner, traffic, cache=None):
+        super().__init__()
+        self.inner = inner
+        self.traffic = traffic
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        route = route_template(request.url)
+        if self.cache is not None and request.method != "GET":
+            try:
+                return self._send(request, route, kwargs)
+            finally:
+                self.cache.invalidate(urlsplit(request.url).path.rstrip("/"))
+        return self._send(request, route, kwargs)
+
+    def _send(self, request, route, kwargs):
+        stream = kwargs.get("stream")
+        cacheable = (
+            self.cache is not None and request.method == "GET" and not stream
+            and (self.cache.paths is None or urlsplit(request.url).path.rstrip("/") in self.cache.paths)
+        )
+        key = entry = None
+        if cacheable and not any(name in request.headers for name in ("If-None-Match", "If-Modified-Since")):
+            key = _key(request)
+            entry = self.cache.get(key)
+            if entry is not None:
+                if "ETag" in entry["validators"]:
+                    request.headers["If-None-Match"] = entry["validators"]["ETag"]
+                if "Last-Modified" in entry["validators"]:
+                    request.headers["If-Modified-Since"] = entry["validators"]["Last-Modified"]
+
+        response = self.inner.send(request, **kwargs)
+        if stream:
+            self._track_stream(response, route)
+            return response
+
+        content = response.content
+        wire = _wire_bytes(response)
+        validators = _validators(response.headers)
+        self.traffic.add(
+            route,
+            responses=1,
+            wire_bytes=len(content) if wire is None else wire,
+            decoded_bytes=len(content),
+            compressed=int(bool(response.headers.get("Content-Encoding"))),
+            validators=int(bool(validators)),
+        )
+        if key is None:
+            return response
+        if response.status_code == 304 and entry is not None:
+            self.traffic.add(route, not_modified=1, saved_bytes=len(entry["content"]))
+            return _revalidated(entry, response, request)
+        if response.status_code == 200 and validators:
+            self.cache.put(key, {
+                "validators": validators,
+                "reason": response.reason,
+                "headers": dict(response.headers),
+                "encoding": response.encoding,
+                "content": content,
+            })
+        else:
+            self.cache.discard(key)
+        return response
+
+    def _track_stream(self, response, route):
+        """Потоковый ответ учитывается, когда тело дочитано или соединение закрыто"""
+        iter_content, close = response.iter_content, response.close
+        decoded = [0]
+        recorded = []
+
+        def record():
+            if recorded:
+                return
+            recorded.append(True)
+            wire = _wire_bytes(response)
+            self.traffic.add(
+                route,
+                responses=1,
+                wire_bytes=decoded[0] if wire is None else wire,
+                decoded_bytes=decoded[0],
+                compressed=int(bool(response.headers.get("Content-Encoding"))),
+                validators=int(bool(_validators(response.headers))),
+            )
+
+        def counting(*args, **kwargs):
+            try:
+                for chunk in iter_content(*args, **kwargs):
+                    decoded[0] += len(chunk)
+                    yield chunk
+            finally:
+                record()
+
+        def closing():
+            record()
+            close()
+
+        response.iter_content = counting
+        response.close = closing
+
+    def close(self):
+        self.inner.close()
+
+
+def _revalidated(entry, not_modified, request):
+    """Ответ 200 из кэша валидаторов в ответ на 304"""
+    headers = CaseInsensitiveDict(entry["headers"])
+    # 304 несёт актуальные валидаторы и Date
+    headers.update({k: v for k, v in not_modified.headers.items() if k.lower() != "content-length"})
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = entry["reason"]
+    response.headers = headers
+    response.encoding = entry["encoding"]
+    response.url = request.url
+    response.request = request
+    response.elapsed = not_modified.elapsed
+    response._content = entry["content"]
+    response._content_consumed = True
+    not_modified.close()
+    return response
+
+
+def install(session, traffic, cache=None):
+    """Подключает сжатие, кэш валидаторов и учёт трафика к сессии requests"""
+    session.headers["Accept-Encoding"] = accept_encoding()
+    adapter = TrafficAdapter(session.get_adapter("http://"), traffic, cache)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
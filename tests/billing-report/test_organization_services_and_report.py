@@ -3,74 +3,26 @@ import pytest
 import requests
 import allure
 from datetime import datetime, timedelta, date
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
 import json
 import random
 
+from helpers import dataset, seeding
+from helpers.logsink import LogSink
+from config import ENV_FILE
 
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 CREATED_ORGANIZATION_ID = None
 
-NUM_SERVICES_TOTAL = 10
+CATALOG_SIZE = 10
 CURRENT_MONTH = datetime.now().month
 CURRENT_YEAR = datetime.now().year
 
 LOG_FILE_PATH = "organization_creation.log"
 
-last_used_date = None
-
-@allure.step("Получение токена аутентификации")
-def get_auth_token(base_url, login, password, timeoutlive, domain):
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {"accept": "application/json"}
-    response = requests.post(url, headers=headers, params=params)
-    response.raise_for_status()
-    return response.json().get("tockenID")
-
-@allure.step("Получение единиц измерения (resource_units_measure)")
-def get_resource_units_measure(base_url, token_id):
-    url = f"{base_url}/api/v1/resource_units_measure"
-    headers = {
-        "accept": "application/json",
-        "tockenid": token_id
-    }
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    return response.json()
-
-@allure.step("Получение типов биллинга (roles_render_billing)")
-def get_billing_roles(base_url, token_id):
-    url = f"{base_url}/api/v1/billing/roles_render_billing"
-    headers = {
-        "accept": "application/json",
-        "tockenid": token_id
-    }
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    return response.json()
-
-@allure.step("Получение атомарных ресурсов (resource_atoms)")
-def get_resource_atoms(base_url, token_id):
-    url = f"{base_url}/api/v1/resource_atoms"
-    headers = {
-        "accept": "application/json",
-        "tockenid": token_id
-    }
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    return response.json()
-
-@allure.step("Добавление услуги организации")
 def add_service_to_organization(base_url, token_id, org_id, service_data, record_start_date, record_end_date, quantity, time_val):
+    """Вызывается из потоков пула наполнения: вложения Allure делает тест в порядке плана"""
     url = f"{base_url}/api/v1/pre_billing/manual/items"
     payload = {
         "org_id": org_id,
@@ -92,7 +44,7 @@ def add_service_to_organization(base_url, token_id, org_id, service_data, record
 
     try:
         response = requests.post(url, headers=headers, json=payload)
-        result = {
+        return {
             "success": response.ok,
             "status_code": response.status_code,
             "response_text": response.text,
@@ -100,31 +52,7 @@ def add_service_to_organization(base_url, token_id, org_id, service_data, record
             "headers": headers,
             "url": url
         }
-        if not response.ok:
-            allure.attach(
-                json.dumps(result, ensure_ascii=False, indent=2),
-                name=f"Ошибка добавления услуги '{service_data['name']}'",
-                attachment_type=allure.attachment_type.JSON
-            )
-        else:
-            allure.attach(
-                json.dumps(result, ensure_ascii=False, indent=2),
-                name=f"Успешное добавление услуги '{service_data['name']}'",
-                attachment_type=allure.attachment_type.JSON
-            )
-        return result
     except Exception as e:
-        error_details = {
-            "error": str(e),
-            "payload": payload,
-            "headers": headers,
-            "url": url
-        }
-        allure.attach(
-            json.dumps(error_details, ensure_ascii=False, indent=2),
-            name=f"Исключение при добавлении услуги '{service_data['name']}'",
-            attachment_type=allure.attachment_type.JSON
-        )
         return {
             "success": False,
             "error": str(e),
@@ -133,77 +61,89 @@ def add_service_to_organization(base_url, token_id, org_id, service_data, record
             "url": url
         }
 
+def attach_service_result(service_data, result):
+    if "error" in result:
+        name = f"Исключение при добавлении услуги '{service_data['name']}'"
+    elif not result["success"]:
+        name = f"Ошибка добавления услуги '{service_data['name']}'"
+    else:
+        name = f"Успешное добавление услуги '{service_data['name']}'"
+    allure.attach(
+        json.dumps(result, ensure_ascii=False, indent=2),
+        name=name,
+        attachment_type=allure.attachment_type.JSON
+    )
+
+@pytest.fixture
+def organization_log():
+    """Лог создания организации: пишется пачками в фоне, содержимое доступно без чтения файла"""
+    with LogSink(LOG_FILE_PATH) as log:
+        yield log
+
 @allure.step("Запись в лог-файл")
-def log_message(message, log_file_path=LOG_FILE_PATH):
+def log_message(log, message):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_file_path, "a", encoding="utf-8") as f:
-        f.write(f"[INFO] [{timestamp}] — {message}\n")
+    log.write(f"[INFO] [{timestamp}] — {message}\n")
 
 # @allure.step("Запись заголовка дня в лог")
-def log_day_header(day_str, log_file_path=LOG_FILE_PATH):
-    with open(log_file_path, "a", encoding="utf-8") as f:
-        f.write("\n")
-        f.write("-" * 60 + "\n")
-        f.write(f"[SERVICE LOG] [{day_str}]\n")
-        f.write("-" * 60 + "\n")
+def log_day_header(log, day_str):
+    log.write("\n")
+    log.write("-" * 60 + "\n")
+    log.write(f"[SERVICE LOG] [{day_str}]\n")
+    log.write("-" * 60 + "\n")
 
 # @allure.step("Запись итога дня в лог")
-def log_daily_summary(day_str, service_count, total_amount, log_file_path=LOG_FILE_PATH):
+def log_daily_summary(log, day_str, service_count, total_amount):
     timestamp = f"{day_str} 18:00:00"
-    with open(log_file_path, "a", encoding="utf-8") as f:
-        f.write(f"[SUMMARY] [{timestamp}] — ИТОГО за день: {service_count} услуги | Общая сумма: {total_amount:.2f} руб.\n")
+    log.write(f"[SUMMARY] [{timestamp}] — ИТОГО за день: {service_count} услуги | Общая сумма: {total_amount:.2f} руб.\n")
 
 @allure.step("Запись финального отчёта")
-def log_final_report(start_date, end_date, total_days, total_services, total_amount, avg_daily, failed_services, log_file_path=LOG_FILE_PATH):
+def log_final_report(log, start_date, end_date, total_days, total_services, total_amount, avg_daily, failed_services):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_file_path, "a", encoding="utf-8") as f:
-        f.write("\n")
-        f.write("-" * 60 + "\n")
-        f.write(f"[FINAL SUMMARY] [{timestamp}]\n")
-        f.write("-" * 60 + "\n")
-        f.write(f"[REPORT] За период: {start_date} — {end_date}\n")
-        f.write(f"[REPORT] Всего дней учёта: {total_days}\n")
-        f.write(f"[REPORT] Общее количество попыток услуг: {total_services}\n")
-        f.write(f"[REPORT] Успешно добавлено: {total_services - failed_services}\n")
-        f.write(f"[REPORT] Неудачных попыток: {failed_services}\n")
-        f.write(f"[REPORT] Общая сумма по успешным услугам: {total_amount:.2f} руб.\n")
-        f.write(f"[REPORT] Средняя выручка в день: {avg_daily:.2f} руб.\n")
-        f.write("\n")
-        f.write("[NOTICE] Отчёт успешно сформирован. Данные сохранены в системе учёта.\n")
-        f.write("[END OF LOG]\n")
+    log.write("\n")
+    log.write("-" * 60 + "\n")
+    log.write(f"[FINAL SUMMARY] [{timestamp}]\n")
+    log.write("-" * 60 + "\n")
+    log.write(f"[REPORT] За период: {start_date} — {end_date}\n")
+    log.write(f"[REPORT] Всего дней учёта: {total_days}\n")
+    log.write(f"[REPORT] Общее количество попыток услуг: {total_services}\n")
+    log.write(f"[REPORT] Успешно добавлено: {total_services - failed_services}\n")
+    log.write(f"[REPORT] Неудачных попыток: {failed_services}\n")
+    log.write(f"[REPORT] Общая сумма по успешным услугам: {total_amount:.2f} руб.\n")
+    log.write(f"[REPORT] Средняя выручка в день: {avg_daily:.2f} руб.\n")
+    log.write("\n")
+    log.write("[NOTICE] Отчёт успешно сформирован. Данные сохранены в системе учёта.\n")
+    log.write("[END OF LOG]\n")
 
 @allure.feature("Организации")
-def test_add_services_and_generate_report():
+def test_add_services_and_generate_report(auth_token, run_state, organization_log, reference_data, data_pool):
     """Тест: добавление услуг организации с перерывами не менее 1 дня между ними и генерация отчёта
     Каждая услуга длится 2 дня, между услугами — минимум 1 день перерыва.
+    Услуги планируются заранее и добавляются параллельно (helpers/seeding.py).
     """
-    global CREATED_ORGANIZATION_ID, last_used_date
+    global CREATED_ORGANIZATION_ID
 
-    with open(LOG_FILE_PATH, "w", encoding="utf-8") as f:
-        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"# organization_creation.log\n")
-        f.write(f"# Лог-файл создания организации и учёта оказанных услуг по дням\n")
-        f.write(f"# Сгенерировано: {now_str}\n\n")
-        f.write(f"[INFO] [{now_str}] — Инициализация создания организации...\n")
+    log = organization_log
+    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    log.write(f"# organization_creation.log\n")
+    log.write(f"# Лог-файл создания организации и учёта оказанных услуг по дням\n")
+    log.write(f"# Сгенерировано: {now_str}\n\n")
+    log.write(f"[INFO] [{now_str}] — Инициализация создания организации...\n")
 
     with allure.step("Загрузка данных организации"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
-        CREATED_ORGANIZATION_ID = os.getenv("ORGANIZATION_ID")
+        CREATED_ORGANIZATION_ID = run_state.get("ORGANIZATION_ID")
+        # При запуске теста, а не при импорте модуля: учитываются SEED_* из .env
+        num_services_total, seed_concurrency, seed_rate = seeding.settings()
 
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert CREATED_ORGANIZATION_ID, "ORGANIZATION_ID не найден. Сначала выполните test_create_organization"
 
-        log_message(f"ID организации: {CREATED_ORGANIZATION_ID}")
+        log_message(log, f"ID организации: {CREATED_ORGANIZATION_ID}")
 
     with allure.step("Получение токена авторизации"):
-        token_id = get_auth_token(base_url, login, password, 600, domain)
+        token_id = auth_token
         assert token_id, "Не удалось получить tockenID"
 
     with allure.step("Получение данных организации для лога"):
@@ -212,125 +152,104 @@ def test_add_services_and_generate_report():
             url_org,
             headers={"accept": "application/json", "tockenid": token_id}
         )
-        response.raise_for_status()
-        org_data = response.json()
+        if response.status_code == 404:
+            # Цепочка CRUD организаций уже удалила её: удаление мягкое, отчёты по ней строятся
+            log_message(log, "Организация удалена, данные карточки недоступны")
+            org_data = {}
+        else:
+            response.raise_for_status()
+            org_data = response.json()
 
-        log_message(f"Название организации: \"{org_data.get('name', 'Не указано')}\"")
-        log_message(f"Юридический адрес: {org_data.get('address', 'Не указан')}")
-        log_message(f"ИНН: {org_data.get('inn', 'Не указан')}")
-        log_message(f"Расчётный счёт: {org_data.get('pay_account', 'Не указан')}")
+        log_message(log, f"Название организации: \"{org_data.get('name', 'Не указано')}\"")
+        log_message(log, f"Юридический адрес: {org_data.get('address', 'Не указан')}")
+        log_message(log, f"ИНН: {org_data.get('inn', 'Не указан')}")
+        log_message(log, f"Расчётный счёт: {org_data.get('pay_account', 'Не указан')}")
         # log_message("Организация успешно зарегистрирована в системе.")
-        log_message("Старт учёта оказанных услуг. Каждая услуга длится 2 дня, между услугами — минимум 1 день перерыва.")
+        log_message(log, "Старт учёта оказанных услуг. Каждая услуга длится 2 дня, между услугами — минимум 1 день перерыва.")
 
     with allure.step("Получение единиц измерения"):
-        units_measure = get_resource_units_measure(base_url, token_id)
-        units_map = {item["id"]: item["name"] for item in units_measure}
+        units_map = reference_data.index("resource_units_measure")
         allure.attach(json.dumps(units_map, ensure_ascii=False, indent=2), name="Единицы измерения", attachment_type=allure.attachment_type.JSON)
 
     with allure.step("Получение типов биллинга"):
-        billing_roles = get_billing_roles(base_url, token_id)
-        billing_map = {item["id"]: item["name"] for item in billing_roles}
+        billing_roles = reference_data.get("billing/roles_render_billing")
+        billing_map = reference_data.index("billing/roles_render_billing")
         allure.attach(json.dumps(billing_map, ensure_ascii=False, indent=2), name="Типы биллинга", attachment_type=allure.attachment_type.JSON)
 
     with allure.step("Получение атомарных ресурсов"):
-        resource_atoms = get_resource_atoms(base_url, token_id)
+        resource_atoms = reference_data.get("resource_atoms")
         valid_resources = [
             res for res in resource_atoms
             if res.get("category") and res.get("category", {}).get("unitMeasure")
         ]
         allure.attach(json.dumps(valid_resources, ensure_ascii=False, indent=2), name="Примеры ресурсов (первые 5)", attachment_type=allure.attachment_type.JSON)
 
-    SERVICE_CATALOG = []
-    PAYMENT_TYPES = ["service", "total"]
+    # Фиксированный seed воспроизводит каталог и план; по умолчанию — seed пула данных
+    # (случайный на прогон, при воспроизведении кассеты — тот же, что при записи)
+    dataset_seed = int(os.getenv("DATASET_SEED") or data_pool.seed)
+    allure.attach(str(dataset_seed), name="DATASET_SEED", attachment_type=allure.attachment_type.TEXT)
+    rng = random.Random(dataset_seed)
 
-    selected_resources = random.sample(valid_resources, min(NUM_SERVICES_TOTAL, len(valid_resources))) if valid_resources else []
-
-    if not selected_resources:
+    if not valid_resources:
         pytest.fail("Нет доступных ресурсов для формирования каталога услуг")
 
-    for res in selected_resources:
-        try:
-            unit_measure_id = res["category"]["unitMeasure"]["id"]
-            unit_name = units_map.get(unit_measure_id, "Неизвестно")
-            billing_type_id = 2
-            if billing_roles:
-                billing_type_id = random.choice([role["id"] for role in billing_roles])
-
-            price = random.randint(100, 5000)
-            payment_type = random.choice(PAYMENT_TYPES)
-
-            service = {
-                "name": res["name"],
-                "price": price,
-                "unit_measure_id": unit_measure_id,
-                "resource_atom_id": res["id"],
-                "payment_type": payment_type,
-                "billing_type_id": billing_type_id,
-                "unit_name": unit_name
-            }
-            SERVICE_CATALOG.append(service)
-        except Exception as e:
-            allure.attach(str(e), name=f"Ошибка при формировании услуги из ресурса {res.get('id', 'N/A')}", attachment_type=allure.attachment_type.TEXT)
-            continue
+    SERVICE_CATALOG = dataset.build_catalog(
+        valid_resources, units_map, [role["id"] for role in billing_roles], CATALOG_SIZE, rng
+    )
 
-    if len(SERVICE_CATALOG) < NUM_SERVICES_TOTAL:
-        pytest.fail(f"Не удалось сформировать каталог из {NUM_SERVICES_TOTAL} услуг. Создано только {len(SERVICE_CATALOG)}.")
+    if len(SERVICE_CATALOG) < min(CATALOG_SIZE, num_services_total):
+        pytest.fail(f"Не удалось сформировать каталог из {CATALOG_SIZE} услуг. Создано только {len(SERVICE_CATALOG)}.")
 
     allure.attach(
         json.dumps(SERVICE_CATALOG, ensure_ascii=False, indent=2),
-        name="Сформированный каталог услуг (ровно NUM_SERVICES_TOTAL записей)",
+        name="Сформированный каталог услуг (не более CATALOG_SIZE записей)",
         attachment_type=allure.attachment_type.JSON
     )
 
     services_by_day = {} 
     total_services_added = 0
-    total_services_attempted = 0 
-    max_attempts = 100 
-    attempts = 0
-
-    MAX_START_DAY = 29
-
     all_service_attempts = []
 
-    while total_services_added < NUM_SERVICES_TOTAL and attempts < max_attempts:
-        attempts += 1
-
-        if last_used_date is None:
-            start_day = 1
-        else:
-            min_start_date = last_used_date + timedelta(days=2)
-            start_day = min_start_date.day
-
-            if start_day > MAX_START_DAY:
-                break
+    with allure.step(f"Планирование {num_services_total} услуг"):
+        planned = dataset.generate(
+            [int(CREATED_ORGANIZATION_ID)], num_services_total, SERVICE_CATALOG,
+            start=date(CURRENT_YEAR, CURRENT_MONTH, 1),
+            end=date.fromisoformat(os.getenv("DATASET_END")) if os.getenv("DATASET_END") else None,
+            seed=rng.randrange(2 ** 32)
+        )
+        plan = planned.plan
 
-        try:
-            start_date_obj = date(CURRENT_YEAR, CURRENT_MONTH, start_day)
-        except ValueError:
-            break
+    with allure.step("Отчёты организации до наполнения"):
+        # Услуги прошлых прогонов в той же организации не мешают сверке
+        before = fetch_reports(base_url, token_id, int(CREATED_ORGANIZATION_ID), *plan_period(plan)) if plan else None
 
-        end_date_obj = start_date_obj + timedelta(days=1)
-        last_used_date = end_date_obj
+    with allure.step(f"Добавление услуг: {len(plan)} запросов, параллельно до {seed_concurrency}"):
+        results = seeding.run(
+            plan,
+            lambda item: add_service_to_organization(
+                base_url=base_url,
+                token_id=token_id,
+                org_id=int(CREATED_ORGANIZATION_ID),
+                service_data=item["service"],
+                record_start_date=item["record_start_date"],
+                record_end_date=item["record_end_date"],
+                quantity=item["quantity"],
+                time_val=item["quantity"]
+            ),
+            concurrency=seed_concurrency,
+            rate=seed_rate
+        )
 
-        service_choice = random.choice(SERVICE_CATALOG)
-        quantity = random.randint(1, 5)
+    for item, api_response in zip(plan, results):
+        service_choice = item["service"]
+        quantity = item["quantity"]
         price = service_choice["price"]
         amount = quantity * price
-
-        start_date_str = start_date_obj.strftime("%Y-%m-%d")
-        end_date_str = end_date_obj.strftime("%Y-%m-%d")
+        start_date_str = item["record_start_date"]
+        end_date_str = item["record_end_date"]
 
         with allure.step(f"Добавление услуги: {service_choice['name']} на {start_date_str} — {end_date_str}"):
-            api_response = add_service_to_organization(
-                base_url=base_url,
-                token_id=token_id,
-                org_id=int(CREATED_ORGANIZATION_ID),
-                service_data=service_choice,
-                record_start_date=start_date_str,
-                record_end_date=end_date_str,
-                quantity=quantity,
-                time_val=quantity
-            )
+            attach_service_result(service_choice, api_response)
 
             day_str = start_date_str
             if day_str not in services_by_day:
@@ -343,7 +262,7 @@ def test_add_services_and_generate_report():
                 "amount": amount,
                 "unit": service_choice.get("unit_name", ""),
                 "payment_type": service_choice["payment_type"],
-                "timestamp": (datetime.combine(start_date_obj, datetime.min.time()) + timedelta(hours=random.randint(9, 17))).strftime("%Y-%m-%d %H:%M:%S"),
+                "timestamp": (datetime.combine(item["start_date"], datetime.min.time()) + timedelta(hours=item["hour"])).strftime("%Y-%m-%d %H:%M:%S"),
                 "success": api_response.get("success", False),
                 "status_code": api_response.get("status_code", "N/A"),
                 "error": api_response.get("error", "N/A"),
@@ -357,17 +276,17 @@ def test_add_services_and_generate_report():
                 total_services_added += 1
                 # log_message(f"Успешно добавлена услуга: {service_choice['name']} на {start_date_str} — {end_date_str}. Сумма: {amount:.2f} руб.")
             else:
-                log_message(f"ОШИБКА при добавлении услуги: {service_choice['name']} на {start_date_str} — {end_date_str}. Код: {api_response.get('status_code', 'N/A')}, Текст: {api_response.get('response_text', 'N/A')}")
+                log_message(log, f"ОШИБКА при добавлении услуги: {service_choice['name']} на {start_date_str} — {end_date_str}. Код: {api_response.get('status_code', 'N/A')}, Текст: {api_response.get('response_text', 'N/A')}")
 
-        total_services_attempted += 1
+    total_services_attempted = len(plan)
 
-    if total_services_added < NUM_SERVICES_TOTAL:
+    if total_services_added < num_services_total:
         allure.attach(
-            f"Не удалось добавить все {NUM_SERVICES_TOTAL} услуг. Успешно: {total_services_added}, Неудачно: {NUM_SERVICES_TOTAL - total_services_added}",
+            f"Не удалось добавить все {num_services_total} услуг. Успешно: {total_services_added}, Неудачно: {num_services_total - total_services_added}",
             name="Итог по добавлению услуг",
             attachment_type=allure.attachment_type.TEXT
         )
-        # pytest.fail(f"Не удалось добавить все {NUM_SERVICES_TOTAL} услуг с соблюдением перерывов. Добавлено: {total_services_added}")
+        # pytest.fail(f"Не удалось добавить все {num_services_total} услуг с соблюдением перерывов. Добавлено: {total_services_added}")
 
     total_amount_all = 0
     total_services_all = 0
@@ -375,7 +294,7 @@ def test_add_services_and_generate_report():
     sorted_days = sorted(services_by_day.keys())
 
     for day_str in sorted_days:
-        log_day_header(day_str)
+        log_day_header(log, day_str)
 
         daily_total = 0
         daily_count = 0
@@ -401,10 +320,9 @@ def test_add_services_and_generate_report():
                 f"Статус: {'OK' if service['success'] else f'ERROR {service.get("status_code", "N/A")}' }"
             )
             timestamp = service['timestamp']
-            with open(LOG_FILE_PATH, "a", encoding="utf-8") as f:
-                f.write(f"[INFO] [{timestamp}] — {log_entry}\n")
+            log.write(f"[INFO] [{timestamp}] — {log_entry}\n")
 
-        log_daily_summary(day_str, daily_count, daily_total)
+        log_daily_summary(log, day_str, daily_count, daily_total)
 
     if sorted_days:
         start_date_str = sorted_days[0]
@@ -414,6 +332,7 @@ def test_add_services_and_generate_report():
         avg_daily = total_amount_all / total_days if total_days > 0 else 0
 
         log_final_report(
+            log,
             start_date=start_date_str,
             end_date=end_date_str,
             total_days=total_days,
@@ -423,9 +342,7 @@ def test_add_services_and_generate_report():
             failed_services=failed_services
         )
 
-    with open(LOG_FILE_PATH, "r", encoding="utf-8") as f:
-        log_content = f.read()
-        allure.attach(log_content, name="Лог создания и услуг", attachment_type=allure.attachment_type.TEXT)
+    allure.attach(log.getvalue(), name="Лог создания и услуг", attachment_type=allure.attachment_type.TEXT)
 
     allure.attach(
         json.dumps(all_service_attempts, ensure_ascii=False, indent=2),
@@ -433,7 +350,7 @@ def test_add_services_and_generate_report():
         attachment_type=allure.attachment_type.JSON
     )
 
-    # assert total_services_all == NUM_SERVICES_TOTAL, f"Добавлено {total_services_all} из {NUM_SERVICES_TOTAL} запланированных услуг"
+    # assert total_services_all == num_services_total, f"Добавлено {total_services_all} из {num_services_total} запланированных услуг"
     assert total_amount_all > 0 or failed_services > 0, "Общая сумма по услугам равна нулю и не было ни одной успешной услуги"
 
     allure.attach(
@@ -443,4 +360,95 @@ def test_add_services_and_generate_report():
         f"Общая сумма: {total_amount_all:.2f} руб.",
         name="Финансовый результат и статистика",
         attachment_type=allure.attachment_type.TEXT
-    )
\ No newline at end of file
+    )
+
+    if total_services_all:
+        check_reports_against_plan(base_url, token_id, int(CREATED_ORGANIZATION_ID), planned, plan, results, before)
+
+
+def plan_period(plan):
+    """Даты первой и последней услуги плана (ГГГГ-ММ-ДД)"""
+    return min(item["record_start_date"] for item in plan), max(item["record_end_date"] for item in plan)
+
+
+def fetch_reports(base_url, token_id, org_id, begin, end):
+    """Отчёт по организации и отчёты предбиллинга за период: {"services", "total", "atoms"}"""
+    headers = {"accept": "application/json", "tockenid": token_id}
+    response = requests.get(
+        f"{base_url}/api/v1/report_organization/{org_id}",
+        params={
+            "report_type": "Services",
+            "begin_date": date.fromisoformat(begin).strftime("%d.%m.%Y"),
+            "end_date": date.fromisoformat(end).strftime("%d.%m.%Y"),
+        },
+        headers=headers
+    )
+    assert response.status_code == 200, f"Отчёт по организации: {response.status_code} {response.text}"
+    services = {
+        int(item["service_id"]): {"quantity": float(item["quantity"]), "cost": float(item["cost"])}
+        for item in response.json()["items"]
+    }
+
+    period = {"organization_id": org_id, "start_date": begin, "end_date": end}
+    response = requests.get(f"{base_url}/api/v1/pre_billing/reports/total", params=period, headers=headers)
+    assert response.status_code == 200, f"pre_billing/reports/total: {response.status_code} {response.text}"
+    total = float(response.json()["total"] or 0)
+
+    response = requests.get(f"{base_url}/api/v1/pre_billing/reports/atom_total", params=period, headers=headers)
+    assert response.status_code == 200, f"pre_billing/reports/atom_total: {response.status_code} {response.text}"
+    atoms = {int(row["resource_atom_id"]): float(row["total"]) for row in response.json()}
+    return {"services": services, "total": total, "atoms": atoms}
+
+
+def check_reports_against_plan(base_url, token_id, org_id, planned, plan, results, before):
+    """Отчёт по организации и отчёты предбиллинга сверяются с итогами, посчитанными при генерации.
+
+    У организации могут быть услуги прошлых прогонов: сверяется прирост
+    относительно отчётов before, снятых до наполнения за тот же период.
+    """
+    # Ожидаемые итоги — по услугам, которые стенд принял
+    accepted = dataset.Dataset(planned.seed)
+    for item, api_response in zip(plan, results):
+        if api_response.get("success"):
+            accepted.add(item)
+    begin, end = plan_period(plan)
+    expected = accepted.expected(org_id, begin, end)
+    allure.attach(
+        json.dumps({"begin": begin, "end": end, "services": expected["services"], "amount": expected["amount"],
+                    "atoms": expected["atoms"], "before": before}, ensure_ascii=False, indent=2, default=str),
+        name="Ожидаемые итоги",
+        attachment_type=allure.attachment_type.JSON
+    )
+    after = fetch_reports(base_url, token_id, org_id, begin, end)
+    empty = {"quantity": 0, "cost": 0}
+
+    with allure.step("Сверка отчёта по организации с планом"):
+        reported = after["services"]
+        assert set(expected["atoms"]) <= set(reported), (
+            f"В отчёте нет услуг {sorted(set(expected['atoms']) - set(reported))} из плана"
+        )
+        for atom_id, totals in expected["atoms"].items():
+            previous = before["services"].get(atom_id, empty)
+            added_quantity = reported[atom_id]["quantity"] - previous["quantity"]
+            added_cost = reported[atom_id]["cost"] - previous["cost"]
+            assert added_quantity == pytest.approx(totals["quantity"]), (
+                f"Количество по атому {atom_id} выросло на {added_quantity}, ожидалось {totals['quantity']}"
+            )
+            assert added_cost == pytest.approx(totals["cost"]), (
+                f"Стоимость по атому {atom_id} выросла на {added_cost}, ожидалось {totals['cost']}"
+            )
+
+    with allure.step("Сверка общего итога предбиллинга с планом"):
+        added = after["total"] - before["total"]
+        assert added == pytest.approx(expected["amount"]), (
+            f"Итог предбиллинга вырос на {added}, ожидалось {expected['amount']}"
+        )
+
+    with allure.step("Сверка итогов предбиллинга по атомам с планом"):
+        added = {
+            atom_id: after["atoms"].get(atom_id, 0) - before["atoms"].get(atom_id, 0)
+            for atom_id in expected["atoms"]
+        }
+        assert added == pytest.approx({atom_id: totals["cost"] for atom_id, totals in expected["atoms"].items()}), (
+            f"Прирост итогов по атомам {added} не совпадает с планом"
+        )
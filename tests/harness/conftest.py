@@ -0,0 +1,9 @@
+# Проверки самого набора (helpers/): без обращения к API и без токена
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def pooled_requests():
+    """Модульные вызовы requests здесь не используются: общий пул api_client не нужен"""
+
@@ -0,0 +1,108 @@
+# Повтор запроса ApiClient после 401 со сброшенным токеном
+# tests/harness/test_api_client.py
+
+import allure
+import requests
+from requests.adapters import BaseAdapter
+
+from helpers.api_client import ApiClient
+
+
+class FakeAdapter(BaseAdapter):
+    """Отдаёт заранее заданные статусы и запоминает присланные tockenid"""
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.tokens = []
+
+    def send(self, request, **kwargs):
+        self.tokens.append(request.headers.get("tockenid"))
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        response.request = request
+        response._content = b"{}"
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
+
+
+class Broker:
+    """Брокер токенов: после invalidate() выдаёт следующий токен"""
+
+    def __init__(self):
+        self.issued = 1
+        self.invalidated = 0
+
+    def get(self):
+        return f"token-{self.issued}"
+
+    def invalidate(self):
+        self.invalidated += 1
+        self.issued += 1
+
+
+def make_client(statuses):
+    broker = Broker()
+    client = ApiClient("http://stand.test", token_provider=broker.get, on_unauthorized=broker.invalidate)
+    adapter = FakeAdapter(statuses)
+    client.session.mount("http://", adapter)
+    return client, adapter, broker
+
+
+@allure.feature("Клиент API")
+def test_unauthorized_retried_once_with_fresh_token():
+    client, adapter, broker = make_client([401, 200])
+
+    response = client.get("/api/v1/roles")
+
+    assert response.status_code == 200
+    assert adapter.tokens == ["token-1", "token-2"]
+    assert broker.invalidated == 1
+
+
+@allure.feature("Клиент API")
+def test_repeated_unauthorized_not_retried_again():
+    client, adapter, broker = make_client([401])
+
+    response = client.get("/api/v1/roles")
+
+    assert response.status_code == 401
+    assert len(adapter.tokens) == 2
+    assert broker.invalidated == 1
+
+
+@allure.feature("Клиент API")
+def test_explicit_token_not_retried():
+    client, adapter, broker = make_client([401])
+
+    response = client.get("/api/v1/roles", headers={"tockenid": "foreign"})
+
+    assert response.status_code == 401
+    assert adapter.tokens == ["foreign"]
+    assert broker.invalidated == 0
+
+
+@allure.feature("Клиент API")
+def test_raw_request_with_client_token_retried():
+    """Вызовы requests.* в тестах (send_raw) со старым токеном брокера тоже обновляют его"""
+    client, adapter, broker = make_client([401, 200])
+
+    response = client.send_raw("GET", "http://stand.test/api/v1/roles", headers={"tockenid": broker.get()})
+
+    assert response.status_code == 200
+    assert adapter.tokens == ["token-1", "token-2"]
+    assert broker.invalidated == 1
+
+
+@allure.feature("Клиент API")
+def test_raw_request_with_foreign_token_not_retried():
+    client, adapter, broker = make_client([401])
+
+    response = client.send_raw("GET", "http://stand.test/api/v1/roles", headers={"tockenid": "invalid"})
+
+    assert response.status_code == 401
+    assert adapter.tokens == ["invalid"]
+    assert broker.invalidated == 0
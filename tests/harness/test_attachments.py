@@ -0,0 +1,52 @@
+# Лимит, двоичные вложения и режим on-failure helpers/attachments.py
+# tests/harness/test_attachments.py
+
+import allure
+import pytest
+from allure_commons.types import AttachmentType
+
+from helpers import attachments
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Вложения, переданные в Allure: (содержимое, тип)"""
+    calls = []
+    monkeypatch.setattr(attachments, "_allure_attach",
+                        lambda body, name=None, attachment_type=None, extension=None: calls.append((body, attachment_type)))
+    yield calls
+    attachments.discard()
+    attachments.configure()
+
+
+@allure.feature("Вложения Allure")
+def test_binary_attachment_is_not_changed(written):
+    """PNG больше лимита и не в UTF-8 записывается байт в байт"""
+    attachments.configure("always", max_bytes=16)
+    png = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+    attachments.attach(png, name="Скриншот", attachment_type=AttachmentType.PNG)
+    assert written == [(png, AttachmentType.PNG)]
+
+
+@allure.feature("Вложения Allure")
+def test_text_attachment_is_truncated(written):
+    """Текст больше лимита обрезается, обрезанный JSON становится текстом"""
+    attachments.configure("always", max_bytes=16)
+    attachments.attach_json({"items": list(range(100))}, name="Список")
+    (body, attachment_type), = written
+    assert attachment_type == AttachmentType.TEXT
+    assert "обрезано: показано 16 из" in body
+
+
+@allure.feature("Вложения Allure")
+def test_on_failure_snapshots_at_attach_time(written):
+    """В режиме on-failure вложение фиксируется при вызове, а не при записи"""
+    attachments.configure("on-failure", max_bytes=0)
+    data = {"status": "создан"}
+    attachments.attach_json(data, name="Ответ")
+    data["status"] = "удалён"
+    assert written == []
+
+    attachments.flush()
+    (body, _), = written
+    assert "создан" in body and "удалён" not in body
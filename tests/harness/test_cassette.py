@@ -0,0 +1,111 @@
+# Запись и воспроизведение кассет helpers/cassette.py на поддельном адаптере
+# tests/harness/test_cassette.py
+
+import json
+
+import allure
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from helpers import cassette
+
+API = "http://stand.test/api/v1"
+
+
+class FakeAdapter(BaseAdapter):
+    """Отвечает по очереди заданными (статус, тело) и считает запросы"""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        status, body = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.request = request
+        response.url = request.url
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(body).encode("utf-8")
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
+
+
+def recording_session(path, responses):
+    session = requests.Session()
+    adapter = FakeAdapter(responses)
+    session.mount("http://", adapter)
+    cassette.start_recording(path, {"data_pool": {"seed": 1}})
+    cassette.install(session, "record", path)
+    return session, adapter
+
+
+def replay_session(path):
+    session = requests.Session()
+    cassette.install(session, "replay", path)
+    return session
+
+
+@allure.feature("Кассеты")
+def test_round_trip(tmp_path):
+    """Записанные ответы воспроизводятся без сети, секреты в файл не попадают"""
+    path = tmp_path / "api.jsonl"
+    session, _ = recording_session(path, [
+        (200, {"tockenID": "secret-token"}),
+        (200, [{"id": 1}, {"id": 2}]),
+        (201, {"id": 5, "name": "Org"}),
+    ])
+    session.post(f"{API}/tocken", params={"login": "user", "password": "p@ss"})
+    session.get(f"{API}/organizations", params={"by_tenant_id": 123, "a": 1})
+    session.post(f"{API}/organization", json={"name": "Org", "inn": "1"})
+
+    text = path.read_text(encoding="utf-8")
+    assert "secret-token" not in text and "p@ss" not in text
+    assert cassette.read_meta(path) == {"data_pool": {"seed": 1}}
+
+    replay = replay_session(path)
+    # Порядок параметров и ключей тела не влияет на поиск записи
+    listed = replay.get(f"{API}/organizations", params={"a": 1, "by_tenant_id": 123})
+    assert listed.status_code == 200 and listed.json() == [{"id": 1}, {"id": 2}]
+    created = replay.post(f"{API}/organization", json={"inn": "1", "name": "Org"})
+    assert created.status_code == 201 and created.json() == {"id": 5, "name": "Org"}
+    assert replay.post(f"{API}/tocken", params={"password": "other"}).json() == {"tockenID": "***"}
+
+
+@allure.feature("Кассеты")
+def test_entries_are_single_use(tmp_path):
+    """Одинаковые запросы получают записи по порядку, затем повторяется последняя"""
+    path = tmp_path / "api.jsonl"
+    session, _ = recording_session(path, [(200, {"n": 1}), (200, {"n": 2})])
+    session.get(f"{API}/role/1")
+    session.get(f"{API}/role/1")
+
+    replay = replay_session(path)
+    assert [replay.get(f"{API}/role/1").json()["n"] for _ in range(3)] == [1, 2, 2]
+
+
+@allure.feature("Кассеты")
+def test_other_body_takes_next_unused_entry(tmp_path):
+    """POST с другим телом (другие данные пула) получает следующую невыданную запись"""
+    path = tmp_path / "api.jsonl"
+    session, _ = recording_session(path, [(201, {"id": 1}), (201, {"id": 2})])
+    session.post(f"{API}/user", json={"login": "a"})
+    session.post(f"{API}/user", json={"login": "b"})
+
+    replay = replay_session(path)
+    assert replay.post(f"{API}/user", json={"login": "b"}).json() == {"id": 2}
+    assert replay.post(f"{API}/user", json={"login": "x"}).json() == {"id": 1}
+
+
+@allure.feature("Кассеты")
+def test_unknown_request_is_a_miss(tmp_path):
+    path = tmp_path / "api.jsonl"
+    recording_session(path, [])
+    with pytest.raises(cassette.CassetteMiss):
+        replay_session(path).get(f"{API}/tariffs")
@@ -0,0 +1,60 @@
+# Пул тестовых данных helpers/datapool.py: детерминированность, кэш пачек, позиция выдачи
+# tests/harness/test_datapool.py
+
+import allure
+
+from helpers import datapool
+from helpers.datapool import DataPool
+
+
+@allure.feature("Пул тестовых данных")
+def test_same_seed_same_leases():
+    """Тот же seed и размер пачки — те же элементы; другой seed или метка — другие"""
+    first = [DataPool(seed=1, batch_size=3).lease_many("user", 5) for _ in range(2)]
+    assert first[0] == first[1]
+    assert DataPool(seed=2, batch_size=3).lease_many("user", 5) != first[0]
+
+    tagged = DataPool(seed=1, batch_size=3, tag="ab12").lease("user")
+    assert tagged["login"].endswith("ab121") and tagged != first[0][0]
+
+
+@allure.feature("Пул тестовых данных")
+def test_leases_do_not_repeat():
+    pool = DataPool(seed=1, batch_size=2)
+    names = [pool.lease("organization")["name"] for _ in range(5)]
+    assert len(set(names)) == 5
+    assert names == [pool.item("organization", index)["name"] for index in range(5)]
+
+
+@allure.feature("Пул тестовых данных")
+def test_cached_batches_match_generated(tmp_path):
+    pool = DataPool(seed=3, cache_dir=tmp_path, batch_size=4)
+    generated = pool.lease_many("tariff", 6)
+    assert pool.generated == 2
+
+    cached = DataPool(seed=3, cache_dir=tmp_path, batch_size=4)
+    assert [cached.item("tariff", index) for index in range(6)] == generated
+    assert cached.loaded == 2 and cached.generated == 0
+
+
+@allure.feature("Пул тестовых данных")
+def test_save_cursor_resumes(tmp_path):
+    """Следующий прогон с тем же seed продолжает с сохранённой позиции"""
+    pool = DataPool(seed=5, cache_dir=tmp_path, batch_size=4)
+    pool.lease_many("organization", 3)
+    datapool.save_cursor(tmp_path, 5, {datapool.cursor_key("organization"): 3})
+    # Меньшее значение позицию не откатывает
+    datapool.save_cursor(tmp_path, 5, {datapool.cursor_key("organization"): 1})
+    assert datapool.load_cursor(tmp_path, 5) == {"organization": 3}
+    assert datapool.load_cursor(tmp_path, 6) == {}
+
+    resumed = DataPool(seed=5, cache_dir=tmp_path, batch_size=4)
+    assert resumed.lease("organization") == pool.item("organization", 3)
+
+
+@allure.feature("Пул тестовых данных")
+def test_settings_round_trip():
+    pool = DataPool(seed=7, batch_size=3, tag="zz01")
+    pool.offsets = {"user": 4}
+    copy = DataPool.from_settings(pool.settings())
+    assert copy.lease_many("user", 2) == pool.lease_many("user", 2)
@@ -0,0 +1,84 @@
+# Запоминание GET и сброс по записям helpers/memo.py на поддельном адаптере
+# tests/harness/test_memo.py
+
+import allure
+import requests
+from requests.adapters import BaseAdapter
+
+from helpers import memo
+
+API = "http://stand.test/api/v1"
+
+
+class FakeAdapter(BaseAdapter):
+    """Отвечает 200 с номером запроса в теле и запоминает отправленные пути"""
+
+    def __init__(self, status=200):
+        super().__init__()
+        self.status = status
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(f"{request.method} {request.path_url}")
+        response = requests.Response()
+        response.status_code = self.status
+        response.request = request
+        response._content = str(len(self.sent)).encode()
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
+
+
+def make_session(scope="session", status=200):
+    session = requests.Session()
+    inner = FakeAdapter(status)
+    session.mount("http://", inner)
+    cache = memo.MemoCache(scope)
+    cache.enter("test_a", "module_a")
+    memo.install(session, cache)
+    return session, inner, cache
+
+
+@allure.feature("Запоминание GET")
+def test_repeated_get_served_from_memory():
+    session, inner, cache = make_session()
+    first = session.get(f"{API}/organization/5").text
+    assert session.get(f"{API}/organization/5").text == first
+    assert session.get(f"{API}/organization/5", params={"x": 1}).text != first
+    assert len(inner.sent) == 2
+    assert cache.totals()["hits"] == 1
+
+
+@allure.feature("Запоминание GET")
+def test_write_invalidates_resource_and_lists():
+    """Запись сбрасывает тот же ресурс, вложенные пути и списки, но не другие ресурсы"""
+    session, inner, _ = make_session()
+    paths = ("organization/5", "organization/5/services", "organizations", "organization/6", "role/1")
+    for path in paths:
+        session.get(f"{API}/{path}")
+    session.put(f"{API}/organization/5", json={"name": "new"})
+    inner.sent.clear()
+
+    for path in paths:
+        session.get(f"{API}/{path}")
+    assert inner.sent == [
+        "GET /api/v1/organization/5",
+        "GET /api/v1/organization/5/services",
+        "GET /api/v1/organizations",
+    ]
+
+
+@allure.feature("Запоминание GET")
+def test_scope_change_and_errors_not_memoized():
+    session, inner, cache = make_session(scope="test")
+    session.get(f"{API}/role/1")
+    cache.enter("test_b", "module_a")
+    session.get(f"{API}/role/1")
+    assert len(inner.sent) == 2
+
+    session, inner, _ = make_session(status=500)
+    session.get(f"{API}/role/1")
+    session.get(f"{API}/role/1")
+    assert len(inner.sent) == 2
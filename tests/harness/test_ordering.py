@@ -0,0 +1,118 @@
+# Порядок тестов helpers/ordering.py и группы xdist helpers/scheduler.py
+# tests/harness/test_ordering.py
+
+import os
+
+import allure
+
+from config import PROJECT_ROOT
+from helpers.ordering import order_items
+from helpers.scheduler import assign_groups, group_of
+
+
+class Item:
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+
+    def __repr__(self):
+        return self.nodeid
+
+
+def collected_modules(root=PROJECT_ROOT / "tests"):
+    """Модули тестов в порядке сбора pytest: записи каталога по имени"""
+    modules = []
+    for entry in sorted(os.scandir(root), key=lambda entry: entry.name):
+        if entry.is_dir() and not entry.name.startswith(("_", ".")):
+            modules.extend(collected_modules(entry.path))
+        elif entry.name.startswith("test_") and entry.name.endswith(".py"):
+            modules.append(os.path.relpath(entry.path, PROJECT_ROOT).replace(os.sep, "/"))
+    return modules
+
+
+def baseline_order(items):
+    """Порядок прежнего pytest_collection_modifyitems: списки подстрок по этапам"""
+    ordered = []
+
+    def take(*patterns, exclude_ordered=False, where=None):
+        for pattern in patterns:
+            ordered.extend(
+                i for i in items
+                if (where is None or where in i.nodeid) and pattern in i.nodeid
+                and not (exclude_ordered and i in ordered)
+            )
+
+    take("token/test_auth")
+    take(*(f"user/test_user_{phase}" for phase in ("create", "read", "update", "delete", "crud")))
+    take(*(f"organizations/test_organization_{phase}" for phase in ("create", "read", "update", "delete")))
+    take("organizations/test_organizations_read")
+    take("users/test_users_add_org", "users/test_users_org", "users/test_users_read")
+    take("role/", exclude_ordered=True)
+    take("report/", exclude_ordered=True)
+    for name in ("resource_service", "resource_pool", "resource_atom", "resource_location"):
+        take(*(f"test_{name}_{phase}" for phase in ("create", "read", "update", "delete")), where=f"{name}/")
+    take(*(f"test_resource_category_ref_{phase}" for phase in ("create", "read", "update", "delete", "list")),
+         where="resource_category_ref/")
+    ordered.extend(
+        i for i in items
+        if ("resource/" in i.nodeid or "resource_pools" in i.nodeid) and i not in ordered
+    )
+    crud = ("create", "read", "update", "delete")
+    take(*(f"tariff/tariff_crud/test_tariff_{phase}" for phase in crud))
+    take(*(f"tariff/tariff_link_organization_crud/test_tariff_link_organization_{phase}" for phase in crud))
+    take(*(f"tariff/tariff_link_tenant_crud/test_tariff_link_tenant_{phase}" for phase in ("create", "read", "delete")))
+    take("tariff/tariff_links_organization/", "tariff/tariff_links_tenant/", "tariff/tariff_setting_types/")
+    take(*(f"tariff/tariff_tenant_settings_crud/test_tariff_tenant_settings_{phase}" for phase in crud))
+    take("tariff/tariff_tenants_settings/", "tariff/tariff_time_intervals/", "tariff/tariffs/",
+         "tariff/tariffs_settings/")
+    ordered.extend(i for i in items if i not in ordered)
+    return ordered
+
+
+@allure.feature("Порядок тестов")
+def test_order_matches_baseline():
+    items = [Item(f"{path}::test_{n}") for path in collected_modules() for n in (1, 2)]
+    assert len(items) > 100
+    assert [item.nodeid for item in order_items(items)] == [item.nodeid for item in baseline_order(items)]
+
+
+@allure.feature("Порядок тестов")
+def test_crud_phases_and_stable_order():
+    items = [Item(nodeid) for nodeid in (
+        "tests/misc/test_x.py::test_a",
+        "tests/tariff/tariff_crud/test_tariff_delete.py::test_a",
+        "tests/tariff/tariff_crud/test_tariff_create.py::test_b",
+        "tests/tariff/tariff_crud/test_tariff_create.py::test_a",
+        "tests/token/test_auth.py::test_a",
+    )]
+    assert [item.nodeid for item in order_items(items)] == [
+        "tests/token/test_auth.py::test_a",
+        "tests/tariff/tariff_crud/test_tariff_create.py::test_b",
+        "tests/tariff/tariff_crud/test_tariff_create.py::test_a",
+        "tests/tariff/tariff_crud/test_tariff_delete.py::test_a",
+        "tests/misc/test_x.py::test_a",
+    ]
+
+
+@allure.feature("Порядок тестов")
+def test_dependent_chains_share_a_group():
+    user = group_of("tests/user/test_user_create.py::test_a")
+    assert group_of("tests/organizations/test_organization_create.py::test_a") == user
+    assert group_of("tests/users/test_users_add_org.py::test_a") == user
+    assert group_of("tests/tariff/tariff_crud/test_tariff_create.py::test_a") != user
+    # Модуль вне цепочек — своя группа
+    assert group_of("tests/role/test_role_read_list.py::test_a") == "tests/role/test_role_read_list.py"
+
+
+@allure.feature("Порядок тестов")
+def test_longest_groups_start_first_keeping_inner_order():
+    items = [Item(nodeid) for nodeid in (
+        "tests/role/test_role_read_list.py::test_a",
+        "tests/tariff/tariff_crud/test_tariff_create.py::test_a",
+        "tests/tariff/tariff_crud/test_tariff_delete.py::test_a",
+    )]
+    durations = {"tests/role/test_role_read_list.py::test_a": 30.0}
+    ordered, groups = assign_groups(items, durations)
+    assert [item.nodeid for item in ordered] == [items[0].nodeid, items[1].nodeid, items[2].nodeid]
+    ordered, _ = assign_groups(items)
+    assert [item.nodeid for item in ordered] == [items[1].nodeid, items[2].nodeid, items[0].nodeid]
+    assert len(groups) == 2
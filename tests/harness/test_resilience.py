@@ -0,0 +1,160 @@
+# Повторы, бюджет и выключатель helpers/resilience.py на поддельном адаптере
+# tests/harness/test_resilience.py
+
+import allure
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from helpers import resilience
+from helpers.state import StateStore
+
+URL = "http://stand.test/api/v1/roles"
+
+
+class FakeAdapter(BaseAdapter):
+    """Отдаёт заранее заданные статусы или исключения и считает отправленные запросы"""
+
+    def __init__(self, outcomes, retry_after=None):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.retry_after = retry_after
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.status_code = outcome
+        response.request = request
+        response._content = b"{}"
+        response._content_consumed = True
+        if self.retry_after is not None:
+            response.headers["Retry-After"] = str(self.retry_after)
+        return response
+
+    def close(self):
+        pass
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_adapter(outcomes, counter=None, retry_after=None, **policy):
+    inner = FakeAdapter(outcomes, retry_after)
+    clock = Clock()
+    sleeps = []
+    adapter = resilience.ResilientAdapter(
+        inner, resilience.Policy(**policy), resilience.TransportStats(),
+        sleep=sleeps.append, clock=clock, counter=counter,
+    )
+    return adapter, inner, clock, sleeps
+
+
+def get(adapter, url=URL):
+    return adapter.send(requests.Request("GET", url).prepare())
+
+
+@allure.feature("Устойчивый транспорт")
+def test_breaker_opens_after_threshold():
+    """После breaker_threshold неудач подряд запросы не отправляются до конца паузы"""
+    adapter, inner, clock, _ = make_adapter([503], retries=0, breaker_threshold=3, breaker_cooldown=30)
+
+    for _ in range(3):
+        assert get(adapter).status_code == 503
+    assert inner.sent == 3
+
+    with pytest.raises(resilience.CircuitOpenError):
+        get(adapter)
+    assert inner.sent == 3, "При открытом выключателе запрос не должен уходить на стенд"
+    totals = adapter.stats.totals()
+    assert totals["breaker_opens"] == 1
+    assert totals["short_circuits"] == 1
+
+
+@allure.feature("Устойчивый транспорт")
+def test_breaker_half_open_probe_closes():
+    """После паузы пропускается один пробный запрос; его успех закрывает выключатель"""
+    adapter, inner, clock, _ = make_adapter([503, 503, 200], retries=0, breaker_threshold=2, breaker_cooldown=30)
+    get(adapter)
+    get(adapter)
+    with pytest.raises(resilience.CircuitOpenError):
+        get(adapter)
+
+    clock.now = 30
+    breaker = adapter._breaker("GET /api/v1/roles")
+    assert breaker.ready(clock.now)
+    assert get(adapter).status_code == 200
+    assert breaker.opened_at is None and breaker.failures == 0
+
+    assert get(adapter).status_code == 200
+    assert inner.sent == 4
+
+
+@allure.feature("Устойчивый транспорт")
+def test_breaker_failed_probe_reopens():
+    """Неудачный пробный запрос снова открывает выключатель на полную паузу"""
+    adapter, inner, clock, _ = make_adapter([503], retries=0, breaker_threshold=1, breaker_cooldown=30)
+    get(adapter)
+    clock.now = 30
+    assert get(adapter).status_code == 503
+    clock.now = 59
+    with pytest.raises(resilience.CircuitOpenError):
+        get(adapter)
+    assert inner.sent == 2
+
+
+@allure.feature("Устойчивый транспорт")
+def test_retry_budget_is_shared_and_exhausted():
+    """Бюджет повторов общий для адаптеров с одним счётчиком; сверх бюджета запрос не повторяется"""
+    counter = StateStore().increment
+    first, first_inner, _, _ = make_adapter([503], counter=counter, retries=3, budget=2, breaker_threshold=0)
+    second, second_inner, _, _ = make_adapter([503], counter=counter, retries=3, budget=2, breaker_threshold=0)
+
+    assert get(first).status_code == 503
+    assert first_inner.sent == 3, "Два повтора из бюджета"
+    assert get(second).status_code == 503
+    assert second_inner.sent == 1, "Бюджет израсходован другим адаптером"
+    assert second.stats.totals()["budget_exhausted"] == 1
+    assert counter(resilience.BUDGET_KEY, 0) == 4
+
+
+@allure.feature("Устойчивый транспорт")
+def test_connection_error_retried_then_raised():
+    """Обрыв соединения повторяется, а после последней попытки исключение доходит до теста"""
+    error = requests.exceptions.ConnectionError("обрыв")
+    adapter, inner, _, sleeps = make_adapter([error], retries=2, breaker_threshold=0)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        get(adapter)
+    assert inner.sent == 3
+    assert len(sleeps) == 2
+
+
+@allure.feature("Устойчивый транспорт")
+def test_post_is_not_retried():
+    """Неидемпотентный POST не повторяется"""
+    adapter, inner, _, _ = make_adapter([503], retries=2, breaker_threshold=0)
+    response = adapter.send(requests.Request("POST", URL, json={}).prepare())
+    assert response.status_code == 503
+    assert inner.sent == 1
+
+
+@allure.feature("Устойчивый транспорт")
+def test_retry_after_is_a_floor():
+    """Retry-After — нижняя граница паузы, но не больше max_delay"""
+    adapter, inner, _, sleeps = make_adapter([503, 200], retry_after=4, retries=1, backoff=0.01,
+                                             max_delay=10, breaker_threshold=0)
+    assert get(adapter).status_code == 200
+    assert sleeps and sleeps[0] >= 4
+
+    policy = resilience.Policy(backoff=0.01, max_delay=10)
+    assert all(policy.delay(1, retry_after=4) >= 4 for _ in range(100))
+    assert all(policy.delay(1, retry_after=120) == 10 for _ in range(100))
+    assert all(policy.delay(5) <= 0.16 for _ in range(100))
@@ -0,0 +1,92 @@
+# Компилируемые схемы ответов helpers/schema.py: допустимые и недопустимые элементы
+# tests/harness/test_schema.py
+
+import allure
+import pytest
+
+from helpers.schema import RESOURCE_ATOM, Field, Obj, assert_valid_list, compile_schema
+
+ATOM = {
+    "id": 7,
+    "name": "Ядро vCPU",
+    "category": {
+        "id": 1,
+        "name": "Вычисления",
+        "unitMeasure": {"id": 2, "name": "шт"},
+        "typeRef": {"id": 3, "name": "CPU"},
+    },
+    "pool_id": 10,
+    "link_id": 5,
+    "min_count": 0,
+    "max_count": 64,
+    "cost_price_active": 120.5,
+    "cost_price_passive": 0,
+    "type_use": 1,
+    "create_time": {"date": "2025-07-16 10:00:00.000000", "timezone_type": 3, "timezone": "UTC"},
+    "update_time": {"date": "2025-07-16 10:00:00.000000", "timezone_type": 3, "timezone": "UTC"},
+    "create_user_id": 1,
+    "update_user_id": 1,
+    "duplicate": False,
+    "usedInTS": 0,
+}
+
+
+def with_changes(item, **changes):
+    item = {**item, "category": {**item["category"]}}
+    item.update(changes)
+    return item
+
+
+@allure.feature("Схемы ответов")
+def test_valid_atom_accepted():
+    assert compile_schema(RESOURCE_ATOM).errors(ATOM) == []
+
+
+@allure.feature("Схемы ответов")
+@pytest.mark.parametrize("changes, path, message", [
+    ({"id": 0}, "id", "id должен быть положительным"),
+    ({"name": 5}, "name", "ожидался str, получено int"),
+    ({"cost_price_active": None}, "cost_price_active", "получено null"),
+    ({"max_count": 0}, "<элемент>", "max_count должен быть больше min_count"),
+    ({"create_time": {"date": "2025-07-16"}}, "create_time.timezone", "отсутствует поле"),
+])
+def test_invalid_atom_rejected(changes, path, message):
+    errors = compile_schema(RESOURCE_ATOM).errors(with_changes(ATOM, **changes))
+    assert any(error_path == path and message in text for error_path, text in errors), errors
+
+
+@allure.feature("Схемы ответов")
+def test_nested_path_and_missing_field():
+    item = with_changes(ATOM)
+    del item["pool_id"]
+    item["category"]["unitMeasure"] = {"id": "2", "name": "шт"}
+    errors = compile_schema(RESOURCE_ATOM).errors(item)
+    assert ("pool_id", "отсутствует поле") in errors
+    assert ("category.unitMeasure.id", "ожидался int, получено str") in errors
+
+
+@allure.feature("Схемы ответов")
+def test_optional_nullable_and_list_fields():
+    validator = compile_schema(Obj({
+        "comment": Field(str, required=False, nullable=True),
+        "tags": [str],
+    }))
+    assert validator.errors({"tags": ["a", "b"]}) == []
+    assert validator.errors({"comment": None, "tags": []}) == []
+    assert validator.errors({"tags": ["a", 1]}) == [("tags[]", "ожидался str, получено int")]
+    assert validator.errors({"tags": "a"}) == [("tags", "ожидался список, получено str")]
+
+
+@allure.feature("Схемы ответов")
+def test_where_filters_checked():
+    validator = compile_schema({"pool_id": int}, where={"pool_id": 10})
+    assert validator.errors({"pool_id": 10}) == []
+    assert validator.errors({"pool_id": 11}) == [("pool_id", "11 ≠ фильтру 10")]
+
+
+@allure.feature("Схемы ответов")
+def test_assert_valid_list_counts_and_reports_all_items():
+    validator = compile_schema(RESOURCE_ATOM)
+    assert assert_valid_list(iter([ATOM, ATOM]), validator) == 2
+    with pytest.raises(AssertionError, match="2 из 3 элементов не соответствуют схеме"):
+        assert_valid_list([with_changes(ATOM, id=-1), ATOM, with_changes(ATOM, name=" ")], validator)
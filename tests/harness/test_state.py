@@ -0,0 +1,48 @@
+# Общее состояние прогона helpers/state.py: хранилище, окружение, файл состояния
+# tests/harness/test_state.py
+
+import allure
+
+from helpers import state
+
+
+@allure.feature("Состояние прогона")
+def test_environment_fallback(monkeypatch):
+    """Ключа нет в хранилище — значение из окружения; значение хранилища важнее"""
+    monkeypatch.setenv("ORGANIZATION_ID", "from-env")
+    monkeypatch.delenv("POOL_ID", raising=False)
+    run_state = state.RunState(state.StateStore())
+
+    assert run_state.get("ORGANIZATION_ID") == "from-env"
+    assert run_state.get("POOL_ID") is None
+    assert run_state.get("POOL_ID", "7") == "7"
+
+    run_state.set("ORGANIZATION_ID", 42)
+    assert run_state.get("ORGANIZATION_ID") == 42
+    run_state.delete("ORGANIZATION_ID")
+    assert run_state.get("ORGANIZATION_ID") == "from-env"
+
+
+@allure.feature("Состояние прогона")
+def test_stored_none_does_not_fall_back(monkeypatch):
+    monkeypatch.setenv("USER_ID", "from-env")
+    run_state = state.RunState(state.StateStore({"USER_ID": None}))
+    assert run_state.get("USER_ID") is None
+
+
+@allure.feature("Состояние прогона")
+def test_increment_returns_value_before():
+    run_state = state.RunState(state.StateStore())
+    assert run_state.increment("counter", 5, start=10) == 10
+    assert run_state.increment("counter") == 15
+    assert run_state.get("counter") == 16
+
+
+@allure.feature("Состояние прогона")
+def test_dump_and_load(tmp_path):
+    path = tmp_path / "state.json"
+    assert state.load(path) == {}
+    run_state = state.RunState(state.StateStore())
+    run_state.set("TARIFF_ID", "12")
+    state.dump(run_state, path)
+    assert state.RunState(state.StateStore(state.load(path))).get("TARIFF_ID") == "12"
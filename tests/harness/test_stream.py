@@ -0,0 +1,68 @@
+# Потоковый разбор JSON-массива helpers/stream.py при любых границах кусков
+# tests/harness/test_stream.py
+
+import json
+
+import allure
+import pytest
+
+from helpers.stream import ArrayStream, StreamError
+
+
+class FakeResponse:
+    """Тело ответа, которое iter_content отдаёт кусками по chunk_size байт"""
+
+    def __init__(self, body):
+        self.body = body
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+PAYLOADS = [
+    "[]",
+    "[2.5]",
+    "[10.5]",
+    "[1,22.5]",
+    "[-0.0]",
+    "[1e5, 2E-3, -7.25e+2, 0]",
+    " [ 1 , 2 ,\n3 ] ",
+    '[{"price": 12.75, "name": "Ядро vCPU"}, {"price": 1.0e2, "tags": ["a", "б"]}]',
+    '[true, false, null, "строка с \\"кавычками\\"", [1.5, [2.25]]]',
+]
+
+
+@allure.feature("Потоковый разбор JSON")
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_every_chunk_size(payload):
+    """Результат не зависит от того, где тело режется на куски"""
+    body = payload.encode("utf-8")
+    expected = json.loads(payload)
+    for chunk_size in range(1, len(body) + 1):
+        response = FakeResponse(body)
+        items = ArrayStream(response, chunk_size=chunk_size)
+        assert list(items) == expected, f"chunk_size={chunk_size}"
+        assert items.count == len(expected)
+        assert items.bytes == len(body)
+        assert response.closed
+
+
+@allure.feature("Потоковый разбор JSON")
+@pytest.mark.parametrize("payload", ["[1 2]", "[1,", "{}", "[1] 2", "[2.]"])
+def test_invalid_payload(payload):
+    body = payload.encode("utf-8")
+    for chunk_size in range(1, len(body) + 1):
+        with pytest.raises(StreamError):
+            list(ArrayStream(FakeResponse(body), chunk_size=chunk_size))
+
+
+@allure.feature("Потоковый разбор JSON")
+def test_sample_keeps_first_items():
+    items = ArrayStream(FakeResponse(b"[1, 2, 3, 4]"), chunk_size=3, keep=2)
+    assert list(items) == [1, 2, 3, 4]
+    assert items.sample == [1, 2]
@@ -0,0 +1,91 @@
+# Условные GET и учёт трафика helpers/traffic.py на поддельном адаптере
+# tests/harness/test_traffic.py
+
+import allure
+import requests
+from requests.adapters import BaseAdapter
+
+from helpers import traffic
+
+API = "http://stand.test/api/v1"
+
+
+class FakeAdapter(BaseAdapter):
+    """Стенд с ETag: на совпавший If-None-Match отвечает 304 без тела"""
+
+    def __init__(self, etag='"v1"', body=b'[{"id": 1}]'):
+        super().__init__()
+        self.etag = etag
+        self.body = body
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append((request.method, request.path_url, request.headers.get("If-None-Match")))
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if request.method == "GET" and request.headers.get("If-None-Match") == self.etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response.headers["ETag"] = self.etag
+            response._content = self.body
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
+
+
+def make_session(paths=None):
+    session = requests.Session()
+    inner = FakeAdapter()
+    session.mount("http://", inner)
+    stats = traffic.Traffic()
+    traffic.install(session, stats, traffic.ValidatorCache(paths=paths))
+    return session, inner, stats
+
+
+@allure.feature("Трафик API")
+def test_conditional_get_returns_cached_body():
+    """Повторный GET уходит с If-None-Match; на 304 тест получает 200 с запомненным телом"""
+    session, inner, stats = make_session()
+    first = session.get(f"{API}/roles")
+    second = session.get(f"{API}/roles")
+
+    assert inner.sent[1][2] == '"v1"'
+    assert second.status_code == 200
+    assert second.json() == first.json() == [{"id": 1}]
+    (counts,) = stats.export().values()
+    assert counts["responses"] == 2 and counts["not_modified"] == 1
+    assert counts["saved_bytes"] == len(inner.body)
+
+
+@allure.feature("Трафик API")
+def test_write_drops_validators():
+    session, inner, _ = make_session()
+    session.get(f"{API}/roles")
+    session.post(f"{API}/role", json={"name": "new"})
+    session.get(f"{API}/roles")
+    assert inner.sent[-1] == ("GET", "/api/v1/roles", None)
+
+
+@allure.feature("Трафик API")
+def test_reference_mode_skips_other_endpoints():
+    session, inner, _ = make_session(paths=traffic.REFERENCE_PATHS)
+    session.get(f"{API}/organizations")
+    session.get(f"{API}/organizations")
+    session.get(f"{API}/roles")
+    session.get(f"{API}/roles")
+    assert [sent[2] for sent in inner.sent] == [None, None, None, '"v1"']
+
+
+@allure.feature("Трафик API")
+def test_cache_size_limit():
+    cache = traffic.ValidatorCache(max_bytes=10)
+    cache.put("a", {"content": b"12345"})
+    cache.put("b", {"content": b"123456"})
+    assert cache.get("a") is None and cache.get("b") is not None
+    cache.put("c", {"content": b"x" * 11})
+    assert cache.get("c") is None
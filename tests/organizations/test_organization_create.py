@@ -2,61 +2,17 @@ import os
 import pytest
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv, set_key
+from dotenv import load_dotenv
 from pathlib import Path
-from faker import Faker
+from config import ENV_FILE
 
-# Инициализация Faker
-fake = Faker()
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 # Глобальные переменные для хранения данных
 CREATED_ORGANIZATION_DATA = {}
 CREATED_ORGANIZATION_ID = None
 
-@allure.step("Получение токена аутентификации")
-def get_auth_token(base_url, login, password, timeoutlive, domain):
-    """Получение токена аутентификации"""
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {"accept": "application/json"}
-    
-    allure.attach(
-        f"curl -X POST '{url}?login={login}&password=*****&timeoutlive={timeoutlive}&domain={domain}' "
-        f"-H 'accept: application/json'",
-        name="CURL команда",
-        attachment_type=allure.attachment_type.TEXT
-    )
-    
-    response = requests.post(url, headers=headers, params=params)
-    allure.attach(
-        f"Status Code: {response.status_code}\nResponse: {response.text}",
-        name="Response Details",
-        attachment_type=allure.attachment_type.TEXT
-    )
-    
-    response.raise_for_status()
-    token = response.json().get("tockenID")
-    
-    if token:
-        allure.attach(
-            f"Полученный токен (первые 10 символов): {token[:10]}...",
-            name="Токен",
-            attachment_type=allure.attachment_type.TEXT
-        )
-    
-    return token
-
 @allure.feature("Организации")
-def test_create_organization():
+def test_create_organization(auth_token, run_state, data_pool):
     """Тест создания организации со случайными данными"""
     global CREATED_ORGANIZATION_DATA, CREATED_ORGANIZATION_ID
     
@@ -66,44 +22,16 @@ def test_create_organization():
 
         # Получение параметров из .env
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
 
     with allure.step("Получение токена авторизации"):
-        token_id = get_auth_token(base_url, login, password, 600, domain)
+        token_id = auth_token
         assert token_id, "Не удалось получить tockenID"
 
     with allure.step("Генерация тестовых данных организации"):
-        CREATED_ORGANIZATION_DATA = {
-            "name": fake.company(),
-            "number_contract": str(fake.random_number(digits=10)),
-            "cid": str(fake.random_number(digits=4)),
-            "contract_begin_time": "2025-07-16",
-            "address": fake.address(),
-            "fact_address": fake.address(),
-            "contact_name": fake.name(),
-            "contact_data": fake.job(),
-            "contact_phone": fake.phone_number(),
-            "contact_mail": fake.email(),
-            "description": fake.text(),
-            "inn": str(fake.random_number(digits=10)),
-            "kpp": str(fake.random_number(digits=6)),
-            "bik": str(fake.random_number(digits=9)),
-            "pay_account": str(fake.random_number(digits=12)),
-            "kor_account": str(fake.random_number(digits=10)),
-            "bank_name": fake.company(),
-            "sub_right_ref_id": 2,
-            "manager_id": 434,
-            "tenant_id": 123,
-            "type_right_ref_id": 9
-        }
+        CREATED_ORGANIZATION_DATA = data_pool.lease("organization")
         
         allure.attach(
             str(CREATED_ORGANIZATION_DATA),
@@ -157,7 +85,7 @@ def test_create_organization():
 
     with allure.step("Сохранение ID организации"):
         CREATED_ORGANIZATION_ID = str(response_data["id"])
-        set_key(ENV_FILE, "ORGANIZATION_ID", CREATED_ORGANIZATION_ID)
+        run_state.set("ORGANIZATION_ID", CREATED_ORGANIZATION_ID)
         
         allure.attach(
             f"ID созданной организации: {CREATED_ORGANIZATION_ID}",
@@ -166,7 +94,7 @@ def test_create_organization():
         )
 
 @allure.feature("Организации")
-def test_verify_created_organization():
+def test_verify_created_organization(auth_token, run_state, db_verify):
     """Тест проверки созданной организации"""
     global CREATED_ORGANIZATION_DATA, CREATED_ORGANIZATION_ID
     
@@ -174,16 +102,13 @@ def test_verify_created_organization():
         assert CREATED_ORGANIZATION_ID is not None, "ID организации не был сохранен в переменной"
         
         load_dotenv(ENV_FILE)
-        assert os.getenv("ORGANIZATION_ID"), "ID организации не найден в .env файле"
+        assert run_state.get("ORGANIZATION_ID"), "ID организации не найден в .env файле"
 
     with allure.step("Подготовка тестовых данных"):
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
 
     with allure.step("Получение токена авторизации"):
-        token_id = get_auth_token(base_url, login, password, 600, domain)
+        token_id = auth_token
         assert token_id, "Не удалось получить tockenID"
 
     with allure.step("Отправка запроса на получение информации об организации"):
@@ -256,6 +181,15 @@ def test_verify_created_organization():
             attachment_type=allure.attachment_type.JSON
         )
 
+    if db_verify.enabled:
+        with allure.step("Проверка записи организации в БД"):
+            db_verify.created(
+                "organization",
+                CREATED_ORGANIZATION_ID,
+                {field: CREATED_ORGANIZATION_DATA[field] for field in fields_to_check}
+            )
+            db_verify.check()
+
     with allure.step("Проверка даты начала контракта"):
         contract_time = organization_data.get("contract_begin_time")
         expected_date = CREATED_ORGANIZATION_DATA["contract_begin_time"]
@@ -2,58 +2,13 @@ import os
 import pytest
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-@allure.step("Получение токена аутентификации")
-def get_auth_token(base_url, login, password, timeoutlive, domain):
-    """Получение токена аутентификации"""
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": "******",  # Скрываем пароль в логах
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {"accept": "application/json"}
-    
-    # Логируем curl команду (без реального пароля)
-    allure.attach(
-        f"curl -X POST '{url}?login={login}&password=******&timeoutlive={timeoutlive}&domain={domain}' "
-        f"-H 'accept: application/json'",
-        name="CURL команда для получения токена",
-        attachment_type=allure.attachment_type.TEXT
-    )
-    
-    # Отправляем реальный запрос с паролем
-    real_params = params.copy()
-    real_params["password"] = password
-    response = requests.post(url, headers=headers, params=real_params)
-    
-    allure.attach(
-        f"Status Code: {response.status_code}\nResponse: {response.text}",
-        name="Ответ сервера",
-        attachment_type=allure.attachment_type.TEXT
-    )
-    
-    response.raise_for_status()
-    token = response.json().get("tockenID")
-    
-    if token:
-        allure.attach(
-            f"Полученный токен (первые 10 символов): {token[:10]}...",
-            name="Токен доступа",
-            attachment_type=allure.attachment_type.TEXT
-        )
-    
-    return token
 
 @allure.title("Удаление организации")
-def test_delete_organization():
+def test_delete_organization(auth_token, run_state, db_verify):
     """Тест удаления организации"""
     with allure.step("Подготовка тестовых данных"):
         # Загрузка переменных окружения
@@ -61,20 +16,14 @@ def test_delete_organization():
 
         # Получение параметров из .env
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
-        organization_id = os.getenv("ORGANIZATION_ID")
+        organization_id = run_state.get("ORGANIZATION_ID")
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert organization_id, "ORGANIZATION_ID не задан в .env"
 
     with allure.step("Получение токена авторизации"):
-        token_id = get_auth_token(base_url, login, password, 600, domain)
+        token_id = auth_token
         assert token_id, "Не удалось получить tockenID"
 
     with allure.step("Формирование запроса на удаление"):
@@ -132,6 +81,11 @@ def test_delete_organization():
             attachment_type=allure.attachment_type.TEXT
         )
 
+    if db_verify.enabled:
+        with allure.step("Проверка удаления организации в БД"):
+            db_verify.deleted("organization", organization_id)
+            db_verify.check()
+
     with allure.step("Финализация теста"):
         allure.attach(
             f"Организация с ID {organization_id} успешно удалена",
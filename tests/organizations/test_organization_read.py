@@ -2,48 +2,14 @@ import os
 import pytest
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
 from allure_commons.types import AttachmentType
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-def get_auth_token(login, password, timeoutlive, domain):
-    """
-    Получение токена аутентификации
-    """
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {
-        "accept": "application/json"
-    }
-    
-    with allure.step("Отправка запроса для получения токена"):
-        allure.attach(f"URL: {url}", name="Request URL", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(headers), name="Request Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(params), name="Request Params", attachment_type=AttachmentType.TEXT)
-        
-        response = requests.post(url, headers=headers, params=params)
-        
-        allure.attach(str(response.status_code), name="Response Status Code", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.headers), name="Response Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.text), name="Response Body", attachment_type=AttachmentType.TEXT)
-        
-    response.raise_for_status()  
-
-    token_data = response.json()
-    return token_data.get("tockenID")  
 
 @allure.story("Получение информации об организации")
-def test_get_organization_by_id():
+def test_get_organization_by_id(auth_token, run_state):
     """
     Тест получения информации об организации по её ID
     Проверяет:
@@ -52,25 +18,19 @@ def test_get_organization_by_id():
     """
     with allure.step("Загрузка переменных окружения"):
         load_dotenv(ENV_FILE, override=True)
-        organization_id = os.getenv("ORGANIZATION_ID")
+        organization_id = run_state.get("ORGANIZATION_ID")
     assert organization_id, "ORGANIZATION_ID не найден в .env"
 
     with allure.step("Получение параметров из .env"):
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
-        organization_id = os.getenv("ORGANIZATION_ID")
+        organization_id = run_state.get("ORGANIZATION_ID")
 
     with allure.step("Проверка обязательных переменных окружения"):
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert organization_id, "ORGANIZATION_ID не задан в .env"
 
     with allure.step("Получение токена аутентификации"):
-        token = get_auth_token(login, password, 600, domain)
+        token = auth_token
         assert token, "Не удалось получить токен"
 
     with allure.step("Формирование запроса для получения информации об организации"):
@@ -2,19 +2,13 @@ import os
 import pytest
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
-from faker import Faker
+from config import ENV_FILE
 
-# Инициализация Faker
-fake = Faker()
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Организации")
-def test_update_organization():
+def test_update_organization(auth_token, run_state):
     """Тест обновления организации"""
     with allure.step("Подготовка тестовых данных"):
         # Загрузка переменных окружения
@@ -22,20 +16,14 @@ def test_update_organization():
 
         # Получение параметров из .env
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
-        organization_id = os.getenv("ORGANIZATION_ID") or "388"  # Используем переданный ID или 388 по умолчанию
+        organization_id = run_state.get("ORGANIZATION_ID") or "388"  # Используем переданный ID или 388 по умолчанию
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert organization_id, "ORGANIZATION_ID не задан в .env"
 
     with allure.step("Получение токена авторизации"):
-        token_id = get_auth_token(base_url, login, password, 600, domain)
+        token_id = auth_token
         assert token_id, "Не удалось получить tockenID"
 
     with allure.step("Подготовка данных для обновления"):
@@ -120,40 +108,3 @@ def test_update_organization():
                 f"Ожидалось: {expected_value}, Получено: {updated_organization.get(field)}"
             )
 
-@allure.step("Получение токена аутентификации")
-def get_auth_token(base_url, login, password, timeoutlive, domain):
-    """Получение токена аутентификации"""
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {"accept": "application/json"}
-    
-    allure.attach(
-        f"curl -X POST '{url}?login={login}&password=*****&timeoutlive={timeoutlive}&domain={domain}' "
-        f"-H 'accept: application/json'",
-        name="CURL команда",
-        attachment_type=allure.attachment_type.TEXT
-    )
-    
-    response = requests.post(url, headers=headers, params=params)
-    allure.attach(
-        f"Status Code: {response.status_code}\nResponse: {response.text}",
-        name="Response Details",
-        attachment_type=allure.attachment_type.TEXT
-    )
-    
-    response.raise_for_status()
-    token = response.json().get("tockenID")
-    
-    if token:
-        allure.attach(
-            f"Полученный токен (первые 10 символов): {token[:10]}...",
-            name="Токен",
-            attachment_type=allure.attachment_type.TEXT
-        )
-    
-    return token
\ No newline at end of file
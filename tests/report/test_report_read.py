@@ -6,69 +6,23 @@ import requests
 import pytest
 import allure
 from datetime import datetime, timedelta
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login: str, password: str, timeoutlive: int, domain: str) -> str:
-    """Получение токена аутентификации через API"""
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {"accept": "application/json"}
-
-    with allure.step("🔐 Получение токена аутентификации"):
-        allure.attach(f"URL: {url}", "Request URL", allure.attachment_type.TEXT)
-        allure.attach(json.dumps(params, indent=2, ensure_ascii=False), "Request Params", allure.attachment_type.JSON)
-        allure.attach(json.dumps(headers, indent=2, ensure_ascii=False), "Request Headers", allure.attachment_type.JSON)
-
-        try:
-            response = requests.post(url, headers=headers, params=params, timeout=10)
-            allure.attach(str(response.status_code), "Status Code", allure.attachment_type.TEXT)
-            allure.attach(response.text, "Response Body", allure.attachment_type.TEXT)
-            response.raise_for_status()
-
-            token_data = response.json()
-            tocken_id = token_data.get("tockenID")
-            if not tocken_id:
-                raise KeyError("Поле 'tockenID' отсутствует в ответе API")
-
-            allure.attach(tocken_id, "✅ Успешно получен tockenID", allure.attachment_type.TEXT)
-            return tocken_id
-
-        except Exception as e:
-            allure.attach(str(e), "❌ Ошибка запроса", allure.attachment_type.TEXT)
-            pytest.fail(f"❌ Не удалось получить токен: {e}")
+from helpers.attachments import attach_json
+from config import ENV_FILE
 
 
 @allure.feature("Отчёты по организациям")
-def test_get_services_report_for_organization():
+def test_get_services_report_for_organization(auth_token, run_state):
     """Получение отчёта по услугам для организации (ORGANIZATION_ID из .env) за последние 6 месяцев"""
     with allure.step("🔧 Подготовка тестовых данных из .env"):
         load_dotenv(ENV_FILE)
 
         base_url = os.getenv("API_URL")
-        org_id_str = os.getenv("ORGANIZATION_ID")
-
-        login = os.getenv("API_LOGIN")        
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
-        timeoutlive = int(os.getenv("TOKEN_TIMEOUT", 3600))
+        org_id_str = run_state.get("ORGANIZATION_ID")
 
         assert base_url, "❌ API_URL не задан в .env"
         assert org_id_str, "❌ ORGANIZATION_ID не задан в .env"
-        assert login, "❌ API_LOGIN не задан в .env"
-        assert password, "❌ API_PASSWORD не задан в .env"
-        assert domain, "❌ API_DOMAIN не задан в .env"
 
         try:
             org_id = int(org_id_str)
@@ -77,9 +31,7 @@ def test_get_services_report_for_organization():
 
         allure.attach(
             f"API_URL: {base_url}\n"
-            f"ORGANIZATION_ID: {org_id}\n"
-            f"API_LOGIN: {login}\n"
-            f"DOMAIN: {domain}",
+            f"ORGANIZATION_ID: {org_id}",
             "📋 Загруженные данные",
             allure.attachment_type.TEXT
         )
@@ -98,7 +50,7 @@ def test_get_services_report_for_organization():
         allure.attach(date_info, "🗓 Рассчитанные даты", allure.attachment_type.TEXT)
 
     with allure.step("🔑 Получение токена через API"):
-        token = get_auth_token(login, password, timeoutlive, domain)
+        token = auth_token
         assert token, "❌ Токен не был получен"
 
     # 📥 Формируем запрос
@@ -143,11 +95,7 @@ def test_get_services_report_for_organization():
         except ValueError:
             pytest.fail("❌ Ответ не является валидным JSON")
 
-        allure.attach(
-            json.dumps(report_data, ensure_ascii=False, indent=2),
-            "📊 Полный ответ API",
-            allure.attachment_type.JSON
-        )
+        attach_json(report_data, "📊 Полный ответ API")
 
     with allure.step("✅ Валидация структуры отчёта"):
         assert isinstance(report_data, dict), "Ответ должен быть объектом"
@@ -166,11 +114,7 @@ def test_get_services_report_for_organization():
             assert response_org_id == org_id, \
                 f"❌ ID организации не совпадает: ожидаем {org_id}, получено {response_org_id}"
 
-            allure.attach(
-                json.dumps(org_info, ensure_ascii=False, indent=2),
-                "🏢 Данные организации",
-                allure.attachment_type.JSON
-            )
+            attach_json(org_info, "🏢 Данные организации")
 
         assert "begin_date" in header, "❌ Отсутствует begin_date в header"
         assert "end_date" in header, "❌ Отсутствует end_date в header"
@@ -194,11 +138,7 @@ def test_get_services_report_for_organization():
                         assert "unit" in item
                         assert "cost" in item
                     if i == 0:
-                        allure.attach(
-                            json.dumps(item, ensure_ascii=False, indent=2),
-                            "📄 Пример услуги (первый элемент)",
-                            allure.attachment_type.JSON
-                        )
+                        attach_json(item, "📄 Пример услуги (первый элемент)")
         else:
             with allure.step("🟡 Список услуг пуст"):
                 allure.attach(
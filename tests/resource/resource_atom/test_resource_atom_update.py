@@ -3,49 +3,14 @@ import os
 import pytest
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login, password, timeoutlive, domain):
-    """
-    Получение токена аутентификации
-    """
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {
-        "accept": "application/json"
-    }
-
-    with allure.step("Отправка запроса для получения токена"):
-        allure.attach(f"URL: {url}", name="Request URL", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(headers), name="Request Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(params), name="Request Params", attachment_type=AttachmentType.TEXT)
-
-        response = requests.post(url, headers=headers, params=params)
-
-        allure.attach(str(response.status_code), name="Response Status Code", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.headers), name="Response Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.text), name="Response Body", attachment_type=AttachmentType.TEXT)
-
-    response.raise_for_status()
-    token_data = response.json()
-    return token_data.get("tockenID")
+from config import ENV_FILE
 
 
 @allure.story("Обновление атомарного ресурса по ID (PUT)")
-def test_update_resource_atom_by_id():
+def test_update_resource_atom_by_id(auth_token, run_state):
     """
     Тест обновления атомарного ресурса через PUT /api/v1/resource_atom/{id}
     Проверяет:
@@ -59,16 +24,10 @@ def test_update_resource_atom_by_id():
 
     with allure.step("Чтение параметров из .env"):
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
-        resource_atom_id = os.getenv("RESOURCE_ATOM_ID", "1")  # Можно задать в .env
+        resource_atom_id = run_state.get("RESOURCE_ATOM_ID", "1")  # Можно задать в .env
 
     with allure.step("Проверка обязательных переменных окружения"):
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert resource_atom_id, "RESOURCE_ATOM_ID не задан"
 
     try:
@@ -78,7 +37,7 @@ def test_update_resource_atom_by_id():
         pytest.fail("RESOURCE_ATOM_ID должен быть целым положительным числом")
 
     with allure.step("Получение токена аутентификации"):
-        token = get_auth_token(login, password, 600, domain)
+        token = auth_token
         assert token, "Не удалось получить токен аутентификации"
 
     with allure.step(f"Формирование тела запроса для обновления resource_atom (ID={resource_atom_id})"):
@@ -5,56 +5,15 @@ import json
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login, password, timeoutlive, domain):
-    """
-    Получение токена аутентификации
-    """
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {"accept": "application/json"}
-
-    with allure.step("🔐 Получение токена аутентификации"):
-        allure.attach(f"URL: {url}", "Request URL", AttachmentType.TEXT)
-        allure.attach(json.dumps(headers, indent=2), "Request Headers", AttachmentType.JSON)
-        allure.attach(json.dumps(params, indent=2), "Request Params", AttachmentType.JSON)
-
-        response = requests.post(url, headers=headers, params=params)
-
-        allure.attach(str(response.status_code), "Status Code", AttachmentType.TEXT)
-        allure.attach(str(response.headers), "Response Headers", AttachmentType.TEXT)
-        allure.attach(response.text, "Response Body", AttachmentType.TEXT)
-
-        response.raise_for_status()
-
-        try:
-            token_data = response.json()
-        except ValueError:
-            pytest.fail("Ответ на запрос токена не является валидным JSON")
-
-        tocken_id = token_data.get("tockenID")
-        assert tocken_id, "Поле 'tockenID' отсутствует в ответе"
-
-        allure.attach(tocken_id, "✅ Получен tockenID", AttachmentType.TEXT)
-        return tocken_id
+from helpers.attachments import attach_json
+from config import ENV_FILE
 
 
 @allure.story("Получение списка всех категорий ресурсов")
-def test_get_resource_categories_list():
+def test_get_resource_categories_list(auth_token):
     """
     Тест: получение списка всех категорий ресурсов
     Эндпоинт: GET /api/v1/resource_categoryes_ref
@@ -80,18 +39,12 @@ def test_get_resource_categories_list():
         )
 
     base_url = os.getenv("API_URL")
-    login = os.getenv("API_LOGIN")
-    password = os.getenv("API_PASSWORD")
-    domain = os.getenv("API_DOMAIN")
 
     with allure.step("✅ Проверка обязательных переменных"):
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
 
     with allure.step("🔑 Получение токена"):
-        token = get_auth_token(login, password, 600, domain)
+        token = auth_token
         assert token, "Не удалось получить токен"
 
     with allure.step("📡 Формирование запроса"):
@@ -122,11 +75,7 @@ def test_get_resource_categories_list():
         except ValueError:
             pytest.fail("Ответ не является валидным JSON")
 
-        allure.attach(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            "Parsed Response Data",
-            AttachmentType.JSON
-        )
+        attach_json(data, "Parsed Response Data")
 
         assert isinstance(data, list), "Ожидался массив категорий"
 
@@ -3,74 +3,14 @@ import os
 import pytest
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login, password, timeoutlive, domain):
-    """
-    Получение токена аутентификации
-    """
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {
-        "accept": "application/json"
-    }
-
-    with allure.step("Отправка запроса для получения токена"):
-        allure.attach(f"URL: {url}", name="Request URL", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(headers), name="Request Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(params), name="Request Params", attachment_type=AttachmentType.TEXT)
-
-        response = requests.post(url, headers=headers, params=params)
-
-        allure.attach(str(response.status_code), name="Response Status Code", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.headers), name="Response Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.text), name="Response Body", attachment_type=AttachmentType.TEXT)
-
-    response.raise_for_status()
-    token_data = response.json()
-    return token_data.get("tockenID")
-
-
-def write_env_var(key: str, value: str, env_file: str = ".env"):
-    """
-    Обновляет или добавляет переменную в .env файл
-    """
-    env_path = Path(env_file)
-    lines = []
-
-    if env_path.exists():
-        with open(env_path, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-
-    with open(env_path, "w", encoding="utf-8") as file:
-        var_set = False
-        for line in lines:
-            # Пропускаем пустые строки и комментарии
-            stripped = line.strip()
-            if stripped.startswith(f"{key}="):
-                file.write(f"{key}={value}\n")
-                var_set = True
-            else:
-                file.write(line)
-        if not var_set:
-            file.write(f"{key}={value}\n")
+from config import ENV_FILE
 
 
 @allure.story("Создание нового пула ресурсов")
-def test_create_resource_pool():
+def test_create_resource_pool(auth_token, run_state):
     """
     Тест: создание нового пула ресурсов
     Эндпоинт: POST /api/v1/resource_pool
@@ -83,9 +23,6 @@ def test_create_resource_pool():
 
     with allure.step("Чтение параметров из .env"):
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
 
         # Параметры для создания пула
         name = os.getenv("POOL_NAME", "Тестовый пул ресурсов")
@@ -97,9 +34,6 @@ def test_create_resource_pool():
 
     with allure.step("Проверка обязательных переменных окружения"):
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert name.strip(), "POOL_NAME не может быть пустым"
 
     # Приведение типов
@@ -117,7 +51,7 @@ def test_create_resource_pool():
     assert type_service_id > 0, "type_service_id должен быть положительным"
 
     with allure.step("Получение токена аутентификации"):
-        token = get_auth_token(login, password, 600, domain)
+        token = auth_token
         assert token, "Не удалось получить токен аутентификации"
 
     with allure.step("Формирование тела запроса"):
@@ -169,7 +103,7 @@ def test_create_resource_pool():
         assert created_id > 0, "Поле 'id' должно быть положительным"
 
     with allure.step(f"Сохранение ID={created_id} в .env файл"):
-        write_env_var("POOL_ID", str(created_id), env_file=ENV_FILE)
+        run_state.set("POOL_ID", str(created_id))
         allure.attach(
             f"Сохранено в .env: POOL_ID='{created_id}'",
             name="Сохранение ID",
@@ -3,48 +3,13 @@ import os
 import pytest
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login, password, timeoutlive, domain):
-    """
-    Получение токена аутентификации
-    """
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {
-        "accept": "application/json"
-    }
-
-    with allure.step("Отправка запроса для получения токена"):
-        allure.attach(f"URL: {url}", name="Request URL", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(headers), name="Request Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(params), name="Request Params", attachment_type=AttachmentType.TEXT)
-
-        response = requests.post(url, headers=headers, params=params)
-
-        allure.attach(str(response.status_code), name="Response Status Code", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.headers), name="Response Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.text), name="Response Body", attachment_type=AttachmentType.TEXT)
-
-    response.raise_for_status()
-    token_data = response.json()
-    return token_data.get("tockenID")
+from config import ENV_FILE
 
 
 @allure.story("Обновление информации о пуле ресурсов")
-def test_update_resource_pool():
+def test_update_resource_pool(auth_token, run_state):
     """
     Тест: обновление существующего пула ресурсов по ID
     Эндпоинт: PUT /api/v1/resource_pool/{id}
@@ -60,10 +25,7 @@ def test_update_resource_pool():
 
     with allure.step("Чтение параметров из .env"):
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
-        pool_id = os.getenv("POOL_ID")
+        pool_id = run_state.get("POOL_ID")
         name = os.getenv("UPDATE_POOL_NAME", "Обновлённый пул")
         description = os.getenv("UPDATE_POOL_DESCRIPTION", "Обновлённое описание пула")
         status_id = os.getenv("UPDATE_POOL_STATUS_ID", "3")
@@ -73,9 +35,6 @@ def test_update_resource_pool():
 
     with allure.step("Проверка обязательных переменных окружения"):
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert pool_id, "POOL_ID не задан в .env"
         assert name.strip(), "UPDATE_POOL_NAME не может быть пустым"
 
@@ -96,7 +55,7 @@ def test_update_resource_pool():
     assert type_service_id > 0, "UPDATE_POOL_TYPE_SERVICE_ID должен быть положительным"
 
     with allure.step("Получение токена аутентификации"):
-        token = get_auth_token(login, password, 600, domain)
+        token = auth_token
         assert token, "Не удалось получить токен аутентификации"
 
     with allure.step("Формирование тела запроса (новые значения)"):
@@ -3,49 +3,14 @@ import os
 import pytest
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login, password, timeoutlive, domain):
-    """
-    Получение токена аутентификации (как в предыдущих тестах)
-    """
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {
-        "accept": "application/json"
-    }
-
-    with allure.step("Отправка запроса для получения токена"):
-        allure.attach(f"URL: {url}", name="Request URL", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(headers), name="Request Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(params), name="Request Params", attachment_type=AttachmentType.TEXT)
-
-        response = requests.post(url, headers=headers, params=params)
-
-        allure.attach(str(response.status_code), name="Response Status Code", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.headers), name="Response Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.text), name="Response Body", attachment_type=AttachmentType.TEXT)
-
-    response.raise_for_status()
-    token_data = response.json()
-    return token_data.get("tockenID")  
+from config import ENV_FILE
 
 
 @allure.story("Обновление связи между пулом ресурсов и атомом")
-def test_update_resource_pool_atom_link():
+def test_update_resource_pool_atom_link(auth_token):
     """
     Тест: обновление существующей связи по ID
     Эндпоинт: PUT /api/v1/resource_pool_link_atom/{id}
@@ -61,9 +26,6 @@ def test_update_resource_pool_atom_link():
 
     with allure.step("Чтение параметров из .env"):
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
 
         # ID связи для обновления
         link_id = os.getenv("RESOURCE_POOL_LINK_ID_TO_UPDATE")
@@ -79,9 +41,6 @@ def test_update_resource_pool_atom_link():
 
     with allure.step("Проверка обязательных переменных окружения"):
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert link_id, "RESOURCE_POOL_LINK_ID_TO_UPDATE не задан в .env"
         assert pool_id, "UPDATE_POOL_ID не задан в .env"
         assert atom_id, "UPDATE_ATOM_ID не задан в .env"
@@ -108,7 +67,7 @@ def test_update_resource_pool_atom_link():
     assert type_use in [0, 1, 2], "TYPE_USE должен быть 0, 1 или 2 (уточни по документации)"
 
     with allure.step("Получение токена аутентификации"):
-        token = get_auth_token(login, password, 600, domain)
+        token = auth_token
         assert token, "Не удалось получить токен аутентификации"
 
     with allure.step("Формирование тела запроса (новые значения)"):
@@ -2,44 +2,13 @@ import os
 import requests
 import allure
 import pytest
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login, password, timeoutlive, domain):
-    """
-    Получение токена аутентификации
-    """
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {
-        "accept": "application/json"
-    }
-
-    with allure.step("Отправка запроса для получения токена"):
-        allure.attach(f"URL: {url}", name="Request URL", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(headers), name="Request Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(params), name="Request Params", attachment_type=AttachmentType.TEXT)
-
-        response = requests.post(url, headers=headers, params=params)
-        response.raise_for_status()
-
-        token_data = response.json()
-        return token_data.get("tockenID")
+from config import ENV_FILE
 
 
 @allure.story("Получение списка пулов ресурсов с фильтрацией")
-def test_get_resource_pools_filtered():
+def test_get_resource_pools_filtered(auth_token):
     """
     Тест проверяет:
     1. Получение пулов ресурсов с фильтрами by_service_id и by_location_id
@@ -52,9 +21,6 @@ def test_get_resource_pools_filtered():
 
     with allure.step("Чтение параметров из .env"):
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
 
         # Значения фильтров — из .env или по умолчанию
         service_id = os.getenv("FILTER_BY_SERVICE_ID", "414")
@@ -62,9 +28,6 @@ def test_get_resource_pools_filtered():
 
     with allure.step("Проверка обязательных переменных окружения"):
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert service_id, "FILTER_BY_SERVICE_ID не задан"
         assert location_id, "FILTER_BY_LOCATION_ID не задан"
 
@@ -77,7 +40,7 @@ def test_get_resource_pools_filtered():
         pytest.fail("FILTER_BY_SERVICE_ID и FILTER_BY_LOCATION_ID должны быть целыми числами")
 
     with allure.step("Получение токена аутентификации"):
-        token = get_auth_token(login, password, 600, domain)
+        token = auth_token
         assert token, "Не удалось получить токен аутентификации"
 
     with allure.step("Формирование параметров запроса"):
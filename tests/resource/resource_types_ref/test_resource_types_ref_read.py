@@ -5,48 +5,14 @@ import pytest
 import json
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login, password, timeoutlive, domain):
-    """
-    Получение токена аутентификации
-    """
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {
-        "accept": "application/json"
-    }
-
-    with allure.step("Отправка запроса для получения токена"):
-        allure.attach(f"URL: {url}", name="Request URL", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(headers), name="Request Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(params), name="Request Params", attachment_type=AttachmentType.TEXT)
-
-        response = requests.post(url, headers=headers, params=params)
-
-        allure.attach(str(response.status_code), name="Response Status Code", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.headers), name="Response Headers", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.text), name="Response Body", attachment_type=AttachmentType.TEXT)
-
-    response.raise_for_status()
-    token_data = response.json()
-    return token_data.get("tockenID")  # Обратите внимание на опечатку: tockenID
+from helpers.attachments import attach_json
+from config import ENV_FILE
 
 
 @allure.story("Получение справочника типов ресурсов (resource_types_ref)")
-def test_get_resource_types_ref():
+def test_get_resource_types_ref(auth_token):
     """
     Тест получения списка всех типов ресурсов (справочник)
     Проверяет:
@@ -61,18 +27,12 @@ def test_get_resource_types_ref():
 
     with allure.step("Чтение параметров из .env"):
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
 
     with allure.step("Проверка обязательных переменных окружения"):
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
 
     with allure.step("Получение токена аутентификации"):
-        token = get_auth_token(login, password, 600, domain)
+        token = auth_token
         assert token, "Не удалось получить токен аутентификации"
 
     with allure.step("Формирование URL и заголовков"):
@@ -82,11 +42,7 @@ def test_get_resource_types_ref():
             "tockenid": token
         }
         allure.attach(url, name="Request URL", attachment_type=AttachmentType.TEXT)
-        allure.attach(
-            json.dumps(headers, ensure_ascii=False, indent=2),
-            name="Request Headers",
-            attachment_type=AttachmentType.JSON
-        )
+        attach_json(headers, "Request Headers")
 
     with allure.step("Отправка GET-запроса к /resource_types_ref"):
         response = requests.get(url, headers=headers)
@@ -110,11 +66,7 @@ def test_get_resource_types_ref():
         except ValueError:
             pytest.fail("Ответ не является валидным JSON")
 
-        allure.attach(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            name="Parsed Response Data",
-            attachment_type=AttachmentType.JSON
-        )
+        attach_json(data, "Parsed Response Data")
 
         assert isinstance(data, list), "Ожидался массив типов ресурсов"
 
@@ -2,48 +2,13 @@ import os
 import pytest
 import requests
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login, password, timeoutlive, domain):
-    """
-    Получение токена аутентификации
-    """
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {
-        "accept": "application/json"
-    }
-
-    with allure.step("Отправка запроса для получения токена"):
-        allure.attach(f"URL: {url}", name="URL запроса", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(headers), name="Заголовки запроса", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(params), name="Параметры запроса", attachment_type=AttachmentType.TEXT)
-
-        response = requests.post(url, headers=headers, params=params)
-
-        allure.attach(str(response.status_code), name="Код статуса ответа", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.headers), name="Заголовки ответа", attachment_type=AttachmentType.TEXT)
-        allure.attach(str(response.text), name="Тело ответа", attachment_type=AttachmentType.TEXT)
-
-    response.raise_for_status()
-    token_data = response.json()
-    return token_data.get("tockenID")
+from config import ENV_FILE
 
 
 @allure.story("Удаление единицы измерения по ID (DELETE)")
-def test_delete_resource_unit_measure_by_id():
+def test_delete_resource_unit_measure_by_id(auth_token):
     """
     Тест удаления единицы измерения через DELETE /api/v1/resource_unit_measure/{id}
     Проверяет:
@@ -56,16 +21,10 @@ def test_delete_resource_unit_measure_by_id():
 
     with allure.step("Чтение параметров из .env"):
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
         unit_id = os.getenv("RESOURCE_UNIT_MEASURE_ID", "123112")  # Можно задать в .env
 
     with allure.step("Проверка обязательных переменных окружения"):
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
         assert unit_id, "RESOURCE_UNIT_MEASURE_ID не задан"
 
     try:
@@ -75,7 +34,7 @@ def test_delete_resource_unit_measure_by_id():
         pytest.skip("RESOURCE_UNIT_MEASURE_ID должен быть целым положительным числом")
 
     with allure.step("Получение токена аутентификации"):
-        token = get_auth_token(login, password, 600, domain)
+        token = auth_token
         assert token, "Не удалось получить токен аутентификации"
 
     # === Проверка доступности endpoint: отправляем GET или DELETE с "холодным" запросом ===
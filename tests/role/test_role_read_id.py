@@ -5,38 +5,9 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login: str, password: str, timeoutlive: int, domain: str) -> str:
-    """Получение токена аутентификации"""
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {"accept": "application/json"}
-
-    with allure.step("Получение токена аутентификации"):
-        allure.attach(f"URL: {url}", "Request URL", allure.attachment_type.TEXT)
-        allure.attach(str(params), "Request Params", allure.attachment_type.JSON)
-        allure.attach(str(headers), "Request Headers", allure.attachment_type.JSON)
-
-        response = requests.post(url, headers=headers, params=params)
-        allure.attach(str(response.status_code), "Status Code", allure.attachment_type.TEXT)
-        allure.attach(response.text, "Response Body", allure.attachment_type.TEXT)
-
-        response.raise_for_status()
-        token_data = response.json()
-        return token_data.get("tockenID")
+from config import ENV_FILE
 
 
 # 📚 Ожидаемые значения ролей
@@ -72,28 +43,16 @@ EXPECTED_ROLES = {
 class TestGetRoles:
     """Тестирование получения ролей по ID от 1 до 6"""
 
-    def setup_class(self):
-        """Подготовка данных: загрузка .env и получение токена"""
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_token):
+        """Подготовка данных: загрузка .env и токен из общего брокера"""
         load_dotenv(ENV_FILE)
 
         self.base_url = os.getenv("API_URL")
-        self.login = os.getenv("API_LOGIN")
-        self.password = os.getenv("API_PASSWORD")
-        self.domain = os.getenv("API_DOMAIN")
-
         assert self.base_url, "API_URL не задан в .env"
-        assert self.login, "API_LOGIN не задан в .env"
-        assert self.password, "API_PASSWORD не задан в .env"
-        assert self.domain, "API_DOMAIN не задан в .env"
-
-        # Получаем токен
-        with allure.step("Автоматическое получение токена"):
-            try:
-                self.token = get_auth_token(self.login, self.password, 600, self.domain)
-                assert self.token, "Не удалось получить токен аутентификации"
-                allure.attach(self.token, "Полученный токен", allure.attachment_type.TEXT)
-            except Exception as e:
-                pytest.fail(f"Ошибка при получении токена: {e}")
+
+        self.token = auth_token
+        allure.attach(self.token, "Полученный токен", allure.attachment_type.TEXT)
 
         self.headers = {
             "accept": "*/*",
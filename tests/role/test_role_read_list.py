@@ -6,59 +6,24 @@ import json
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-
-def get_auth_token(login: str, password: str, timeoutlive: int, domain: str) -> str:
-    """Получение токена аутентификации"""
-    base_url = os.getenv("API_URL")
-    url = f"{base_url}/api/v1/tocken"
-    params = {
-        "login": login,
-        "password": password,
-        "timeoutlive": timeoutlive,
-        "domain": domain
-    }
-    headers = {"accept": "application/json"}
-
-    with allure.step("Получение токена аутентификации"):
-        allure.attach(f"URL: {url}", "Request URL", allure.attachment_type.TEXT)
-        allure.attach(json.dumps(params, indent=2), "Request Params", allure.attachment_type.JSON)
-        allure.attach(json.dumps(headers, indent=2), "Request Headers", allure.attachment_type.JSON)
-
-        response = requests.post(url, headers=headers, params=params)
-        allure.attach(str(response.status_code), "Status Code", allure.attachment_type.TEXT)
-        allure.attach(response.text, "Response Body", allure.attachment_type.TEXT)
-
-        response.raise_for_status()
-        token_data = response.json()
-        return token_data.get("tockenID")
+from config import ENV_FILE
 
 
 @allure.feature("Получение списка ролей")
-def test_get_all_roles():
+def test_get_all_roles(auth_token):
     """Получение списка всех ролей из системы и проверка, что их ровно 6"""
     with allure.step("Загрузка переменных окружения"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        login = os.getenv("API_LOGIN")
-        password = os.getenv("API_PASSWORD")
-        domain = os.getenv("API_DOMAIN")
 
         assert base_url, "API_URL не задан в .env"
-        assert login, "API_LOGIN не задан в .env"
-        assert password, "API_PASSWORD не задан в .env"
-        assert domain, "API_DOMAIN не задан в .env"
 
     # Получаем токен
     with allure.step("Автоматическое получение токена"):
         try:
-            token = get_auth_token(login, password, 600, domain)
+            token = auth_token
             assert token, "Не удалось получить токен"
             allure.attach(token, "Полученный токен", allure.attachment_type.TEXT)
         except Exception as e:
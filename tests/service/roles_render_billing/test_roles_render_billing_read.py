@@ -3,23 +3,21 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Рендеринг биллинговой роли")
-def test_roles_render_billing():
+def test_roles_render_billing(auth_token):
     """Получение данных для рендеринга биллинговой роли"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
 
     with allure.step("Формирование заголовков запроса"):
         headers = {
@@ -2,23 +2,21 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
-
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from dotenv import load_dotenv
+from config import ENV_FILE
 
 
 @allure.feature("Получение истории параметров биллингового сервиса")
-def test_get_billing_service_parameters_history_by_id():
+def test_get_billing_service_parameters_history_by_id(auth_token):
     """Получение истории параметров биллингового сервиса по ID из переменной окружения"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
         service_id = os.getenv("SERVICE_ID")
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert service_id, "SERVICE_ID не задан в .env"
 
     with allure.step("Формирование заголовков запроса"):
@@ -2,38 +2,30 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from helpers.filters import SERVICE_FILTERS
+from config import ENV_FILE
 
-load_dotenv(ENV_FILE)
 
-ORGANIZATION_ID = os.getenv("ORGANIZATION_ID")
-SERVICE_SYSTEM_NAME = os.getenv("SERVICE_SYSTEM_NAME")
-RENDER_RESOURCE_ID = os.getenv("RENDER_RESOURCE_ID")
-
-assert ORGANIZATION_ID, "ORGANIZATION_ID не задан в .env"
-assert SERVICE_SYSTEM_NAME, "SERVICE_SYSTEM_NAME не задан в .env"
-assert RENDER_RESOURCE_ID, "RENDER_RESOURCE_ID не задан в .env"
-
-PARAMS_FOR_TEST = [
-    ("by_organization_id", ORGANIZATION_ID, "по ID организации"),
-    ("by_service_system_name", SERVICE_SYSTEM_NAME, "по системному имени сервиса"),
-    ("by_render_resource", RENDER_RESOURCE_ID, "по ID рендер-ресурса"),
-]
+# Значения фильтров читаются из .env при запуске теста, а не при сборе:
+# без них падает только этот тест, а не весь сбор. Параметры общие со
+# сценарием services_read нагрузочного прогона (helpers/load.py)
+PARAMS_FOR_TEST = SERVICE_FILTERS
 
 @allure.feature("Получение списка биллинговых сервисов")
-@pytest.mark.parametrize("param_name,param_value,param_description", PARAMS_FOR_TEST)
-def test_get_billing_services_by_single_query_param(param_name, param_value, param_description):
+@pytest.mark.parametrize("param_name,env_name,param_description", PARAMS_FOR_TEST)
+def test_get_billing_services_by_single_query_param(auth_token, param_name, env_name, param_description):
     """Тест получения списка сервисов с фильтрацией по одному query-параметру"""
     with allure.step("Подготовка тестовых данных"):
+        load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
+        param_value = os.getenv(env_name)
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
-        assert param_value, f"Значение для {param_name} не задано в .env"
+        assert token, "Не удалось получить токен аутентификации"
+        assert param_value, f"{env_name} не задан в .env"
 
     with allure.step("Формирование заголовков запроса"):
         headers = {
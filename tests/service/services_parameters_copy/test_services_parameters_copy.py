@@ -3,26 +3,23 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from dotenv import load_dotenv
+from config import ENV_FILE
 
 
 @allure.feature("Копирование параметров биллингового сервиса")
-def test_copy_billing_service_parameters():
+def test_copy_billing_service_parameters(auth_token):
     """Копирование параметров сервиса с указанием целевого service_copy_id"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
         service_id = os.getenv("SERVICE_ID")
         service_copy_id = os.getenv("SERVICE_COPY_ID")
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert service_id, "SERVICE_ID не задан в .env"
         if service_copy_id is None:
             service_copy_id = "0" 
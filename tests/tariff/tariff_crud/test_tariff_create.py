@@ -5,23 +5,21 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv, set_key
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Создание тарифа")
-def test_create_tariff():
-    """Создание нового тарифа и сохранение его ID в .env"""
+def test_create_tariff(auth_token, run_state, data_pool):
+    """Создание нового тарифа и сохранение его ID в состоянии прогона"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
 
     url = f"{base_url}/api/v1/tariff"
     headers = {
@@ -31,16 +29,7 @@ def test_create_tariff():
     }
 
     # Тело запроса
-    payload = {
-        "name": "AutoTest Tariff",
-        "description": "Created by API test",
-        "service_id": 418,
-        "status_id": 2,
-        "type_level_resource": 2,
-        "location_id": 125,
-        "time_interval_id": 3,
-        "permanent_service": 1
-    }
+    payload = data_pool.lease("tariff")
 
     with allure.step("Формирование и отправка POST-запроса"):
         curl_command = (
@@ -89,7 +78,7 @@ def test_create_tariff():
             )
 
             with allure.step(f"Сохранение CREATED_TARIFF_ID={created_tariff_id} в .env"):
-                set_key(ENV_FILE, "CREATED_TARIFF_ID", str(created_tariff_id))
+                run_state.set("CREATED_TARIFF_ID", str(created_tariff_id))
                 allure.attach(
                     f"CREATED_TARIFF_ID={created_tariff_id}",
                     name="Сохранённый ID тарифа",
@@ -6,17 +6,14 @@ import json  # Добавлен
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv, unset_key
+from dotenv import load_dotenv
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from config import ENV_FILE
 
 
 @allure.feature("Тарифы")
 @allure.story("Удаление тарифа")
-def test_delete_tariff():
+def test_delete_tariff(auth_token, run_state):
     """
     Тест удаления тарифа по ID.
     Проверяет:
@@ -28,11 +25,11 @@ def test_delete_tariff():
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        tariff_id = os.getenv("CREATED_TARIFF_ID")
+        token = auth_token
+        tariff_id = run_state.get("CREATED_TARIFF_ID")
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert tariff_id, "CREATED_TARIFF_ID не задан в .env. Нечего удалять."
 
         try:
@@ -124,7 +121,7 @@ def test_delete_tariff():
 
     # === Очистка ===
     with allure.step("Очистка: удаление CREATED_TARIFF_ID из .env"):
-        unset_key(ENV_FILE, "CREATED_TARIFF_ID")
+        run_state.delete("CREATED_TARIFF_ID")
         allure.attach(
             "Переменная CREATED_TARIFF_ID удалена из .env",
             name="Очистка окружения",
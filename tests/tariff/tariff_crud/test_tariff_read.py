@@ -6,26 +6,23 @@ import json  # Добавлен импорт
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from config import ENV_FILE
 
 
 @allure.feature("Тарифы")
 @allure.story("Получение тарифа по ID")
-def test_get_tariff():
+def test_get_tariff(auth_token, run_state):
     """Получение тарифа по ID из .env"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        tariff_id = os.getenv("CREATED_TARIFF_ID", "304")
+        token = auth_token
+        tariff_id = run_state.get("CREATED_TARIFF_ID", "304")
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert tariff_id, "CREATED_TARIFF_ID не задан в .env."
 
         try:
@@ -6,25 +6,23 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv, unset_key
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Удаление связи тарифа с организацией")
-def test_delete_tariff_link_organization():
+def test_delete_tariff_link_organization(auth_token, run_state):
     """Удаление связи между тарифом и организацией по ID из .env"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        link_id = os.getenv("CREATED_LINK_ID")
+        token = auth_token
+        link_id = run_state.get("CREATED_LINK_ID")
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert link_id, "CREATED_LINK_ID не задан в .env. Нечего удалять."
 
         try:
@@ -96,7 +94,7 @@ def test_delete_tariff_link_organization():
         )
 
     with allure.step("Очистка: удаление CREATED_LINK_ID из .env"):
-        unset_key(ENV_FILE, "CREATED_LINK_ID")
+        run_state.delete("CREATED_LINK_ID")
         allure.attach(
             "Переменная CREATED_LINK_ID удалена из .env",
             name="Очистка окружения",
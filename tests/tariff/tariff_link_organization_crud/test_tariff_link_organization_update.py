@@ -5,25 +5,23 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv, set_key
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Обновление связи тарифа с организацией")
-def test_update_tariff_link_organization():
+def test_update_tariff_link_organization(auth_token, run_state):
     """Обновление информации о связи между тарифом и организацией"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        link_id = os.getenv("CREATED_LINK_ID")
+        token = auth_token
+        link_id = run_state.get("CREATED_LINK_ID")
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert link_id, "CREATED_LINK_ID не задан в .env. Запустите сначала test_create_tariff_link_organization.py"
 
         try:
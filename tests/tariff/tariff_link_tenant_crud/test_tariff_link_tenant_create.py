@@ -5,26 +5,24 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv, set_key
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Создание связи тарифа с арендатором")
-def test_create_tariff_link_tenant():
+def test_create_tariff_link_tenant(auth_token, run_state):
     """Создание новой связи между тарифом и арендатором (tenant)"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        tariff_id = os.getenv("CREATED_TARIFF_ID")
-        tenant_id = os.getenv("CREATED_TENANT_ID")
+        token = auth_token
+        tariff_id = run_state.get("CREATED_TARIFF_ID")
+        tenant_id = run_state.get("CREATED_TENANT_ID")
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert tariff_id, "CREATED_TARIFF_ID не задан в .env"
         assert tenant_id, "CREATED_TENANT_ID не задан в .env"
 
@@ -104,7 +102,7 @@ def test_create_tariff_link_tenant():
 
             created_link_id = response_json["id"]
             with allure.step(f"Сохранение CREATED_LINK_TENANT_ID={created_link_id} в .env"):
-                set_key(ENV_FILE, "CREATED_LINK_TENANT_ID", str(created_link_id))
+                run_state.set("CREATED_LINK_TENANT_ID", str(created_link_id))
                 allure.attach(
                     f"CREATED_LINK_TENANT_ID={created_link_id}",
                     name="ID созданной связи",
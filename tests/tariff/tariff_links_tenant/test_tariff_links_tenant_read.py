@@ -6,12 +6,9 @@ import json
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from config import ENV_FILE
 
 
 # Фильтры для параметризации
@@ -35,7 +32,7 @@ FILTERS = {
     ],
     ids=list(FILTERS.keys())
 )
-def test_get_tariff_links_tenant_filtered(filter_key, filter_value):
+def test_get_tariff_links_tenant_filtered(auth_token, filter_key, filter_value):
     """
     Параметризованный тест: получение связей тарифов с арендаторами
     по каждому фильтру по отдельности.
@@ -47,10 +44,10 @@ def test_get_tariff_links_tenant_filtered(filter_key, filter_value):
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
 
     # Формируем URL и параметры
     url = f"{base_url}/api/v1/tariff_links_tenant"
@@ -6,17 +6,14 @@ import json
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from allure_commons.types import AttachmentType
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from config import ENV_FILE
 
 
 @allure.feature("Тарифы")
 @allure.story("Получение типов настроек тарифов")
-def test_get_tariff_setting_types():
+def test_get_tariff_setting_types(auth_token):
     """
     Тест получения списка типов настроек тарифов.
     Если API возвращает 500 и 'method - not found' — тест пропускается.
@@ -24,10 +21,10 @@ def test_get_tariff_setting_types():
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
 
     url = f"{base_url}/api/v1/tariff_setting_types"
     headers = {
@@ -5,26 +5,24 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv, set_key
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Создание настроек арендатора")
-def test_create_tariff_tenant_settings():
+def test_create_tariff_tenant_settings(auth_token, run_state):
     """Создание новых настроек арендатора"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        tariff_setting_id = os.getenv("CREATED_TARIFF_SETTING_ID")  # Предполагаем, что есть общая настройка
-        tariff_link_org_id = os.getenv("CREATED_LINK_ID")           # Связь тарифа с организацией
+        token = auth_token
+        tariff_setting_id = run_state.get("CREATED_TARIFF_SETTING_ID")  # Предполагаем, что есть общая настройка
+        tariff_link_org_id = run_state.get("CREATED_LINK_ID")           # Связь тарифа с организацией
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert tariff_setting_id, "CREATED_TARIFF_SETTING_ID не задан в .env"
         assert tariff_link_org_id, "CREATED_LINK_ID не задан в .env"
 
@@ -108,7 +106,7 @@ def test_create_tariff_tenant_settings():
 
             created_setting_id = response_json["id"]
             with allure.step(f"Сохранение CREATED_TENANT_SETTING_ID={created_setting_id} в .env"):
-                set_key(ENV_FILE, "CREATED_TENANT_SETTING_ID", str(created_setting_id))
+                run_state.set("CREATED_TENANT_SETTING_ID", str(created_setting_id))
                 allure.attach(
                     f"CREATED_TENANT_SETTING_ID={created_setting_id}",
                     name="ID созданной настройки арендатора",
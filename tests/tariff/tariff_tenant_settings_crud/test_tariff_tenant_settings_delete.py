@@ -5,25 +5,23 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv, unset_key
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Удаление настроек арендатора")
-def test_delete_tariff_tenant_settings():
+def test_delete_tariff_tenant_settings(auth_token, run_state):
     """Удаление настроек арендатора по ID из .env"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        setting_id = os.getenv("CREATED_TENANT_SETTING_ID")
+        token = auth_token
+        setting_id = run_state.get("CREATED_TENANT_SETTING_ID")
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert setting_id, "CREATED_TENANT_SETTING_ID не задан в .env. Нечего удалять."
 
         try:
@@ -95,7 +93,7 @@ def test_delete_tariff_tenant_settings():
         )
 
     with allure.step("Очистка: удаление CREATED_TENANT_SETTING_ID из .env"):
-        unset_key(ENV_FILE, "CREATED_TENANT_SETTING_ID")
+        run_state.delete("CREATED_TENANT_SETTING_ID")
         allure.attach(
             "Переменная CREATED_TENANT_SETTING_ID удалена из .env",
             name="Очистка окружения",
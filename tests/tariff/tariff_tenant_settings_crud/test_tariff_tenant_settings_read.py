@@ -5,25 +5,23 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Получение настроек арендатора по ID")
-def test_get_tariff_tenant_settings_by_id():
+def test_get_tariff_tenant_settings_by_id(auth_token, run_state):
     """Получение информации о настройках арендатора по ID"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        setting_id = os.getenv("CREATED_TENANT_SETTING_ID")
+        token = auth_token
+        setting_id = run_state.get("CREATED_TENANT_SETTING_ID")
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert setting_id, "CREATED_TENANT_SETTING_ID не задан в .env. Сначала создайте настройку."
 
         try:
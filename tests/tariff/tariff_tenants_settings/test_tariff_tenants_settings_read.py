@@ -5,25 +5,21 @@ import json
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
-
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from dotenv import load_dotenv
+from config import ENV_FILE
 
 
 @allure.feature("Получение настроек арендатора по связи с организацией")
-def test_get_tariff_tenants_settings():
+def test_get_tariff_tenants_settings(auth_token, run_state):
     """Получение списка настроек арендатора по ID связи с организацией"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        link_org_id_str = os.getenv("CREATED_LINK_ID", "320")
+        token = auth_token
+        link_org_id_str = run_state.get("CREATED_LINK_ID", "320")
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert link_org_id_str, "CREATED_LINK_ID не задан в .env. Сначала создайте связь."
 
         try:
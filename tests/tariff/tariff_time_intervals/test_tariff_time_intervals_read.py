@@ -3,20 +3,19 @@ import json
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Получение временных интервалов тарифов")
-def test_get_tariff_time_intervals():
+def test_get_tariff_time_intervals(auth_token):
     load_dotenv(ENV_FILE)
     base_url = os.getenv("API_URL")
-    token = os.getenv("TOKEN_ID")
+    token = auth_token
 
     assert base_url, "API_URL не задан в .env"
-    assert token, "TOKEN_ID не задан в .env"
+    assert token, "Не удалось получить токен аутентификации"
 
     url = f"{base_url}/api/v1/tariff_time_intervals"
     headers = {
@@ -5,27 +5,25 @@ import json
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
 
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from helpers.filters import TARIFF_FILTERS
+from config import ENV_FILE
+
 
 @allure.feature("Фильтрация тарифов")
-def test_get_tariffs_filtered():
+def test_get_tariffs_filtered(auth_token):
     """Получение списка тарифов по фильтрам: by_service_id и by_name"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
 
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
 
-    filters = {
-        "by_service_id": 304,
-        "by_name": "Услуги ЦОД"
-    }
+    filters = dict(TARIFF_FILTERS)
 
     url = f"{base_url}/api/v1/tariffs"
     params = filters
@@ -3,21 +3,20 @@ import json
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Получение настроек тарифа")
-def test_get_tariffs_settings():
+def test_get_tariffs_settings(auth_token):
     load_dotenv(ENV_FILE)
     base_url = os.getenv("API_URL")
-    token = os.getenv("TOKEN_ID")
+    token = auth_token
     tariff_id_str = 256
 
     assert base_url, "API_URL не задан в .env"
-    assert token, "TOKEN_ID не задан в .env"
+    assert token, "Не удалось получить токен аутентификации"
     # assert tariff_id_str, "TARIFF_ID не задан"
 
     try:
@@ -2,11 +2,11 @@ import os
 import requests
 import allure
 import pytest
-from dotenv import load_dotenv, find_dotenv, set_key
+from dotenv import load_dotenv
 from config import ENV_FILE
 
-def test_get_and_save_token():
-    """Тест: получение токена и сохранение в .env"""
+def test_get_and_save_token(run_state):
+    """Тест: получение токена и сохранение в состоянии прогона"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         
@@ -59,26 +59,25 @@ def test_get_and_save_token():
             attachment_type=allure.attachment_type.TEXT
         )
 
-    with allure.step("Сохранение токена в .env файл"):
-        env_path = os.path.join(os.path.dirname(__file__), "..", "..", ".env")
-        set_key(env_path, "TOKEN_ID", token)
+    with allure.step("Сохранение токена в состоянии прогона"):
+        # Не в .env: токен стенд-заглушки или старый токен не должен переживать прогон
+        run_state.set("TOKEN_ID", token)
         
         allure.attach(
-            f"Токен сохранен в файл: {env_path}",
+            "Токен сохранен в состоянии прогона (TOKEN_ID)",
             name="Сохранение токена",
             attachment_type=allure.attachment_type.TEXT
         )
 
-def test_use_saved_token():
+def test_use_saved_token(run_state):
     """Пример использования сохранённого токена"""
-    with allure.step("Загрузка токена из .env файла"):
-        load_dotenv(override=True)  # Перезагружаем .env
-        token = os.getenv("TOKEN_ID")
+    with allure.step("Загрузка токена из состояния прогона"):
+        token = run_state.get("TOKEN_ID")
         
         allure.attach(
-            f"Токен из .env (первые 10 символов): {token[:10]}..." if token else "Токен не найден",
+            f"Токен прогона (первые 10 символов): {token[:10]}..." if token else "Токен не найден",
             name="Проверка токена",
             attachment_type=allure.attachment_type.TEXT
         )
         
-        assert token, "Токен не загружен из .env!"
\ No newline at end of file
+        assert token, "Токен не найден в состоянии прогона!"
\ No newline at end of file
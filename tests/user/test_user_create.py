@@ -1,6 +1,6 @@
 import os
 import requests
-from dotenv import load_dotenv, find_dotenv, set_key
+from dotenv import load_dotenv, find_dotenv
 import random
 import string
 from datetime import datetime
@@ -9,7 +9,7 @@ import pytest
 import allure
 import json
 
-def test_create_user_and_save_id():
+def test_create_user_and_save_id(auth_token, run_state):
     """Тест создания пользователя с сохранением ID"""
     with allure.step("1. Подготовка тестовых данных"):
         def generate_random_user():
@@ -39,9 +39,9 @@ def test_create_user_and_save_id():
     with allure.step("2. Загрузка переменных окружения"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv('API_URL')
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
 
     with allure.step("3. Формирование запроса"):
         url = f"{base_url}/api/v1/user"
@@ -91,14 +91,13 @@ def test_create_user_and_save_id():
             attachment_type=allure.attachment_type.TEXT
         )
 
-    with allure.step("6. Сохранение данных в .env"):
-        env_path = os.path.join(os.path.dirname(__file__), "..", "..", ".env")
-        set_key(env_path, "CREATED_USER_ID", user_id)
-        set_key(env_path, "CREATED_USER_LOGIN", user_data["login"])
+    with allure.step("6. Сохранение данных в состояние прогона"):
+        run_state.set("CREATED_USER_ID", user_id)
+        run_state.set("CREATED_USER_LOGIN", user_data["login"])
         
         allure.attach(
             f"CREATED_USER_ID={user_id}\nCREATED_USER_LOGIN={user_data['login']}",
-            name="Saved to .env",
+            name="Saved to run state",
             attachment_type=allure.attachment_type.TEXT
         )
 
@@ -3,16 +3,10 @@ import pytest
 import requests
 import allure
 import json
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
-from faker import Faker
+from config import ENV_FILE
 
-# Инициализация Faker
-fake = Faker()
-
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 def log_curl(request, response):
     """Генерация cURL команды и логирование запроса/ответа"""
@@ -58,26 +52,17 @@ def log_curl(request, response):
         )
 
 @pytest.fixture
-def test_user():
+def test_user(auth_token, data_pool):
     """Фикстура для создания тестового пользователя"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
         
         assert base_url is not None, "API_URL не найден в .env файле"
-        assert token is not None, "TOKEN_ID не найден в .env файле"
+        assert token, "Не удалось получить токен аутентификации"
         
-        user_data = {
-            "fio": fake.name(),
-            "login": fake.user_name(),
-            "password": fake.password(length=12, special_chars=True),
-            "mail": fake.email(),
-            "phone": f"79{str(fake.random_number(digits=9))}",
-            "role_id": 1,
-            "tenant_id": 123,
-            "is_manager": fake.random_element(elements=(0, 1))
-        }
+        user_data = data_pool.lease("user")
         
         allure.attach(
             json.dumps(user_data, indent=2),
@@ -108,12 +93,12 @@ def test_user():
         
         yield user_id
 
-def test_update_user_with_faker(test_user):
-    """PUT Обновление данных пользователя с использованием Faker"""
+def test_update_user_from_pool(auth_token, test_user, data_pool):
+    """PUT Обновление данных пользователя данными из пула"""
     with allure.step("Подготовка данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
         user_id = test_user
 
         # Сначала проверяем, что пользователь существует
@@ -126,20 +111,21 @@ def test_update_user_with_faker(test_user):
             f"Пользователь не найден перед обновлением. Status: {check_response.status_code}"
         )
 
-        # Генерация случайных данных для обновления
+        # Данные для обновления из пула
+        new_data = data_pool.lease("user")
         update_data = {
-            "fio": fake.name(),
-            "login": fake.user_name()[:20],  # Ограничение длины, если есть
-            "mail": fake.email(),
-            "phone": f"79{str(fake.random_number(digits=9))}",
-            "role_id": fake.random_int(min=1, max=5),
-            "tenant_id": 123,
-            "is_manager": fake.random_element(elements=(0, 1))
+            "fio": new_data["fio"],
+            "login": new_data["login"],
+            "mail": new_data["mail"],
+            "phone": new_data["phone"],
+            "role_id": new_data["role_id"],
+            "tenant_id": new_data["tenant_id"],
+            "is_manager": new_data["is_manager"]
         }
 
         allure.attach(
             json.dumps(update_data, indent=2),
-            name="Update Data (Faker)",
+            name="Update Data",
             attachment_type=allure.attachment_type.JSON
         )
 
@@ -215,12 +201,12 @@ def test_update_user_with_faker(test_user):
             attachment_type=allure.attachment_type.JSON
         )
 
-def test_delete_user(test_user):
+def test_delete_user(auth_token, test_user):
     """DELETE Удаление пользователя /api/v1/user/(id)"""
     with allure.step("Подготовка данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
         user_id = test_user
 
     with allure.step("Отправка DELETE запроса"):
@@ -1,14 +1,12 @@
 import os
 import requests
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
 import pytest
 import allure
 import json
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 def log_curl(request, response):
     """Логирование cURL команды и деталей запроса/ответа"""
@@ -42,16 +40,16 @@ def log_curl(request, response):
             attachment_type=allure.attachment_type.TEXT
         )
 
-def test_delete_user():
+def test_delete_user(auth_token, run_state):
     """Тест удаления пользователя"""
     with allure.step("1. Подготовка данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        test_user_id = os.getenv("CREATED_USER_ID")
+        token = auth_token
+        test_user_id = run_state.get("CREATED_USER_ID")
         
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert test_user_id, "CREATED_USER_ID не задан в .env"
         
         headers = {
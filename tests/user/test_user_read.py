@@ -2,26 +2,24 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Получение данных пользователя")
-def test_get_user():
+def test_get_user(auth_token, run_state):
     """Получение данных пользователя по ID"""
     with allure.step("Подготовка тестовых данных"):
         # Загрузка переменных окружения
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        test_user_id = os.getenv("CREATED_USER_ID")
+        token = auth_token
+        test_user_id = run_state.get("CREATED_USER_ID")
 
         # Проверка наличия обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert test_user_id, "CREATED_USER_ID не задан в .env"
 
     with allure.step("Формирование заголовков запроса"):
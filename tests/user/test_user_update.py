@@ -1,51 +1,28 @@
 import os
 import requests
 import pytest
-from faker import Faker
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Инициализация Faker
-fake = Faker()
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
-
-@pytest.fixture(scope="module")
-def faker():
-    """Фикстура для создания экземпляра Faker с локалью 'ru_RU'"""
-    return Faker('ru_RU')
-
-
-def test_update_user(faker):
+def test_update_user(auth_token, data_pool, run_state):
     """Обновление данных пользователя с обязательными полями и случайным номером телефона"""
     with allure.step("Подготовка тестовых данных"):
         # Загрузка переменных окружения
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        test_user_id = os.getenv("CREATED_USER_ID")
+        token = auth_token
+        test_user_id = run_state.get("CREATED_USER_ID")
 
         # Проверка наличия обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert test_user_id, "CREATED_USER_ID не задан в .env"
 
-        # Генерация номера телефона в нужном формате: 79XXXXXXXXX
-        phone = faker.phone_number()  # Пример: +7 (912) 345-67-89
-        # Очищаем от лишних символов и приводим к формату 79XXXXXXXXX
-        clean_phone = ''.join(filter(str.isdigit, phone))
-        if clean_phone.startswith('8'):  # замена 8 на 7
-            clean_phone = '7' + clean_phone[1:]
-        elif clean_phone.startswith('7'):
-            pass  # уже корректно
-        else:
-            clean_phone = '7' + clean_phone.lstrip('0')  # если нет кода страны
-
-        # Обрезаем до 11 цифр (если нужно)
-        clean_phone = clean_phone[:11] if len(clean_phone) >= 11 else clean_phone.ljust(11, '0')
+        # Номер телефона в формате 79XXXXXXXXX из пула тестовых данных
+        phone = data_pool.lease("user")["phone"]
 
     with allure.step("1. Получение текущих данных пользователя"):
         get_headers = {"tockenId": token, "accept": "*/*"}
@@ -77,7 +54,7 @@ def test_update_user(faker):
             "fio": "Новое ФИО",
             "login": current_data["login"],
             "mail": "updated.email@example.com",
-            "phone": f"79{str(fake.random_number(digits=9))}",
+            "phone": phone,
             "role_id": current_data["role_id"],
             "tenant_id": current_data["tenant_id"],
             "is_manager": 1
@@ -5,26 +5,24 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv, set_key
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Создание связи пользователя с организацией")
-def test_create_user_organization_link():
+def test_create_user_organization_link(auth_token, run_state):
     """Создание связи между пользователем и организацией"""
     with allure.step("Подготовка тестовых данных"):
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
-        user_id = os.getenv("CREATED_USER_ID")
-        org_id = os.getenv("ORGANIZATION_ID")
+        token = auth_token
+        user_id = run_state.get("CREATED_USER_ID")
+        org_id = run_state.get("ORGANIZATION_ID")
 
         # Проверка обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
         assert user_id, "CREATED_USER_ID не задан в .env"
         assert org_id, "ORGANIZATION_ID не задан в .env"
 
@@ -101,7 +99,7 @@ def test_create_user_organization_link():
 
             created_link_id = response_json["id"]
             with allure.step(f"Сохранение CREATED_USER_ORG_LINK_ID={created_link_id} в .env"):
-                set_key(ENV_FILE, "CREATED_USER_ORG_LINK_ID", str(created_link_id))
+                run_state.set("CREATED_USER_ORG_LINK_ID", str(created_link_id))
                 allure.attach(
                     f"CREATED_USER_ORG_LINK_ID={created_link_id}",
                     name="ID созданной связи",
@@ -3,29 +3,27 @@ import requests
 import pytest
 import allure
 import json
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
+from config import ENV_FILE
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
 
 @allure.feature("Управление связями пользователь-организация")
 class TestUserOrganizationLinks:
     """Тесты для работы со связями пользователей и организаций"""
     @allure.story("Получение связей пользователь-организация")
     @allure.title("Поиск связи пользователя с организацией")
-    def test_get_users_by_organization(self):
+    def test_get_users_by_organization(self, auth_token, run_state):
         """Проверка получения связи пользователя с организацией"""
         # Подготовка тестовых данных
         with allure.step("Загрузка конфигурации"):
             load_dotenv(ENV_FILE)
             base_url = os.getenv("API_URL")
-            token = os.getenv("TOKEN_ID")
-            organization_id = os.getenv("ORGANIZATION_ID")
+            token = auth_token
+            organization_id = run_state.get("ORGANIZATION_ID")
 
             assert base_url, "API_URL не задан в .env"
-            assert token, "TOKEN_ID не задан в .env"
+            assert token, "Не удалось получить токен аутентификации"
             assert organization_id, "ORGANIZATION_ID не задан в .env"
 
         # Формирование запроса
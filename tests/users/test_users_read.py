@@ -2,25 +2,26 @@ import os
 import requests
 import pytest
 import allure
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
 from pathlib import Path
 
-# Путь к .env файлу
-ENV_FILE = find_dotenv()
-assert ENV_FILE, "Файл .env не найден в корне проекта"
+from helpers.pages import ListReader, ListReadError
+from helpers.stream import StreamError
+from config import ENV_FILE
+
 
 @allure.feature("Получение данных пользователей")
-def test_get_users_list():
+def test_get_users_list(auth_token):
     """Получение списка всех пользователей"""
     with allure.step("Подготовка тестовых данных"):
         # Загрузка переменных окружения
         load_dotenv(ENV_FILE)
         base_url = os.getenv("API_URL")
-        token = os.getenv("TOKEN_ID")
+        token = auth_token
 
         # Проверка наличия обязательных переменных
         assert base_url, "API_URL не задан в .env"
-        assert token, "TOKEN_ID не задан в .env"
+        assert token, "Не удалось получить токен аутентификации"
 
     with allure.step("Формирование заголовков запроса"):
         headers = {
@@ -39,28 +40,32 @@ def test_get_users_list():
         )
         allure.attach(curl_command, name="CURL команда", attachment_type=allure.attachment_type.TEXT)
 
-        response = requests.get(url, headers=headers)
-
-    with allure.step("Проверка ответа от сервера"):
-        allure.attach(
-            f"Status Code: {response.status_code}\nResponse: {response.text}",
-            name="Response Details",
-            attachment_type=allure.attachment_type.TEXT
-        )
-
-        assert response.status_code == 200, f"Ожидался статус 200, получен {response.status_code}"
+    with allure.step("Чтение списка пользователей"):
+        # Пользователи читаются по одному; при постраничной выдаче следующая
+        # страница грузится, пока проверяется текущая
+        users = ListReader(url, headers=headers, keep=20)
+        try:
+            for user in users:
+                assert isinstance(user, dict), "Каждый пользователь должен быть объектом"
+        except ListReadError as e:
+            pytest.fail(f"Ожидался статус 200: {e}")
+        except StreamError as e:
+            pytest.fail(f"Ответ должен быть списком пользователей: {e}")
 
-        users_data = response.json()
+        users_data = users.sample
 
         allure.attach(
             str(users_data),
             name="Список пользователей",
             attachment_type=allure.attachment_type.JSON
         )
+        allure.attach(
+            f"Пользователей: {users.count}, страниц: {users.pages}, постраничная выдача: {users.paging or 'нет'}",
+            name="Размер списка",
+            attachment_type=allure.attachment_type.TEXT
+        )
 
         with allure.step("Валидация структуры ответа"):
-            assert isinstance(users_data, list), "Ответ должен быть списком пользователей"
-
             if len(users_data) > 0:
                 first_user = users_data[0]
                 with allure.step("Проверка структуры первого пользователя в списке"):